@@ -0,0 +1,157 @@
+"""JSON API for programmatic screening (``/api/v1``).
+
+``POST /api/v1/screen`` takes a job description and resumes either as a
+multipart upload (the same fields as the dashboard form) or as a JSON body::
+
+    {"jd_text": "...", "top_k": 10, "mode": "score", "stream": false,
+     "resumes": [{"filename": "a.pdf", "content_base64": "..."},
+                 {"filename": "b", "text": "plain resume text"}]}
+
+A ``text`` resume is always read as plain text, whatever its filename; a
+``content_base64`` resume must be named with one of ``RESUME_EXTENSIONS``.
+
+``mode`` is "full" (parsed fields and suggestions) or "score" (scores and
+skills only; no field parsing, spaCy or suggestions).  With ``stream`` (or
+``Accept: application/x-ndjson``) candidates are sent as NDJSON lines as
+each batch is scored, followed by a summary line with the top-k ranking.
+
+Requests are authorised by a logged-in session or by an ``X-API-Key`` header
+matching one of the comma-separated keys in ``THINKHIRE_API_KEYS``.
+"""
+import base64
+import binascii
+import hmac
+import json
+import os
+import zipfile
+from functools import wraps
+
+from flask import Blueprint, Response, jsonify, request, session
+
+from screening import iter_scored
+from text_extraction import RESUME_EXTENSIONS, ZipLimitError, extract_text, iter_zip_members
+
+API_KEYS = [k.strip() for k in os.environ.get("THINKHIRE_API_KEYS", "").split(",") if k.strip()]
+MODES = ("full", "score")
+# Fields returned per candidate in each mode
+FULL_FIELDS = ("FileName", "Score", "Skills", "Name", "Email", "Phone", "education", "Suggestions")
+SCORE_FIELDS = ("FileName", "Score", "Skills")
+
+api = Blueprint("api", __name__, url_prefix="/api/v1")
+
+
+class ApiError(ValueError):
+    """A malformed request; reported to the client as a 400."""
+
+
+def api_auth_required(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get("X-API-Key", "")
+        if not session.get("logged_in") and not (key and any(hmac.compare_digest(key, k) for k in API_KEYS)):
+            return jsonify({"error": "authentication required"}), 401
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+@api.errorhandler(ApiError)
+def _bad_request(exc):
+    return jsonify({"error": str(exc)}), 400
+
+
+# ---------- Request parsing ----------
+# Both parsers return resumes as (display name, extraction name, bytes)
+def _multipart_request():
+    jd_file = request.files.get("jd_file")
+    if jd_file and jd_file.filename:
+        jd_text = extract_text(jd_file.read(), os.path.basename(jd_file.filename))
+    else:
+        jd_text = request.form.get("jd_text", "").strip()
+
+    files = []
+    for upload in request.files.getlist("resume_files") + request.files.getlist("resume_zips"):
+        if not upload or not upload.filename:
+            continue
+        filename = os.path.basename(upload.filename)
+        if filename.lower().endswith(".zip"):
+            try:
+                members = iter_zip_members(upload.stream, RESUME_EXTENSIONS)
+                files.extend((name, name, data) for name, data in members)
+            except (zipfile.BadZipFile, ZipLimitError) as exc:
+                raise ApiError(f"'{filename}': {exc}")
+        elif filename.lower().endswith(RESUME_EXTENSIONS):
+            files.append((filename, filename, upload.read()))
+    return jd_text, files, request.form
+
+
+def _json_request():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise ApiError("expected a JSON object or a multipart upload")
+    files = []
+    for i, resume in enumerate(body.get("resumes") or []):
+        if not isinstance(resume, dict):
+            raise ApiError(f"resumes[{i}] must be an object")
+        filename = os.path.basename(str(resume.get("filename") or f"resume_{i + 1}.txt"))
+        if "text" in resume:
+            # Extracted as plain text even when named after the PDF or DOCX it came from
+            extract_as = filename if filename.lower().endswith(".txt") else f"{filename}.txt"
+            files.append((filename, extract_as, str(resume["text"]).encode("utf-8")))
+            continue
+        if not filename.lower().endswith(RESUME_EXTENSIONS):
+            raise ApiError(f"resumes[{i}].filename must end in one of {', '.join(RESUME_EXTENSIONS)}")
+        try:
+            files.append((filename, filename, base64.b64decode(resume.get("content_base64") or "", validate=True)))
+        except (binascii.Error, ValueError):
+            raise ApiError(f"resumes[{i}].content_base64 is not valid base64")
+    return str(body.get("jd_text") or "").strip(), files, body
+
+
+def _flag(value):
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+# ---------- Endpoints ----------
+@api.route("/screen", methods=["POST"])
+@api_auth_required
+def screen():
+    jd_text, files, options = _multipart_request() if request.files or request.form else _json_request()
+    if not jd_text:
+        raise ApiError("jd_text (or jd_file) is required")
+    if not files:
+        raise ApiError("at least one resume is required")
+
+    mode = str(options.get("mode") or "full")
+    if mode not in MODES:
+        raise ApiError(f"mode must be one of {', '.join(MODES)}")
+    try:
+        top_k = max(1, int(options.get("top_k") or len(files)))
+    except (TypeError, ValueError):
+        raise ApiError("top_k must be an integer")
+    stream = (_flag(options.get("stream", False)) or _flag(request.args.get("stream", False))
+              or request.accept_mimetypes.best == "application/x-ndjson")
+
+    display_names = [name for name, _, _ in files]
+    files = [(extract_as, data) for _, extract_as, data in files]
+    fields = FULL_FIELDS if mode == "full" else SCORE_FIELDS
+    batches = iter_scored(jd_text, files, parse=mode == "full", suggestions=mode == "full")
+
+    def candidates():
+        for batch in batches:
+            for info in batch:
+                info["FileName"] = display_names[info["Index"]]
+                yield {"index": info["Index"], **{k: info.get(k) for k in fields}}
+
+    if stream:
+        def generate():
+            ranking = []
+            for candidate in candidates():
+                ranking.append((candidate["Score"], candidate["index"]))
+                yield json.dumps(candidate) + "\n"
+            ranking.sort(key=lambda x: x[0], reverse=True)
+            yield json.dumps({"done": True, "total": len(ranking),
+                              "top": [{"index": i, "Score": s} for s, i in ranking[:top_k]]}) + "\n"
+        return Response(generate(), mimetype="application/x-ndjson")
+
+    ranked = sorted(candidates(), key=lambda c: c["Score"], reverse=True)
+    return jsonify({"mode": mode, "total": len(ranked), "candidates": ranked[:top_k]})
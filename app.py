@@ -1,97 +1,142 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, Response, send_file
+from flask import Flask, render_template, request, redirect, url_for, session, flash, Response, send_file, jsonify, abort, g
+import cProfile
 import io
 import csv
 import os
 import json
-import docx2txt
-import pdfplumber
+import pstats
+import shutil
+import tempfile
+import threading
+import time
 import zipfile
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
-from resume_parser import parse_resume
-from matcher import match_job_to_candidates, suggest_improvements
+from werkzeug.utils import secure_filename
+from text_extraction import extract_text, iter_zip_members, ZipLimitError, RESUME_EXTENSIONS
+from jobs import submit_job, get_job, get_job_files, JOB_TTL
+from result_store import save_run, get_run, get_group_runs, get_results, get_results_at, get_features, iter_results
+from reranking import rerank
+from matcher import SCORE_WEIGHTS
+from user_store import user_store
+from screening import search_candidate_pool, warm_up_models, models_ready
+from api import api
+import metrics
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"
+app.register_blueprint(api)
 
 # Folder for uploaded files
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+# Largest request body accepted; bigger uploads get a 413 before anything is read
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("THINKHIRE_MAX_UPLOAD_MB", "512")) * 1024 * 1024
+# Resume bytes accepted per upload once zips are expanded
+MAX_RESUME_TOTAL_BYTES = int(os.environ.get("THINKHIRE_MAX_RESUME_TOTAL_MB", "1024")) * 1024 * 1024
+# Uploaded resumes wait here, one directory per upload, until their job finishes
+SPOOL_DIR = os.environ.get(
+    "THINKHIRE_SPOOL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "spool"),
+)
 
 # Dummy credentials
 FAKE_USERNAME = "admin"
 FAKE_PASSWORD = "password123"
 
-# Users file (simple JSON store for demo purposes)
-USERS_FILE = os.path.join(app.root_path, "users.json")
-
-
-def load_users():
-    try:
-        if os.path.exists(USERS_FILE):
-            with open(USERS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
-
-
-def save_users(users):
+# Candidates shown per results page; exports always include the whole run
+RESULTS_PER_PAGE = 50
+# Rows per chunk of a streamed export
+EXPORT_CHUNK_ROWS = 500
+# Query-string parameters that re-rank a stored run: component weights and filters
+RERANK_PARAMS = ("w_sim", "w_skill", "w_exp", "min_exp", "skills")
+# Binary exports (PDF, Parquet) are built in memory up to this size, then on disk
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+# reportlab holds every page until the PDF is saved, so the PDF export stops at this many candidates
+PDF_EXPORT_MAX_ROWS = int(os.environ.get("THINKHIRE_PDF_EXPORT_MAX_ROWS", "2000"))
+# With THINKHIRE_PROFILE=1, requests sent with ?profile=1 (or an X-Profile header) run under cProfile
+PROFILE_ENABLED = os.environ.get("THINKHIRE_PROFILE") == "1"
+PROFILE_DIR = os.environ.get(
+    "THINKHIRE_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "profiles"),
+)
+
+
+# ---------- Model Warm-up ----------
+# NLP models load lazily; pages like /login never pay for them.
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+
+def _warmup_worker():
+    global _warmup_thread
     try:
-        with open(USERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(users, f, indent=2)
-    except Exception:
-        pass
-
-
-# ---------- Helper Functions ----------
-def extract_text(file_path):
-    """Extracts text content from PDF, DOCX, or TXT files."""
-    text = ""
-    if file_path.endswith(".pdf"):
+        warm_up_models()
+    except Exception as exc:
+        print(f"⚠️ Model warm-up failed: {exc}")
+        with _warmup_lock:
+            _warmup_thread = None  # let the next readiness probe retry
+
+
+def start_warmup():
+    """Load the models in the background (idempotent)."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None and not models_ready():
+            _warmup_thread = threading.Thread(target=_warmup_worker, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+
+
+# ---------- Request Metrics & Profiling ----------
+@app.before_request
+def _start_request_metrics():
+    g.breakdown, g.breakdown_token = metrics.start_breakdown(f"{request.method} {request.path}")
+    g.profiler = None
+    if PROFILE_ENABLED and (request.args.get("profile") == "1" or request.headers.get("X-Profile")):
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
         except Exception:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-    elif file_path.endswith(".docx"):
-        # Some .docx files are not valid zip archives (corrupted or misnamed).
-        # Check first to avoid docx2txt raising BadZipFile.
-        try:
-            if zipfile.is_zipfile(file_path):
-                try:
-                    text = docx2txt.process(file_path) or ""
-                except Exception:
-                    # If docx2txt fails for any reason, fallback to best-effort decode
-                    try:
-                        with open(file_path, "rb") as f:
-                            data = f.read()
-                            text = data.decode("utf-8", errors="ignore")
-                    except Exception:
-                        text = ""
-            else:
-                # Not a valid zip -> fallback to reading as plain text
-                try:
-                    with open(file_path, "rb") as f:
-                        data = f.read()
-                        text = data.decode("utf-8", errors="ignore")
-                except Exception:
-                    text = ""
-        except Exception:
-            # Any unexpected error: return empty string rather than crashing
-            text = ""
-    elif file_path.endswith(".txt"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read() or ""
-        except UnicodeDecodeError:
-            with open(file_path, "r", encoding="latin-1") as f:
-                text = f.read() or ""
-    return text
+            # Another request is already being profiled
+            g.profiler = None
+
+
+@app.after_request
+def _record_request_metrics(response):
+    current = g.get("breakdown")
+    if current is not None:
+        metrics.observe("thinkhire_request_seconds", current.elapsed, endpoint=request.endpoint or "unknown",
+                        method=request.method, status=response.status_code)
+        metrics.log_if_slow(current)
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _save_profile(profiler)
+    return response
+
+
+@app.teardown_request
+def _end_request_metrics(exc=None):
+    token = g.pop("breakdown_token", None)
+    if token is not None:
+        metrics.end_breakdown(token)
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def _save_profile(profiler):
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{os.getpid()}.prof"
+        path = os.path.join(PROFILE_DIR, name)
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        metrics.logger.warning("Profile of %s %s saved to %s\n%s", request.method, request.path, path, out.getvalue())
+    except Exception as exc:
+        print(f"⚠️ Could not save profile: {exc}")
 
 
 # ---------- Authentication Helper ----------
@@ -118,10 +163,31 @@ def home():
 def index():
     """Alias route for templates that expect an 'index' endpoint."""
     # Clear previous analysis results when user starts a new one
-    session.pop('last_results', None)
+    session.pop('last_run_id', None)
     return home()
 
 
+@app.route("/healthz")
+def healthz():
+    """Liveness: the worker is up and serving requests."""
+    return jsonify({"status": "ok"})
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape target: stage timings, request latency, file and cache counters."""
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/ready")
+def ready():
+    """Readiness: 200 once the NLP models are loaded; 503 (and start loading) otherwise."""
+    if models_ready():
+        return jsonify({"ready": True})
+    start_warmup()
+    return jsonify({"ready": False}), 503
+
+
 @app.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
@@ -136,8 +202,8 @@ def login():
             return redirect(url_for("dashboard"))
 
         # Then check persisted users (if any)
-        users = load_users()
-        if username in users and check_password_hash(users[username].get("password", ""), password):
+        user = user_store.get(username)
+        if user and check_password_hash(user.get("password", ""), password):
             session["logged_in"] = True
             session["username"] = username
             flash("Logged in successfully.", "success")
@@ -195,211 +261,488 @@ def signup():
             flash("Passwords do not match.", "danger")
             return render_template("signup.html")
 
-        users = load_users()
-        if username in users:
+        if not user_store.create(username, full_name, email, generate_password_hash(password)):
             flash("Username already exists. Please choose another.", "danger")
             return render_template("signup.html")
-
-        users[username] = {
-            "full_name": full_name,
-            "email": email,
-            "password": generate_password_hash(password)
-        }
-        save_users(users)
         flash("Account created successfully. Please log in.", "success")
         return redirect(url_for("login"))
 
     return render_template("signup.html")
 
 
+class ResumeSpool:
+    """One upload's resumes, written to a temp directory as they are read so memory stays flat.
+
+    The screening job reads the files by path and removes the directory when it finishes.
+    """
+
+    def __init__(self):
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        _purge_old_spools()
+        self.dir = tempfile.mkdtemp(prefix="upload-", dir=SPOOL_DIR)
+        self.files = []  # (display name, path) in upload order
+        self.total = 0
+
+    def add(self, name, data=None, upload=None):
+        """Spool one resume from ``data`` or a file ``upload``; False once the upload is over its size cap."""
+        if self.total >= MAX_RESUME_TOTAL_BYTES:
+            return False
+        path = os.path.join(self.dir, f"{len(self.files):06d}{os.path.splitext(name)[1].lower()}")
+        if upload is not None:
+            upload.save(path)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        size = os.path.getsize(path)
+        if self.total + size > MAX_RESUME_TOTAL_BYTES:
+            os.remove(path)
+            self.total = MAX_RESUME_TOTAL_BYTES
+            return False
+        self.total += size
+        self.files.append((name, path))
+        return True
+
+    def discard(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def _purge_old_spools():
+    """Remove spool directories left behind by jobs a restart interrupted."""
+    cutoff = time.time() - JOB_TTL
+    for name in os.listdir(SPOOL_DIR):
+        path = os.path.join(SPOOL_DIR, name)
+        try:
+            if name.startswith("upload-") and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def _spool_zip_members(zip_file, filename, spool):
+    """Spool an uploaded zip's resume members, read straight from the upload stream."""
+    try:
+        for member_basename, data in iter_zip_members(zip_file.stream, RESUME_EXTENSIONS):
+            if not spool.add(member_basename, data):
+                return False
+    except zipfile.BadZipFile:
+        flash(f"Uploaded zip '{filename}' is not a valid archive.", "danger")
+    except ZipLimitError as exc:
+        flash(f"Uploaded zip '{filename}' was only partly processed: {exc}.", "danger")
+    return True
+
+
+def _collect_resume_files():
+    """Spool every uploaded resume to disk; returns the ``ResumeSpool`` holding ``(display name, path)`` pairs."""
+    spool = ResumeSpool()
+    uploads = [z for z in request.files.getlist("resume_zips") if z and z.filename
+               and z.filename.lower().endswith(".zip")]
+    uploads += [r for r in request.files.getlist("resume_files") if r and r.filename]
+
+    for upload in uploads:
+        filename = os.path.basename(upload.filename)
+
+        # --- ZIP archive support (resume_zips, or zips among resume_files) ---
+        if filename.lower().endswith(".zip"):
+            within_cap = _spool_zip_members(upload, filename, spool)
+        # --- Regular file (including files uploaded via folder input) ---
+        elif filename.lower().endswith(RESUME_EXTENSIONS):
+            within_cap = spool.add(filename, upload=upload)
+        else:
+            continue
+        if not within_cap:
+            flash(f"Uploaded resumes exceed {MAX_RESUME_TOTAL_BYTES // (1024 * 1024)} MB in total; "
+                  f"only the first {len(spool.files)} were analysed.", "danger")
+            break
+
+    return spool
+
+
+def _uploaded_jd_text():
+    """Text of the uploaded JD file (read in memory), or of a pasted ``jd_text`` field."""
+    jd_file = request.files.get("jd_file")
+    if jd_file and jd_file.filename:
+        return extract_text(jd_file.read(), os.path.basename(jd_file.filename))
+    return request.form.get("jd_text", "").strip()
+
+
+def _uploaded_roles():
+    """``(title, text)`` for every uploaded JD file and a pasted ``jd_text``; titles are unique."""
+    roles = []
+    for jd_file in request.files.getlist("jd_file"):
+        if jd_file and jd_file.filename:
+            name = os.path.basename(jd_file.filename)
+            text = extract_text(jd_file.read(), name).strip()
+            if text:
+                roles.append((os.path.splitext(name)[0] or name, text))
+    pasted = request.form.get("jd_text", "").strip()
+    if pasted:
+        roles.append(("Job description", pasted))
+
+    # Roles are keyed by title in the best-role view, so "cv.pdf", "cv.txt" and
+    # "cv (2).txt" become "cv", "cv (2)" and "cv (2) (2)"
+    taken = set()
+    unique = []
+    for title, text in roles:
+        name, n = title, 1
+        while name in taken:
+            n += 1
+            name = f"{title} ({n})"
+        taken.add(name)
+        unique.append((name, text))
+    return unique
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(exc):
+    limit = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+    if request.blueprint == "api":
+        return jsonify({"error": f"request larger than {limit} MB"}), 413
+    flash(f"Upload is larger than {limit} MB. Please split it into smaller batches.", "danger")
+    return redirect(url_for("dashboard"))
+
+
 @app.route("/upload", methods=["POST"])
 @login_required
 def upload_files():  # 👈 renamed to match dashboard.html
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    # --- Handle JD file upload(s): several JDs rank the same resumes against each role ---
+    roles = _uploaded_roles()
+    # ❗ Guard: no job description uploaded or pasted
+    if not roles:
+        flash("Please upload or paste a job description before starting AI analysis.", "warning")
+        return redirect(url_for("dashboard"))
+    jd_text = roles[0][1] if len(roles) == 1 else ""
 
-    jd_text = ""
-    jd_file = request.files.get("jd_file")
+    spool = _collect_resume_files()
 
-    # --- Handle JD file upload ---
-    if jd_file and jd_file.filename:
-        jd_path = os.path.join(UPLOAD_FOLDER, jd_file.filename)
-        jd_file.save(jd_path)
-        jd_text = extract_text(jd_path)
-
-    resumes_raw = []
-    resumes_info = []
-
-    # --- Handle uploaded ZIP files (input name: resume_zips) ---
-    if "resume_zips" in request.files:
-        for zip_file in request.files.getlist("resume_zips"):
-            if not zip_file or not zip_file.filename:
-                continue
-            zip_name = os.path.basename(zip_file.filename)
-            if not zip_name.lower().endswith(".zip"):
-                continue
-            zip_path = os.path.join(UPLOAD_FOLDER, zip_name)
-            zip_file.save(zip_path)
-            try:
-                with zipfile.ZipFile(zip_path, "r") as z:
-                    extract_dir = os.path.join(UPLOAD_FOLDER, os.path.splitext(zip_name)[0])
-                    os.makedirs(extract_dir, exist_ok=True)
-                    z.extractall(extract_dir)
-
-                    for member in z.namelist():
-                        if member.endswith("/") or member.endswith("\\"):
-                            continue
-                        member_basename = os.path.basename(member)
-                        if not member_basename:
-                            continue
-                        member_path = os.path.join(extract_dir, member)
-                        if not os.path.exists(member_path):
-                            continue
-                        if member_basename.lower().endswith((".pdf", ".docx", ".txt")):
-                            text = extract_text(member_path)
-                            resumes_raw.append(text)
-                            info = parse_resume(text, jd_text)
-                            info["FileName"] = member_basename
-                            info["Skills"] = info.get("skills", [])
-                            info["Name"] = info.get("name", "")
-                            info["Email"] = info.get("email", "")
-                            info["Phone"] = info.get("phone", "")
-                            resumes_info.append(info)
-            except zipfile.BadZipFile:
-                flash(f"Uploaded zip '{zip_name}' is not a valid archive.", "danger")
-
-
-    # --- Handle resumes (multiple files, directories, and zip archives) ---
-    if "resume_files" in request.files:
-        for resume in request.files.getlist("resume_files"):
-            if not resume or not resume.filename:
-                continue
-
-            filename = os.path.basename(resume.filename)
-
-            # --- ZIP archive support ---
-            if filename.lower().endswith(".zip"):
-                zip_path = os.path.join(UPLOAD_FOLDER, filename)
-                resume.save(zip_path)
-                try:
-                    with zipfile.ZipFile(zip_path, "r") as z:
-                        extract_dir = os.path.join(UPLOAD_FOLDER, os.path.splitext(filename)[0])
-                        os.makedirs(extract_dir, exist_ok=True)
-                        z.extractall(extract_dir)
-
-                        for member in z.namelist():
-                            # skip directories
-                            if member.endswith("/") or member.endswith("\\"):
-                                continue
-                            member_basename = os.path.basename(member)
-                            if not member_basename:
-                                continue
-                            member_path = os.path.join(extract_dir, member)
-                            if not os.path.exists(member_path):
-                                # some zip entries may have nested directories; ensure path
-                                continue
-                            if member_basename.lower().endswith((".pdf", ".docx", ".txt")):
-                                text = extract_text(member_path)
-                                resumes_raw.append(text)
-                                info = parse_resume(text, jd_text)
-                                info["FileName"] = member_basename
-                                info["Skills"] = info.get("skills", [])
-                                info["Name"] = info.get("name", "")
-                                info["Email"] = info.get("email", "")
-                                info["Phone"] = info.get("phone", "")
-                                resumes_info.append(info)
-                except zipfile.BadZipFile:
-                    flash(f"Uploaded zip '{filename}' is not a valid archive.", "danger")
-                continue
-
-            # --- Regular file (including files uploaded via folder input) ---
-            resume_path = os.path.join(UPLOAD_FOLDER, filename)
-            resume.save(resume_path)
-            # If the browser provided a relative path (from directory upload), sanitize name above
-            text = extract_text(resume_path)
-            resumes_raw.append(text)
-            info = parse_resume(text, jd_text)
-            info["FileName"] = filename
-            info["Skills"] = info.get("skills", [])
-            info["Name"] = info.get("name", "")
-            info["Email"] = info.get("email", "")
-            info["Phone"] = info.get("phone", "")
-            resumes_info.append(info)
-
-    # --- AI Matching ---
     # ❗ Guard: no resumes uploaded
-    if not resumes_raw:
+    if not spool.files:
+        spool.discard()
         flash("Please upload at least one resume before starting AI analysis.", "warning")
         return redirect(url_for("dashboard"))
 
-    matches = match_job_to_candidates(jd_text, resumes_raw, top_k=len(resumes_raw))
-    for idx, score in matches:
-        if 0 <= idx < len(resumes_info):
-            resumes_info[idx]["Score"] = score
-            resumes_info[idx]["Suggestions"] = suggest_improvements(jd_text, resumes_raw[idx], resumes_info[idx].get("Skills", []))
-    # Ensure every candidate has a numeric Score (default 0.0) and Suggestions key
-    for r in resumes_info:
-        r.setdefault("Score", 0.0)
-        r.setdefault("Suggestions", r.get("Suggestions", []))
+    # --- AI Matching runs in the background; poll the job for progress ---
+    job_id = submit_job(session.get("username"), jd_text, spool.files, roles=roles if len(roles) > 1 else None,
+                        spool_dir=spool.dir)
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify({
+            "job_id": job_id,
+            "status_url": url_for("job_status", job_id=job_id),
+            "results_url": url_for("job_results", job_id=job_id),
+        }), 202
+    return redirect(url_for("job_page", job_id=job_id))
+
+
+# ---------- Stored results ----------
+def _owned_run():
+    """The current user's run named by ``?run=``, else their last run; None if missing or expired."""
+    run_id = request.args.get("run") or session.get("last_run_id")
+    run = get_run(run_id) if run_id else None
+    if not run or run.get("owner") != session.get("username"):
+        return None
+    return run
+
+
+def _rerank_args():
+    """Re-rank parameters present in the query string; kept on page and export links."""
+    return {k: request.args[k].strip() for k in RERANK_PARAMS if request.args.get(k, "").strip()}
+
 
-    # Sort candidates by Score descending so highest match appears first
-    resumes_info.sort(key=lambda x: float(x.get("Score", 0.0)), reverse=True)
+def _must_have(args):
+    return [s.strip() for s in args.get("skills", "").split(",") if s.strip()]
 
-    # Store a lightweight serializable copy of results in session for downloads
+
+def _reranked(features, args):
+    """``(positions, scores)`` of a run re-ranked by ``args``; None keeps the stored order.
+
+    Raises ValueError for malformed weights or filters.
+    """
+    if not args or features is None:
+        return None
+    weights = [float(args.get(k, w)) for k, w in zip(("w_sim", "w_skill", "w_exp"), SCORE_WEIGHTS)]
+    return rerank(features, weights, float(args.get("min_exp", 0)), _must_have(args))
+
+
+def _candidates_at(run, reranked, offset, limit):
+    """Candidates ``offset:offset + limit`` of the stored or re-ranked order (with re-ranked scores)."""
+    if reranked is None:
+        return get_results(run["id"], offset, limit)
+    positions, scores = reranked
+    rows = get_results_at(run["id"], positions[offset:offset + limit])
+    for row, score in zip(rows, scores[offset:offset + limit]):
+        row["Score"] = float(score)
+    return rows
+
+
+def _iter_ranked(run):
+    """Iterator over every candidate of a run, best first, honouring re-rank parameters.
+
+    The query string is read now, so the iterator can be consumed by a
+    streamed response after the request context is gone.
+    """
+    args = _rerank_args()
     try:
-        serializable = []
-        for r in resumes_info:
-            serializable.append({
-                "FileName": r.get("FileName", ""),
-                "Score": float(r.get("Score", 0.0)),
-                "Skills": ", ".join(r.get("Skills", [])) if isinstance(r.get("Skills", []), (list, tuple)) else str(r.get("Skills", "")),
-                "Suggestions": (", ".join(r.get("Suggestions")) if isinstance(r.get("Suggestions"), (list, tuple)) else str(r.get("Suggestions", "")))
-            })
-        session["last_results"] = serializable
-    except Exception:
-        # do not crash on session serialization; skip storing if any issue
-        pass
+        reranked = _reranked(get_features(run["id"]) if args else None, args)
+    except ValueError as exc:
+        abort(400, description=f"Can't re-rank this run: {exc}.")
+    if reranked is None:
+        return iter_results(run["id"])
+    return (row for offset in range(0, len(reranked[0]), EXPORT_CHUNK_ROWS)
+            for row in _candidates_at(run, reranked, offset, EXPORT_CHUNK_ROWS))
+
+
+def _results_page(run):
+    """Render one page of a stored run and remember it as the user's last run."""
+    session["last_run_id"] = run["id"]
+    features = get_features(run["id"])
+    rerank_args = _rerank_args() if features is not None else {}
+    try:
+        reranked = _reranked(features, rerank_args)
+    except ValueError as exc:
+        if request.accept_mimetypes.best == "application/json":
+            return jsonify({"error": f"can't re-rank this run: {exc}"}), 400
+        flash(f"Can't re-rank this run: {exc}.", "warning")
+        reranked, rerank_args = None, {}
+    total = run["total"] if reranked is None else len(reranked[0])
+
+    pages = max(1, -(-total // RESULTS_PER_PAGE))
+    try:
+        page = min(max(1, int(request.args.get("page", 1))), pages)
+    except ValueError:
+        page = 1
+    offset = (page - 1) * RESULTS_PER_PAGE
+    candidates = _candidates_at(run, reranked, offset, RESULTS_PER_PAGE)
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify({"run_id": run["id"], "total": total, "page": page, "pages": pages,
+                        "candidates": candidates})
     return render_template(
         "results.html",
-        resumes_info=resumes_info,
-        jd_text=jd_text,
+        resumes_info=candidates,
+        jd_text=run["jd_text"],
+        run_id=run["id"],
+        run_title=run.get("title"),
+        group_runs=get_group_runs(run["group_id"]) if run.get("group_id") else [],
+        page=page,
+        pages=pages,
+        rank_offset=offset,
+        total=total,
+        can_rerank=features is not None,
+        rerank_args=rerank_args,
+        default_weights=SCORE_WEIGHTS,
         username=session.get("username")
     )
 
 
+def _export_rows(run):
+    """A run's candidates flattened for CSV/PDF export, best first."""
+    return (_export_row(r) for r in _iter_ranked(run))
+
+
+def _export_row(r):
+    return {
+        "FileName": r.get("FileName", ""),
+        "Score": float(r.get("Score", 0.0)),
+        "BestRole": r.get("BestRole", ""),
+        "Skills": ", ".join(r.get("Skills", [])) if isinstance(r.get("Skills", []), (list, tuple)) else str(r.get("Skills", "")),
+        "Suggestions": (", ".join(r.get("Suggestions")) if isinstance(r.get("Suggestions"), (list, tuple)) else str(r.get("Suggestions", "")))
+    }
+
+
+def _export_name(run):
+    """Download file name: one per role when a run belongs to a multi-role job."""
+    title = secure_filename(run.get("title") or "")
+    return f"matching_results_{title}" if title else "matching_results"
+
+
+def _owned_job_or_404(job_id):
+    job = get_job(job_id)
+    if not job or job.get("owner") != session.get("username"):
+        abort(404)
+    return job
+
+
+@app.route("/jobs/<job_id>")
+@login_required
+def job_page(job_id):
+    job = _owned_job_or_404(job_id)
+    return render_template("job.html", job=job, username=session.get("username"))
+
+
+@app.route("/jobs/<job_id>/status")
+@login_required
+def job_status(job_id):
+    job = _owned_job_or_404(job_id)
+    job["files"] = get_job_files(job_id)
+    if job["status"] == "done":
+        job["results_url"] = url_for("job_results", job_id=job_id)
+    return jsonify(job)
+
+
+@app.route("/jobs/<job_id>/results")
+@login_required
+def job_results(job_id):
+    job = _owned_job_or_404(job_id)
+    # A job's results are stored under the job id
+    run = get_run(job_id) if job["status"] == "done" else None
+    if run is None:
+        if job["status"] == "failed":
+            flash(f"Analysis failed: {job.get('error') or 'unknown error'}", "danger")
+            return redirect(url_for("dashboard"))
+        if job["status"] == "done":
+            flash("These results have expired. Please run the analysis again.", "warning")
+            return redirect(url_for("dashboard"))
+        return redirect(url_for("job_page", job_id=job_id))
+
+    if request.accept_mimetypes.best == "application/json":
+        payload = {"job_id": job_id, "run_id": run["id"], "jd_text": run["jd_text"],
+                   "total": run["total"], "candidates": list(iter_results(run["id"]))}
+        if run.get("group_id"):
+            # Multi-role job: the candidates above are the best-role view; each role is its own run
+            payload["runs"] = [dict(r, results_url=url_for("results", run=r["id"]))
+                               for r in get_group_runs(run["group_id"])]
+        return jsonify(payload)
+    return _results_page(run)
+
+
+@app.route("/search", methods=["POST"])
+@login_required
+def search_pool():
+    """Rank every previously screened candidate against an uploaded JD."""
+    jd_text = _uploaded_jd_text()
+    if not jd_text:
+        flash("Please provide a job description to search the candidate pool.", "warning")
+        return redirect(url_for("dashboard"))
+
+    try:
+        top_k = max(1, min(int(request.form.get("top_k", 20)), 500))
+    except ValueError:
+        top_k = 20
+    try:
+        resumes_info = search_candidate_pool(jd_text, session.get("username"), top_k=top_k)
+    except ValueError as exc:
+        flash(f"The candidate pool can't be searched: {exc}.", "warning")
+        return redirect(url_for("dashboard"))
+    run_id = save_run(session.get("username"), jd_text, resumes_info, kind="search")
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify({"run_id": run_id, "jd_text": jd_text, "candidates": resumes_info})
+    session["last_run_id"] = run_id
+    return redirect(url_for("results", run=run_id))
+
+
 @app.route("/results")
 @login_required
 def results():
-    return render_template("results.html", jd_text="", resumes_info=[], username=session.get("username"))
+    run = _owned_run()
+    if run is None:
+        return render_template("results.html", jd_text="", resumes_info=[], username=session.get("username"))
+    return _results_page(run)
 
 
 @app.route('/download_csv')
 @login_required
 def download_csv():
-    data = session.get('last_results')
-    if not data:
+    run = _owned_run()
+    if not run:
+        flash('No results available to download. Run an analysis first.', 'warning')
+        return redirect(url_for('results'))
+
+    best_role = run['kind'] == 'best-role'
+    rows = _export_rows(run)
+
+    def generate():
+        # Rows are written in small chunks so the first byte goes out immediately
+        si = io.StringIO()
+        cw = csv.writer(si)
+        cw.writerow(['Rank', 'FileName', 'MatchScore'] + (['BestRole'] if best_role else []) + ['Skills', 'Suggestions'])
+        for idx, row in enumerate(rows, start=1):
+            cw.writerow([idx, row.get('FileName', ''), '{:.4f}'.format(float(row.get('Score', 0.0)))]
+                        + ([row.get('BestRole', '')] if best_role else [])
+                        + [row.get('Skills', ''), row.get('Suggestions', '')])
+            if idx % EXPORT_CHUNK_ROWS == 0:
+                yield si.getvalue()
+                si.seek(0)
+                si.truncate(0)
+        yield si.getvalue()
+
+    return Response(generate(), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={_export_name(run)}.csv'})
+
+
+@app.route('/download_jsonl')
+@login_required
+def download_jsonl():
+    """Every stored field of every candidate, one JSON object per line."""
+    run = _owned_run()
+    if not run:
         flash('No results available to download. Run an analysis first.', 'warning')
         return redirect(url_for('results'))
 
-    # Create CSV in-memory
-    si = io.StringIO()
-    cw = csv.writer(si)
-    cw.writerow(['Rank', 'FileName', 'MatchScore', 'Skills', 'Suggestions'])
-    for idx, row in enumerate(data, start=1):
-        cw.writerow([idx, row.get('FileName', ''), '{:.4f}'.format(float(row.get('Score', 0.0))), row.get('Skills', ''), row.get('Suggestions', '')])
+    candidates = _iter_ranked(run)
 
-    output = si.getvalue()
-    mem = io.BytesIO()
-    mem.write(output.encode('utf-8'))
-    mem.seek(0)
+    def generate():
+        for idx, candidate in enumerate(candidates, start=1):
+            yield json.dumps({'Rank': idx, **candidate}) + '\n'
 
-    return send_file(mem, as_attachment=True, download_name='matching_results.csv', mimetype='text/csv')
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': f'attachment; filename={_export_name(run)}.jsonl'})
+
+
+@app.route('/download_parquet')
+@login_required
+def download_parquet():
+    run = _owned_run()
+    if not run:
+        flash('No results available to download. Run an analysis first.', 'warning')
+        return redirect(url_for('results'))
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception:
+        flash("Parquet export requires the 'pyarrow' package. Install it with: pip install pyarrow", 'danger')
+        return redirect(url_for('results'))
+
+    def as_list(value):
+        if isinstance(value, (list, tuple)):
+            return [str(v) for v in value]
+        return [str(value)] if value else []
+
+    schema = pa.schema([
+        ('Rank', pa.int32()), ('FileName', pa.string()), ('Name', pa.string()), ('Email', pa.string()),
+        ('Phone', pa.string()), ('Score', pa.float64()), ('Skills', pa.list_(pa.string())),
+        ('Education', pa.string()), ('Suggestions', pa.list_(pa.string())), ('BestRole', pa.string()),
+    ])
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    with pq.ParquetWriter(spool, schema) as writer:
+        batch = []
+        for idx, r in enumerate(_iter_ranked(run), start=1):
+            batch.append({
+                'Rank': idx, 'FileName': r.get('FileName', ''), 'Name': r.get('Name') or '',
+                'Email': r.get('Email') or '', 'Phone': r.get('Phone') or '',
+                'Score': float(r.get('Score', 0.0)), 'Skills': as_list(r.get('Skills', [])),
+                'Education': r.get('education') or '', 'Suggestions': as_list(r.get('Suggestions', [])),
+                'BestRole': r.get('BestRole', ''),
+            })
+            if len(batch) >= EXPORT_CHUNK_ROWS:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    spool.seek(0)
+    return send_file(spool, as_attachment=True, download_name=f'{_export_name(run)}.parquet',
+                     mimetype='application/vnd.apache.parquet')
 
 
 @app.route('/export_pdf')
 @login_required
 def export_pdf():
-    data = session.get('last_results')
-    if not data:
+    """A printable PDF of the best ``PDF_EXPORT_MAX_ROWS`` candidates.
+
+    Not streamed: reportlab keeps every page in memory until ``save``, so
+    the row cap is what bounds memory.  The CSV, JSONL and Parquet exports
+    include the whole run.
+    """
+    run = _owned_run()
+    if not run:
         flash('No results available to export. Run an analysis first.', 'warning')
         return redirect(url_for('results'))
 
@@ -412,8 +755,9 @@ def export_pdf():
         flash("PDF export requires the 'reportlab' package. Install it with: pip install reportlab", 'danger')
         return redirect(url_for('results'))
 
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+    # Compressed pages; the finished file moves to disk once it passes EXPORT_SPOOL_BYTES
+    buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
     width, height = letter
 
     # Header
@@ -421,6 +765,8 @@ def export_pdf():
     c.drawString(40, height - 40, 'Candidate Matching Results')
     c.setFont('Helvetica', 10)
     c.drawString(40, height - 60, f'Generated for: {session.get("username", "") or "User"}')
+    if run.get('title'):
+        c.drawString(300, height - 60, f'Role: {run["title"]}'[:50])
 
     y = height - 90
     line_height = 14
@@ -434,7 +780,11 @@ def export_pdf():
     y -= line_height
     c.setFont('Helvetica', 9)
 
-    for idx, row in enumerate(data, start=1):
+    truncated = False
+    for idx, row in enumerate(_export_rows(run), start=1):
+        if idx > PDF_EXPORT_MAX_ROWS:
+            truncated = True
+            break
         if y < 80:
             c.showPage()
             y = height - 50
@@ -452,6 +802,8 @@ def export_pdf():
 
         # Suggestions on next line (wrapped)
         sugg = str(row.get('Suggestions', ''))
+        if row.get('BestRole'):
+            sugg = f"Best role: {row['BestRole']}. {sugg}"
         if sugg:
             # naive wrap at ~90 chars
             parts = [sugg[i:i+90] for i in range(0, len(sugg), 90)]
@@ -463,9 +815,17 @@ def export_pdf():
                 c.drawString(80, y, p)
                 y -= line_height
 
+    if truncated:
+        if y < 60:
+            c.showPage()
+            y = height - 50
+        c.setFont('Helvetica-Oblique', 9)
+        c.drawString(40, y - line_height,
+                     f'Showing the top {PDF_EXPORT_MAX_ROWS} candidates; download the CSV for all of them.')
+
     c.save()
     buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name='matching_results.pdf', mimetype='application/pdf')
+    return send_file(buffer, as_attachment=True, download_name=f'{_export_name(run)}.pdf', mimetype='application/pdf')
 
 
 # ---------- Run ----------
@@ -0,0 +1,120 @@
+"""Compare sentence-encoder backends on speed, memory and score parity.
+
+    python benchmarks/bench_encoder_backends.py [--backends torch,onnx,onnx-int8] [--docs 200]
+        [--threads 0] [--batch-size 32] [--tolerance 0.02] [--json out.json]
+
+Each backend is loaded in its own process, so its peak RSS is its own, and
+encodes the same synthetic resumes and job description, chunked as in
+scoring.  Match scores are compared with the first backend (the reference,
+normally "torch"); the exit status is 1 when any score differs by more than
+``--tolerance``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matcher  # noqa: E402
+from benchmarks.synthetic import jd_text, resume_text  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def encode_with(backend, texts, threads, batch_size):
+    """Runs in a fresh process: load ``backend`` and encode ``texts``."""
+    start = time.perf_counter()
+    model = matcher.load_model(backend, threads)
+    loaded = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    done = time.perf_counter()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None
+    return {"load_seconds": round(loaded - start, 3), "encode_seconds": round(done - loaded, 4),
+            "peak_rss_mb": round(peak, 1) if peak else None, "vectors": np.asarray(vectors, dtype=np.float32)}
+
+
+def match_scores(vectors, counts, jd, resumes):
+    """Final blended scores of ``resumes`` for ``jd`` from the chunk vectors of ``[jd] + resumes``."""
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    split = counts[0]
+    job = vectors[:split].sum(axis=0)
+    job /= max(np.linalg.norm(job), 1e-8)
+    similarity = matcher.pool_similarities(job @ vectors[split:].T, offsets[1:] - split, counts[1:])
+    return matcher.score_matrix(similarity,
+                                matcher.skill_matrix([matcher.extract_skills(jd)]),
+                                [matcher.extract_years_of_experience(jd)],
+                                matcher.skill_matrix([matcher.extract_skills(r) for r in resumes]),
+                                [matcher.extract_years_of_experience(r) for r in resumes])[0]
+
+
+def run(backends, docs, threads, batch_size):
+    jd = jd_text()
+    resumes = [resume_text(i) for i in range(docs)]
+    chunked = [matcher.chunk_text(t) for t in [jd] + resumes]
+    counts = np.array([len(c) for c in chunked])
+    texts = [chunk for chunks in chunked for chunk in chunks]
+
+    report, reference = {}, None
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            try:
+                row = pool.submit(encode_with, backend, texts, threads, batch_size).result()
+            except Exception as exc:
+                report[backend] = {"skipped": str(exc).splitlines()[0][:200]}
+                continue
+        scores = match_scores(row.pop("vectors"), counts, jd, resumes)
+        row["ms_per_chunk"] = round(1000 * row["encode_seconds"] / len(texts), 3)
+        if reference is None:
+            reference = scores
+        else:
+            row["max_score_diff"] = round(float(np.abs(scores - reference).max()), 5)
+            row["top10_overlap"] = len(set(np.argsort(-scores)[:10]) & set(np.argsort(-reference)[:10]))
+        report[backend] = row
+    return {"chunks": len(texts), "resumes": docs, "backends": report}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default=",".join(matcher.ENCODER_BACKENDS),
+                        help="comma-separated; the first one is the reference")
+    parser.add_argument("--docs", type=int, default=200, help="synthetic resumes to encode")
+    parser.add_argument("--threads", type=int, default=matcher.ENCODE_THREADS, help="intra-op threads (0 = default)")
+    parser.add_argument("--batch-size", type=int, default=matcher.ENCODE_BATCH_SIZE)
+    parser.add_argument("--tolerance", type=float, default=0.02, help="largest allowed match score difference")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    report = run(backends, args.docs, args.threads, args.batch_size)
+    print(f"{report['resumes']} resumes, {report['chunks']} chunks")
+    print(f"{'backend':<12}{'load s':>9}{'encode s':>10}{'ms/chunk':>10}{'RSS MB':>9}{'max diff':>10}{'top10':>7}")
+    failed = False
+    for backend, row in report["backends"].items():
+        if "skipped" in row:
+            print(f"{backend:<12}skipped: {row['skipped']}")
+            continue
+        diff = row.get("max_score_diff")
+        failed = failed or (diff is not None and diff > args.tolerance)
+        print(f"{backend:<12}{row['load_seconds']:>9}{row['encode_seconds']:>10}{row['ms_per_chunk']:>10}"
+              f"{str(row['peak_rss_mb']):>9}{'-' if diff is None else diff:>10}{row.get('top10_overlap', '-'):>7}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if failed:
+        print(f"score difference above tolerance {args.tolerance}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
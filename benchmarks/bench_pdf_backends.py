@@ -0,0 +1,87 @@
+"""Compare PDF extraction backends on resume.pdf and a synthetic corpus.
+
+    python benchmarks/bench_pdf_backends.py [--docs 20] [--long-pages 60] [--json out.json]
+
+For every backend (and "auto", serial and with page-parallel extraction)
+this reports the total extraction time, the quality score
+``extract_pdf_text`` uses to choose a backend, and the share of
+pdfplumber's words the backend recovered.  The synthetic corpus needs
+reportlab; without it only the PDFs shipped in the repo are measured.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import text_extraction  # noqa: E402
+from benchmarks.synthetic import synthetic_pdf  # noqa: E402
+from text_extraction import PDF_BACKENDS, extract_pdf_text, pdf_text_quality  # noqa: E402
+
+
+def corpus(docs, long_pages):
+    files = [(os.path.basename(p), open(p, "rb").read())
+             for p in sorted(glob.glob(os.path.join(ROOT, "*.pdf")))]
+    try:
+        files += [(f"synthetic_{i}.pdf", synthetic_pdf(1 + i % 3, i)) for i in range(docs)]
+        if long_pages:
+            files.append((f"synthetic_long_{long_pages}p.pdf", synthetic_pdf(long_pages, -1)))
+    except ImportError:
+        print("reportlab not installed: measuring repository PDFs only", file=sys.stderr)
+    return files
+
+
+def word_recall(text, reference):
+    ref = set(reference.lower().split())
+    return len(ref & set(text.lower().split())) / len(ref) if ref else 1.0
+
+
+def run(files, backends, parallel=False):
+    """``parallel`` extracts as screen_cli does: long documents split across processes."""
+    reference = {name: extract_pdf_text(data, backend="pdfplumber", parallel=False) for name, data in files}
+    text_extraction.PDF_PAGE_PARALLEL = parallel
+    report = {}
+    for backend in backends:
+        elapsed, quality, recall = 0.0, [], []
+        for name, data in files:
+            start = time.perf_counter()
+            text = extract_pdf_text(data, backend=backend)
+            elapsed += time.perf_counter() - start
+            quality.append(pdf_text_quality(text))
+            recall.append(word_recall(text, reference[name]))
+        report[backend + (" (parallel)" if parallel else "")] = {
+            "seconds": round(elapsed, 4),
+            "ms_per_doc": round(1000 * elapsed / len(files), 2),
+            "mean_quality": round(sum(quality) / len(quality), 4),
+            "mean_word_recall": round(sum(recall) / len(recall), 4),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20, help="synthetic resumes to generate")
+    parser.add_argument("--long-pages", type=int, default=60,
+                        help="pages in one long synthetic document (0 to skip)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    files = corpus(args.docs, args.long_pages)
+    report = run(files, PDF_BACKENDS + ("auto",))
+    report.update(run(files, ("auto",), parallel=True))
+    print(f"{len(files)} documents")
+    print(f"{'backend':<18}{'seconds':>10}{'ms/doc':>10}{'quality':>10}{'recall':>10}")
+    for backend, row in report.items():
+        print(f"{backend:<18}{row['seconds']:>10}{row['ms_per_doc']:>10}"
+              f"{row['mean_quality']:>10}{row['mean_word_recall']:>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"documents": len(files), "backends": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
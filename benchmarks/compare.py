@@ -0,0 +1,52 @@
+"""Compare two ``benchmarks.run`` reports and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Prints the time ratio (candidate / baseline) for every benchmark and size
+present in both reports.  Exits with status 1 when any benchmark got slower
+by more than ``--threshold`` and by more than ``--min-seconds`` in absolute
+terms, which keeps sub-millisecond noise from failing a run.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline, candidate, threshold=0.10, min_seconds=0.005):
+    """Return ``[(benchmark, size, base seconds, new seconds, ratio, regressed)]``."""
+    rows = []
+    for name, sizes in sorted(candidate["results"].items()):
+        for size, new in sizes.items():
+            base = baseline["results"].get(name, {}).get(size)
+            if not base or "seconds" not in base or "seconds" not in new:
+                continue
+            ratio = new["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            regressed = ratio > 1 + threshold and new["seconds"] - base["seconds"] > min_seconds
+            rows.append((name, int(size), base["seconds"], new["seconds"], ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore smaller absolute slowdowns")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold, args.min_seconds)
+    print(f"{'benchmark':<42}{'size':>7}{'base s':>11}{'new s':>11}{'ratio':>8}")
+    for name, size, base, new, ratio, regressed in rows:
+        print(f"{name:<42}{size:>7}{base:>11.4f}{new:>11.4f}{ratio:>8.2f}{'  REGRESSION' if regressed else ''}")
+    regressions = sum(r[-1] for r in rows)
+    print(f"{len(rows)} compared, {regressions} regressed")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Time and memory benchmarks for the screening hot paths.
+
+    python -m benchmarks.run [--sizes 10,100,1000,10000] [--only extract,parse] [--out bench.json]
+    python -m benchmarks.compare baseline.json bench.json
+
+Each benchmark runs once per corpus size on synthetic resumes (see
+``benchmarks.synthetic``): ``extract_text`` per format, every
+``resume_parser`` extractor, ``match_job_to_candidates`` against a cold and a
+warm embedding cache, ``suggest_improvements``, and re-ranking a stored run
+(``reranking.rerank`` plus fetching the first page).  Seconds come from an
+untraced run; peak Python memory from a second run under ``tracemalloc``
+(skip it with ``--no-memory``).  Models are loaded from the local cache only
+(Hugging Face offline mode); benchmarks whose model is missing are recorded as
+skipped rather than failing the run.  Caches go to a temporary directory,
+removed afterwards, so results never depend on, or pollute, the app's caches.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = (10, 100, 1000)
+GROUPS = ("extract", "parse", "match", "suggest", "rerank")
+
+
+class Skip(Exception):
+    """A benchmark that cannot run here (missing model or optional package)."""
+
+
+def isolate_caches(scratch):
+    """Point the app's caches and model loading at ``scratch``; call before importing app modules.
+
+    The app modules read these settings once, at import, so the benchmarks
+    import them lazily.
+    """
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    os.environ.setdefault("THINKHIRE_EMBED_CACHE_DIR", os.path.join(scratch, "embeddings"))
+    os.environ.setdefault("THINKHIRE_EXTRACT_CACHE_DB", os.path.join(scratch, "extraction.sqlite3"))
+    os.environ.setdefault("THINKHIRE_CANDIDATE_INDEX_DIR", os.path.join(scratch, "candidates"))
+    os.environ.setdefault("THINKHIRE_RESULTS_DB", os.path.join(scratch, "results.sqlite3"))
+
+
+def measure(run, setup=None, memory=True):
+    """``{"seconds", "peak_kb"}`` for ``run(*setup())``; setup time is not counted."""
+    def once(trace):
+        args = setup() if setup else ()
+        gc.collect()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run(*args)
+        elapsed = time.perf_counter() - start
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return elapsed, peak
+
+    seconds, _ = once(False)
+    result = {"seconds": round(seconds, 6)}
+    if memory:
+        result["peak_kb"] = round(once(True)[1] / 1024, 1)
+    return result
+
+
+class Corpus:
+    """Synthetic inputs for one size, generated lazily and reused across benchmarks."""
+
+    def __init__(self, size, scratch):
+        from benchmarks import synthetic
+
+        self.size = size
+        self.scratch = scratch
+        self.texts = [synthetic.resume_text(i) for i in range(size)]
+        self.jd = synthetic.jd_text()
+        self._files = {}
+
+    def files(self, fmt):
+        from benchmarks import synthetic
+
+        if fmt not in self._files:
+            try:
+                self._files[fmt] = synthetic.corpus(self.size, fmt)
+            except ImportError as exc:
+                raise Skip(f"{fmt} corpus needs {exc.name}")
+        return self._files[fmt]
+
+
+def _require(load, what):
+    try:
+        load()
+    except Exception as exc:
+        raise Skip(f"{what} unavailable: {str(exc).splitlines()[0][:200]}")
+
+
+def _fresh_embedding_cache(scratch):
+    import matcher
+    from embedding_cache import EmbeddingCache
+
+    matcher.embedding_cache = EmbeddingCache(matcher.cache_model_name(), directory=tempfile.mkdtemp(dir=scratch))
+
+
+# ---------- Benchmarks ----------
+def extract_benchmarks(c, memory):
+    from text_extraction import extract_text, iter_extracted, iter_zip_members
+
+    def extract_all(files):
+        for name, data in files:
+            extract_text(data, name)
+
+    def extract_zip(files):
+        for _, archive in files:
+            with tempfile.SpooledTemporaryFile() as f:
+                f.write(archive)
+                f.seek(0)
+                for name, data in iter_zip_members(f, (".txt",), max_members=sys.maxsize,
+                                                   max_total_bytes=sys.maxsize):
+                    extract_text(data, name)
+
+    for fmt in ("txt", "docx", "pdf"):
+        yield f"extract_text.{fmt}", lambda fmt=fmt: measure(extract_all, lambda: (c.files(fmt),), memory)
+    yield "extract_text.zip", lambda: measure(extract_zip, lambda: (c.files("zip"),), memory)
+    yield "iter_extracted.docx", lambda: measure(
+        lambda files: list(iter_extracted(files, use_cache=False)), lambda: (c.files("docx"),), memory)
+
+
+def parse_benchmarks(c, memory):
+    import resume_parser
+
+    def each(fn):
+        return lambda: measure(lambda: [fn(t) for t in c.texts], memory=memory)
+
+    yield "resume_parser.extract_name", each(lambda t: resume_parser.extract_name(t, ner_fallback=False))
+    yield "resume_parser.extract_email", each(resume_parser.extract_email)
+    yield "resume_parser.extract_phone", each(resume_parser.extract_phone)
+    yield "resume_parser.extract_skills", each(resume_parser.extract_skills)
+    yield "resume_parser.extract_education", each(resume_parser.extract_education)
+    yield "resume_parser.parse_resume", each(lambda t: resume_parser.parse_resume(t, c.jd, ner_fallback=False))
+
+    def names():
+        _require(resume_parser.get_nlp, "spaCy model")
+        return measure(lambda: resume_parser.extract_names(c.texts), memory=memory)
+    yield "resume_parser.extract_names", names
+
+
+def match_benchmarks(c, memory):
+    import matcher
+
+    def run():
+        matcher.match_job_to_candidates(c.jd, c.texts, top_k=len(c.texts))
+
+    def fresh_cache():
+        _fresh_embedding_cache(c.scratch)
+        return ()
+
+    def cold():
+        _require(matcher.get_model, "sentence-transformer model")
+        return measure(run, fresh_cache, memory)
+
+    def warm():
+        _require(matcher.get_model, "sentence-transformer model")
+        _fresh_embedding_cache(c.scratch)
+        run()
+        return measure(run, memory=memory)
+
+    yield "matcher.match_job_to_candidates.cold", cold
+    yield "matcher.match_job_to_candidates.warm", warm
+
+
+def suggest_benchmarks(c, memory):
+    import matcher
+
+    skills = [matcher.extract_skills(t) for t in c.texts]
+    job_skills = matcher.extract_skills(c.jd)
+
+    def run():
+        for text, resume_skills in zip(c.texts, skills):
+            matcher.suggest_improvements(c.jd, text, resume_skills, job_skills=job_skills)
+
+    yield "matcher.suggest_improvements", lambda: measure(run, memory=memory)
+
+
+def rerank_benchmarks(c, memory):
+    import matcher
+    import result_store
+    from reranking import rerank, role_features
+
+    # Stored score components as screening saves them; the model is not needed
+    rng = np.random.default_rng(0)
+    components = {
+        "similarity": rng.random((1, c.size), dtype=np.float32),
+        "skill_score": rng.random((1, c.size), dtype=np.float32),
+        "experience_score": rng.random((1, c.size), dtype=np.float32),
+        "experience": np.array([matcher.extract_years_of_experience(t) for t in c.texts], dtype=np.float32),
+        "skills": matcher.skill_matrix([matcher.extract_skills(t) for t in c.texts]),
+    }
+    candidates = [{"FileName": f"r{i}.txt", "Score": 0.0} for i in range(c.size)]
+    run_id = result_store.save_run("bench", c.jd, candidates,
+                                   features=role_features(components, 0, np.arange(c.size)))
+
+    def run():
+        positions, _ = rerank(result_store.get_features(run_id), weights=(0.2, 0.6, 0.2), must_have=["Python"])
+        result_store.get_results_at(run_id, positions[:50])
+
+    yield "reranking.rerank_and_first_page", lambda: measure(run, memory=memory)
+
+
+BENCHMARKS = {"extract": extract_benchmarks, "parse": parse_benchmarks,
+              "match": match_benchmarks, "suggest": suggest_benchmarks, "rerank": rerank_benchmarks}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(sizes, scratch, groups=GROUPS, memory=True, log=sys.stderr):
+    """Run ``groups`` at each corpus size; ``scratch`` must be the directory given to ``isolate_caches``."""
+    results = {}
+    for size in sizes:
+        corpus = Corpus(size, scratch)
+        for group in groups:
+            for name, bench in BENCHMARKS[group](corpus, memory):
+                try:
+                    row = bench()
+                    row["ms_per_item"] = round(1000 * row["seconds"] / size, 4)
+                except Skip as exc:
+                    row = {"skipped": str(exc)}
+                results.setdefault(name, {})[str(size)] = row
+                if log:
+                    shown = row.get("skipped") or f"{row['seconds']:.4f}s ({row['ms_per_item']} ms/item)"
+                    print(f"{size:>6}  {name:<40} {shown}", file=log)
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, parsing and matching.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated corpus sizes (e.g. 10,100,1000,10000)")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"groups to run: {', '.join(GROUPS)}")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+    scratch = tempfile.mkdtemp(prefix="thinkhire-bench-")
+    try:
+        isolate_caches(scratch)
+        report = run_suite([int(s) for s in args.sizes.split(",")], scratch, groups, memory=not args.no_memory)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Deterministic synthetic resumes and job descriptions for benchmarks.
+
+Texts draw on the shared skill taxonomy so the parser and scorer do real
+work.  ``write_corpus`` renders them as TXT, DOCX (a minimal WordprocessingML
+package, no extra dependency), PDF (needs reportlab) or one zip of TXT files.
+"""
+import io
+import os
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from skill_matcher import SKILL_NAMES  # noqa: E402
+
+FIRST = ["Asha", "Rahul", "Priya", "Kiran", "Ananya", "Vikram", "Sneha", "Arjun", "Meera", "Rohan"]
+LAST = ["Sharma", "Mehta", "Nair", "Rao", "Patil", "Iyer", "Kulkarni", "Das", "Joshi", "Bose"]
+DEGREES = ["B.Tech in Computer Engineering", "Bachelor of Science in Information Technology",
+           "M.Tech in Data Science", "MBA in Operations", "B.E. in Electronics and Telecommunication"]
+COLLEGES = ["Pune Institute of Technology", "Cummins College of Engineering", "National Institute of Technology",
+            "University of Mumbai", "Indian Institute of Science"]
+VERBS = ["Built", "Led", "Designed", "Deployed", "Optimised", "Maintained", "Migrated", "Automated"]
+THINGS = ["REST APIs", "data pipelines", "dashboards", "microservices", "ML models", "CI/CD workflows",
+          "reporting tools", "search features"]
+FORMATS = ("txt", "docx", "pdf", "zip")
+
+
+def resume_text(seed):
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    skills = rng.sample(SKILL_NAMES, rng.randint(4, 12))
+    start = rng.randint(2005, 2019)
+    lines = [
+        f"{first.upper()} {last.upper()}",
+        f"{first.lower()}.{last.lower()}{seed}@example.com | +91 98{rng.randint(10000000, 99999999)}",
+        "",
+        "SUMMARY",
+        f"Engineer with {rng.randint(1, 15)} years of experience in {', '.join(skills[:3])}.",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(rng.randint(2, 6)):
+        lines.append(f"{rng.choice(VERBS)} {rng.choice(THINGS)} using {rng.choice(skills)} "
+                     f"for {rng.randint(2, 40)} teams, improving throughput by {rng.randint(5, 60)}%.")
+    lines += ["", "EDUCATION", f"{rng.choice(DEGREES)}, {rng.choice(COLLEGES)} {start} - {start + 4}"]
+    return "\n".join(lines)
+
+
+def jd_text(seed=0):
+    rng = random.Random(-1 - seed)
+    skills = rng.sample(SKILL_NAMES, 6)
+    return (f"We are hiring a software engineer with {rng.randint(2, 8)}+ years of experience. "
+            f"Required skills: {', '.join(skills)}. You will build {rng.choice(THINGS)} and work with "
+            f"{rng.choice(THINGS)} in an agile team.")
+
+
+def docx_bytes(text):
+    paragraphs = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>"
+                         for line in text.splitlines())
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/'
+                   'package/2006/content-types"><Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-'
+                   'officedocument.wordprocessingml.document.main+xml"/></Types>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="http://schemas.openxmlformats.org/'
+                   f'wordprocessingml/2006/main"><w:body>{paragraphs}</w:body></w:document>')
+    return buf.getvalue()
+
+
+def pdf_bytes(text, pages=1):
+    """Render ``text`` on each of ``pages`` pages (requires reportlab)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for _ in range(pages):
+        y = 750
+        c.setFont("Helvetica", 10)
+        for line in text.splitlines():
+            if y < 72:
+                c.showPage()
+                c.setFont("Helvetica", 10)
+                y = 750
+            c.drawString(72, y, line)
+            y -= 14
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def synthetic_pdf(pages, seed):
+    """A resume-like PDF with ``pages`` pages."""
+    return pdf_bytes(resume_text(seed), pages)
+
+
+def corpus(count, fmt="txt"):
+    """``[(filename, bytes)]`` of ``count`` resumes in one format ("zip" yields a single archive)."""
+    texts = [resume_text(i) for i in range(count)]
+    if fmt == "txt":
+        return [(f"resume_{i}.txt", t.encode("utf-8")) for i, t in enumerate(texts)]
+    if fmt == "docx":
+        return [(f"resume_{i}.docx", docx_bytes(t)) for i, t in enumerate(texts)]
+    if fmt == "pdf":
+        return [(f"resume_{i}.pdf", pdf_bytes(t)) for i, t in enumerate(texts)]
+    if fmt == "zip":
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+            for i, t in enumerate(texts):
+                z.writestr(f"resumes/resume_{i}.txt", t)
+        return [("resumes.zip", buf.getvalue())]
+    raise ValueError(f"unknown format '{fmt}'")
+
+
+def write_corpus(directory, count, fmt="txt"):
+    """Write a corpus to ``directory`` and return the file paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, data in corpus(count, fmt):
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
@@ -0,0 +1,206 @@
+"""Persistent store of every screened candidate, searchable by JD.
+
+Each resume's unit-normalized document embedding is appended to a float32
+file that is memory-mapped for search, and its parsed fields go into a
+SQLite table whose row id is the vector's row.  Search is an exact inner
+product over the mapped matrix in fixed-size blocks, so memory stays flat
+and tens of thousands of candidates rank in milliseconds.
+
+Every candidate belongs to the user who screened it: ``add``, ``search``
+and ``get`` all take an ``owner`` and never cross it.
+
+Vectors are only comparable within one embedding space: one model,
+encoder backend and embed mode (see ``matcher.embedding_space``).  The pool records the space of its first
+vectors and refuses to add or search with another one; the texts are not
+kept, so a pool can't be re-embedded and a new space needs a new
+``INDEX_DIR``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+INDEX_DIR = os.environ.get(
+    "THINKHIRE_CANDIDATE_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "candidates"),
+)
+# Rows scored per matrix product; keeps search memory independent of pool size
+SEARCH_BLOCK_ROWS = 65536
+
+
+def content_hash(text):
+    return hashlib.sha256(" ".join((text or "").split()).encode("utf-8")).hexdigest()
+
+
+class CandidateIndex:
+    def __init__(self, directory=None):
+        self.directory = directory or INDEX_DIR
+        self._thread_lock = threading.Lock()
+        self._db = None
+        self._vectors = None
+
+    # ---------- storage ----------
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(self.directory, exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.directory, "candidates.sqlite3"),
+                                 timeout=30, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+            columns = [r[1] for r in db.execute("PRAGMA table_info(candidates)")]
+            if columns and "owner" not in columns:
+                # Pools from before owners keep their rows, visible to nobody
+                db.execute("ALTER TABLE candidates RENAME TO candidates_unowned")
+            db.execute("""CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL, file_name TEXT,
+                name TEXT, email TEXT, phone TEXT, skills TEXT, education TEXT,
+                experience INTEGER, added_at REAL, owner TEXT NOT NULL DEFAULT '',
+                UNIQUE (owner, content_hash))""")
+            if columns and "owner" not in columns:
+                db.execute("INSERT INTO candidates SELECT *, '' FROM candidates_unowned")
+                db.execute("DROP TABLE candidates_unowned")
+            db.execute("CREATE INDEX IF NOT EXISTS candidates_owner ON candidates (owner)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    @property
+    def _vector_path(self):
+        return os.path.join(self.directory, "vectors.f32")
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with self._thread_lock:
+            db = self._connect()
+            if fcntl is None:
+                yield db
+                return
+            with open(os.path.join(self.directory, "lock"), "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield db
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _dim(self):
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return row[0] if row else None
+
+    def _check_space(self, db, space, record=False):
+        if space is None:
+            return
+        row = db.execute("SELECT value FROM meta WHERE name = 'space'").fetchone()
+        if row is None:
+            if record:
+                db.execute("INSERT INTO meta VALUES ('space', ?)", (space,))
+        elif row[0] != space:
+            raise ValueError(f"the candidate pool holds '{row[0]}' embeddings, not '{space}'; "
+                             "restore the embedding settings or point THINKHIRE_CANDIDATE_INDEX_DIR elsewhere")
+
+    def _matrix(self, rows):
+        """Map the first ``rows`` vectors, remapping only when the pool has grown."""
+        dim = self._dim()
+        if not rows or not dim:
+            return None
+        if self._vectors is None or self._vectors.shape != (rows, dim):
+            self._vectors = np.memmap(self._vector_path, dtype=np.float32, mode="r", shape=(rows, dim))
+        return self._vectors
+
+    # ---------- public API ----------
+    def __len__(self):
+        with self._locked(exclusive=False) as db:
+            return db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def add(self, records, vectors, owner, space=None):
+        """Add ``owner``'s parsed candidates; ones whose text they indexed before are skipped.
+
+        ``records`` are dicts with ``content_hash`` plus the parsed fields;
+        ``vectors`` are their unit-normalized embeddings, from embedding
+        ``space``.  Raises ValueError if the pool holds another space.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        added = 0
+        with self._locked(exclusive=True) as db:
+            self._check_space(db, space, record=True)
+            dim = self._dim()
+            if dim is None:
+                db.execute("INSERT INTO meta VALUES ('dim', ?)", (int(vectors.shape[1]),))
+                dim = int(vectors.shape[1])
+            if vectors.shape[1] != dim:
+                return 0
+            count = db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            seen = set()
+            new_rows, new_vectors = [], []
+            for record, vector in zip(records, vectors):
+                h = record["content_hash"]
+                if h in seen or db.execute("SELECT 1 FROM candidates WHERE owner = ? AND content_hash = ?",
+                                           (owner, h)).fetchone():
+                    continue
+                seen.add(h)
+                new_rows.append((count + len(new_rows), h, record.get("file_name", ""), record.get("name", ""),
+                                 record.get("email", ""), record.get("phone", ""),
+                                 json.dumps(record.get("skills", [])), record.get("education", ""),
+                                 int(record.get("experience", 0) or 0), time.time(), owner))
+                new_vectors.append(vector)
+            if new_rows:
+                # Vectors first: a row id is only visible once its vector is on disk
+                with open(self._vector_path, "r+b" if os.path.exists(self._vector_path) else "wb") as f:
+                    f.seek(count * dim * 4)
+                    f.write(np.stack(new_vectors).astype(np.float32).tobytes())
+                db.executemany("INSERT INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", new_rows)
+                db.commit()
+                added = len(new_rows)
+        return added
+
+    def search(self, query, owner, top_k=10, space=None, max_rows=None):
+        """Return ``[(candidate id, cosine similarity)]`` over ``owner``'s candidates, best first.
+
+        Only the owner's rows are read, and with ``max_rows`` only their
+        most recently added ``max_rows``.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+        with self._locked(exclusive=False) as db:
+            self._check_space(db, space)
+            rows = db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            ids = np.fromiter((r[0] for r in db.execute(
+                "SELECT id FROM candidates WHERE owner = ? ORDER BY id DESC LIMIT ?", (owner, max_rows or -1))),
+                dtype=np.int64)[::-1]
+            matrix = self._matrix(rows)
+            if matrix is None or top_k <= 0 or not len(ids):
+                return []
+            scores = np.empty(len(ids), dtype=np.float32)
+            for start in range(0, len(ids), SEARCH_BLOCK_ROWS):
+                block = ids[start:start + SEARCH_BLOCK_ROWS]
+                scores[start:start + len(block)] = matrix[block] @ query
+
+        k = min(top_k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def get(self, ids, owner):
+        """Return parsed fields for ``owner``'s candidate ids, in the order given."""
+        if not ids:
+            return []
+        with self._locked(exclusive=False) as db:
+            rows = db.execute(
+                f"SELECT * FROM candidates WHERE owner = ? AND id IN ({','.join('?' * len(ids))})",
+                [owner, *ids],
+            ).fetchall()
+        by_id = {r["id"]: dict(r, skills=json.loads(r["skills"] or "[]")) for r in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+
+candidate_index = CandidateIndex()
@@ -0,0 +1,117 @@
+"""Duplicate resume detection within one upload.
+
+The same candidate often arrives several times in a batch: a PDF and a DOCX
+of one CV, or one CV in two zips.  ``DuplicateFinder`` checks each text as
+soon as it is extracted, so copies skip parsing, embedding and scoring:
+
+* exact: the same text once whitespace is collapsed;
+* near: MinHash signatures of word shingles, bucketed with LSH, whose
+  estimated Jaccard similarity is at least ``THRESHOLD``;
+* same contact: a shared email address or phone number is strong evidence,
+  so such pairs only need ``CONTACT_THRESHOLD``.
+
+The first text ``add``-ed represents its group, so callers add texts in
+upload order to keep the earliest upload as the representative.
+"""
+import hashlib
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from resume_parser import extract_email, extract_phone
+
+DEDUP_ENABLED = os.environ.get("THINKHIRE_DEDUP", "1") == "1"
+THRESHOLD = float(os.environ.get("THINKHIRE_DEDUP_THRESHOLD", "0.8"))
+CONTACT_THRESHOLD = float(os.environ.get("THINKHIRE_DEDUP_CONTACT_THRESHOLD", "0.3"))
+SHINGLE_WORDS = 4
+# 16 bands of 4 rows: pairs at Jaccard 0.8 share a bucket with probability > 0.999
+NUM_PERM = 64
+BANDS = 16
+
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32, so a * h + b fits in uint64
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 32 - 1, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32 - 1, NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def signature(words):
+    """MinHash signature (``NUM_PERM`` uint64 values) of a text's word shingles."""
+    k = min(SHINGLE_WORDS, len(words))
+    shingles = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _contact_keys(text):
+    keys = []
+    email = extract_email(text)
+    if email != "Not Found":
+        keys.append("email:" + email.lower())
+    digits = re.sub(r"\D", "", extract_phone(text))
+    if len(digits) >= 7:
+        keys.append("phone:" + digits[-10:])
+    return keys
+
+
+class DuplicateFinder:
+    """Incremental duplicate detection: ``add`` each text once, in upload order."""
+
+    def __init__(self, threshold=None, contact_threshold=None):
+        self.threshold = THRESHOLD if threshold is None else threshold
+        self.contact_threshold = CONTACT_THRESHOLD if contact_threshold is None else contact_threshold
+        self._exact = {}
+        self._contacts = defaultdict(list)
+        self._buckets = defaultdict(list)
+        self._signatures = {}
+
+    def add(self, index, text):
+        """The index of an earlier text that ``text`` duplicates, or None (it becomes a representative).
+
+        Texts without words (failed extractions) are never duplicates.
+        """
+        words = _WORD_RE.findall((text or "").lower())
+        if not words:
+            return None
+        digest = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+        if digest in self._exact:
+            return self._exact[digest]
+
+        sig = signature(words)
+        contacts = _contact_keys(text)
+        for key in contacts:
+            for other in self._contacts[key]:
+                if similarity(sig, self._signatures[other]) >= self.contact_threshold:
+                    return other
+        bands = [(band, sig[band::BANDS].tobytes()) for band in range(BANDS)]
+        for bucket in bands:
+            for other in self._buckets[bucket]:
+                if similarity(sig, self._signatures[other]) >= self.threshold:
+                    return other
+
+        self._exact[digest] = index
+        self._signatures[index] = sig
+        for key in contacts:
+            self._contacts[key].append(index)
+        for bucket in bands:
+            self._buckets[bucket].append(index)
+        return None
+
+
+def find_duplicates(texts, threshold=None, contact_threshold=None):
+    """``{duplicate index: representative index}`` for a list of texts."""
+    finder = DuplicateFinder(threshold, contact_threshold)
+    found = {}
+    for index, text in enumerate(texts):
+        rep = finder.add(index, text)
+        if rep is not None:
+            found[index] = rep
+    return found
@@ -0,0 +1,193 @@
+"""Persistent, content-addressed cache for sentence embeddings.
+
+Vectors live in a memory-mapped float32 matrix (one row per slot) next to a
+small SQLite index mapping ``sha256(model name + normalized text)`` to a slot
+and a last-used tick.  When the cache is full the least recently used slot is
+reused, so the file never grows past ``max_entries`` rows.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+CACHE_DIR = os.environ.get(
+    "THINKHIRE_EMBED_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "embeddings"),
+)
+MAX_ENTRIES = int(os.environ.get("THINKHIRE_EMBED_CACHE_SIZE", "50000"))
+
+
+def normalize_text(text):
+    """Collapse whitespace; the tokenizer ignores it, so the embedding does too."""
+    return " ".join((text or "").split())
+
+
+def cache_key(text, model_name):
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name, directory=None, max_entries=None):
+        self.model_name = model_name
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(directory or CACHE_DIR, safe_name)
+        self.max_entries = max_entries or MAX_ENTRIES
+        self._thread_lock = threading.Lock()
+        self._db = None
+        self._vectors = None
+        self._dim = None
+
+    # ---------- storage ----------
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(self.directory, exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"),
+                                 timeout=30, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+            db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                       "key TEXT PRIMARY KEY, slot INTEGER UNIQUE NOT NULL, last_used INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _meta(self, name):
+        row = self._db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _open_vectors(self, dim=None):
+        """Map the vector file, creating it when ``dim`` is first known."""
+        if self._vectors is not None:
+            return self._vectors
+        stored_dim = self._meta("dim")
+        capacity = self._meta("capacity")
+        if stored_dim is None:
+            if dim is None:
+                return None
+            stored_dim, capacity = int(dim), self.max_entries
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (stored_dim,))
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('capacity', ?)", (capacity,))
+        path = os.path.join(self.directory, "vectors.f32")
+        mode = "r+" if os.path.exists(path) else "w+"
+        self._vectors = np.memmap(path, dtype=np.float32, mode=mode, shape=(capacity, stored_dim))
+        self._dim = stored_dim
+        return self._vectors
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """Serialize writers across threads and gunicorn workers."""
+        with self._thread_lock:
+            db = self._connect()
+            if fcntl is None:
+                yield db
+                return
+            with open(os.path.join(self.directory, "lock"), "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield db
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _tick(self):
+        tick = (self._meta("tick") or 0) + 1
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('tick', ?)", (tick,))
+        return tick
+
+    # ---------- public API ----------
+    def get_many(self, keys):
+        """Return ``{key: vector}`` for every key already in the cache."""
+        if not keys:
+            return {}
+        found = {}
+        with self._locked(exclusive=False) as db:
+            vectors = self._open_vectors()
+            if vectors is None:
+                return {}
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = db.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, slot in rows:
+                    found[key] = np.array(vectors[slot])
+        if found:
+            # Touching the LRU ticks needs the write lock; do it in one short transaction.
+            with self._locked(exclusive=True) as db:
+                tick = self._tick()
+                db.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                               [(tick, key) for key in found])
+                db.commit()
+        return found
+
+    def put_many(self, keys, vectors):
+        """Store vectors, evicting the least recently used slots when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        with self._locked(exclusive=True) as db:
+            store = self._open_vectors(dim=vectors.shape[1])
+            if store.shape[1] != vectors.shape[1]:
+                return
+            tick = self._tick()
+            capacity = store.shape[0]
+            for key, vector in zip(keys, vectors):
+                row = db.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+                if row:
+                    slot = row[0]
+                else:
+                    used = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                    if used < capacity:
+                        slot = used
+                    else:
+                        old_key, slot = db.execute(
+                            "SELECT key, slot FROM entries ORDER BY last_used LIMIT 1").fetchone()
+                        db.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                store[slot] = vector
+                db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (key, slot, tick))
+            store.flush()
+            db.commit()
+
+    def encode(self, texts, encode_fn):
+        """Embed ``texts`` with ``encode_fn``, only calling it for never-seen texts."""
+        texts = [normalize_text(t) for t in texts]
+        keys = [cache_key(t, self.model_name) for t in texts]
+        try:
+            found = self.get_many(keys)
+        except Exception:
+            found = {}
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        metrics.inc("thinkhire_cache_total", len(keys) - len(missing), cache="embedding", result="hit")
+        metrics.inc("thinkhire_cache_total", len(missing), cache="embedding", result="miss")
+        if missing:
+            encoded = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            new = dict(zip(missing.keys(), encoded))
+            try:
+                self.put_many(list(new.keys()), encoded)
+            except Exception:
+                # A broken cache directory must never break matching.
+                pass
+            found.update(new)
+
+        if not keys:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
@@ -0,0 +1,121 @@
+"""Cache of extracted resume text and parsed fields, keyed by content hash.
+
+Recruiters resubmit the same files constantly, so a file whose bytes were
+seen before skips PDF/DOCX extraction, and a text that was parsed before
+skips ``parse_resume``.  Every row records the extractor or parser version
+that produced it; bumping a version turns old rows into misses.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_DB = os.environ.get(
+    "THINKHIRE_EXTRACT_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "extraction.sqlite3"),
+)
+# Rows kept per table; the least recently used are pruned beyond this
+MAX_ROWS = int(os.environ.get("THINKHIRE_EXTRACT_CACHE_ROWS", "100000"))
+# Check the row count every this many writes, not on every write
+PRUNE_EVERY = 500
+# A hit only refreshes its row's LRU time when that is older than this, so
+# reads rarely need the write lock
+TOUCH_AFTER = 3600
+
+_local = threading.local()
+# Writes per table since its last prune, shared by all threads
+_writes = {"texts": 0, "parsed": 0}
+_writes_lock = threading.Lock()
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _db():
+    db = getattr(_local, "db", None)
+    if db is None:
+        os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+        db = sqlite3.connect(CACHE_DB, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        for table in ("texts", "parsed"):
+            db.execute(f"""CREATE TABLE IF NOT EXISTS {table} (
+                hash TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL,
+                used_at REAL NOT NULL)""")
+            db.execute(f"CREATE INDEX IF NOT EXISTS {table}_used_at ON {table} (used_at)")
+        db.commit()
+        _local.db = db
+    return db
+
+
+def _get_many(table, hashes, version):
+    hashes = list(dict.fromkeys(hashes))
+    if not hashes:
+        return {}
+    db = _db()
+    found, stale = {}, []
+    now = time.time()
+    for start in range(0, len(hashes), 500):
+        chunk = hashes[start:start + 500]
+        rows = db.execute(
+            f"SELECT hash, value, used_at FROM {table} WHERE version = ? AND hash IN ({','.join('?' * len(chunk))})",
+            [version, *chunk],
+        ).fetchall()
+        for h, value, used_at in rows:
+            found[h] = value
+            if used_at < now - TOUCH_AFTER:
+                stale.append(h)
+    if stale:
+        db.executemany(f"UPDATE {table} SET used_at = ? WHERE hash = ?", [(now, h) for h in stale])
+        db.commit()
+    return found
+
+
+def _put_many(table, items, version):
+    if not items:
+        return
+    db = _db()
+    now = time.time()
+    db.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)",
+                   [(h, version, value, now) for h, value in items])
+    db.commit()
+    with _writes_lock:
+        _writes[table] += len(items)
+        prune = _writes[table] >= PRUNE_EVERY
+        if prune:
+            _writes[table] = 0
+    if prune:
+        db.execute(f"DELETE FROM {table} WHERE hash IN (SELECT hash FROM {table} "
+                   f"ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (MAX_ROWS,))
+        db.commit()
+
+
+# ---------- Public API ----------
+def get_texts(hashes, version):
+    """``{file key: extracted text}`` for files extracted before by this extractor version.
+
+    Keys come from ``text_extraction``: the bytes' hash plus the extension,
+    since the extension picks the extractor.
+    """
+    return _get_many("texts", hashes, version)
+
+
+def put_texts(items, version):
+    """Store ``(file key, text)`` pairs."""
+    _put_many("texts", items, version)
+
+
+def get_parsed(hashes, version):
+    """``{text hash: parse_resume dict}`` for texts parsed before by this parser version."""
+    return {h: json.loads(v) for h, v in _get_many("parsed", hashes, version).items()}
+
+
+def put_parsed(items, version):
+    """Store ``(text hash, parse_resume dict)`` pairs."""
+    _put_many("parsed", [(h, json.dumps(info)) for h, info in items], version)
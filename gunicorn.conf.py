@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+# Usage: gunicorn -c gunicorn.conf.py app:app
+import os
+
+# Load the NLP models once in the master and share them copy-on-write with
+# forked workers. Off by default: models then load lazily per worker.
+preload_app = os.environ.get("THINKHIRE_PRELOAD_MODELS", "0") == "1"
+
+
+def on_starting(server):
+    if preload_app:
+        # Weights only: running inference here would start thread pools that
+        # do not survive fork().
+        from screening import warm_up_models
+        warm_up_models(run_inference=False)
+
+
+def post_fork(server, worker):
+    # THINKHIRE_WARMUP=1 finishes warm-up (first inference) in each worker
+    if os.environ.get("THINKHIRE_WARMUP") == "1":
+        from app import start_warmup
+        start_warmup()
@@ -0,0 +1,217 @@
+"""Background screening jobs.
+
+Job state lives in a small SQLite database so any gunicorn worker can report
+progress, while the work itself runs on a thread pool inside the worker that
+accepted the upload.  The heavy lifting (extraction) already happens in child
+processes, so a few threads per worker are enough.  A finished job's ranked
+candidates are saved to ``result_store`` with the job id as the run id; a
+job with several roles saves its best-role view under the job id and one
+run per role, all grouped under the job id.
+
+A worker that dies takes its queued and running jobs with it, so the worker
+touches ``updated_at`` of its jobs every ``JOB_HEARTBEAT`` seconds; a job
+whose heartbeat is older than ``JOB_STALE_SECONDS`` is reported as failed.
+Jobs are deleted ``JOB_TTL`` seconds after they were submitted.
+"""
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from result_store import save_run
+from screening import screen_roles, best_roles
+
+BEST_ROLE_TITLE = "Best role per candidate"
+
+JOBS_DB = os.environ.get(
+    "THINKHIRE_JOBS_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "jobs.sqlite3"),
+)
+JOB_WORKERS = int(os.environ.get("THINKHIRE_JOB_WORKERS", "2"))
+JOB_HEARTBEAT = 15
+JOB_STALE_SECONDS = int(os.environ.get("THINKHIRE_JOB_STALE_SECONDS", "120"))
+JOB_TTL = int(os.environ.get("THINKHIRE_JOB_TTL_HOURS", "72")) * 3600
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+# Jobs queued or running in this process, kept alive by the heartbeat thread
+_active = set()
+_active_lock = threading.Lock()
+
+
+def _db():
+    """One connection per thread; SQLite handles cross-process locking."""
+    db = getattr(_local, "db", None)
+    if db is None:
+        os.makedirs(os.path.dirname(JOBS_DB), exist_ok=True)
+        db = sqlite3.connect(JOBS_DB, timeout=30)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY, owner TEXT, status TEXT NOT NULL, stage TEXT,
+            total INTEGER NOT NULL, done INTEGER NOT NULL DEFAULT 0,
+            jd_text TEXT, error TEXT,
+            created_at REAL NOT NULL, updated_at REAL NOT NULL)""")
+        db.execute("""CREATE TABLE IF NOT EXISTS job_files (
+            job_id TEXT NOT NULL, idx INTEGER NOT NULL, filename TEXT NOT NULL,
+            status TEXT NOT NULL, PRIMARY KEY (job_id, idx))""")
+        db.execute("CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)")
+        db.commit()
+        _local.db = db
+    return db
+
+
+def _heartbeat():
+    while True:
+        time.sleep(JOB_HEARTBEAT)
+        with _active_lock:
+            job_ids = list(_active)
+        if not job_ids:
+            continue
+        try:
+            db = _db()
+            db.executemany("UPDATE jobs SET updated_at = ? WHERE id = ?", [(time.time(), j) for j in job_ids])
+            db.commit()
+        except sqlite3.Error:
+            pass  # a busy database just delays this beat
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="screening")
+            threading.Thread(target=_heartbeat, name="job-heartbeat", daemon=True).start()
+        return _executor
+
+
+def _update(job_id, **fields):
+    fields["updated_at"] = time.time()
+    cols = ", ".join(f"{name} = ?" for name in fields)
+    db = _db()
+    db.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+    db.commit()
+
+
+def _save_roles(job_id, owner, roles, rankings, features):
+    titles = [title for title, _ in roles]
+    save_run(owner, "Roles: " + ", ".join(titles), best_roles(rankings, titles), kind="best-role",
+             run_id=job_id, group_id=job_id, title=BEST_ROLE_TITLE)
+    for number, ((title, text), ranked, role_features) in enumerate(zip(roles, rankings, features), start=1):
+        save_run(owner, text, ranked, run_id=f"{job_id}-{number}", group_id=job_id, title=title,
+                 features=role_features)
+
+
+def _run(job_id, owner, jd_text, resume_files, roles=None, spool_dir=None):
+    db = _db()
+
+    def file_done(idx):
+        db.execute("UPDATE job_files SET status = 'done' WHERE job_id = ? AND idx = ?", (job_id, idx))
+        db.execute("UPDATE jobs SET done = done + 1, updated_at = ? WHERE id = ?", (time.time(), job_id))
+        db.commit()
+
+    def stage(name):
+        _update(job_id, stage=name)
+
+    with metrics.breakdown(f"job {job_id} ({len(resume_files)} files)") as current:
+        try:
+            _update(job_id, status="running")
+            if roles:
+                rankings, _, features = screen_roles([text for _, text in roles], resume_files,
+                                                     on_file_done=file_done, on_stage=stage, owner=owner)
+                _save_roles(job_id, owner, roles, rankings, features)
+            else:
+                rankings, _, features = screen_roles([jd_text], resume_files, on_file_done=file_done,
+                                                     on_stage=stage, owner=owner)
+                save_run(owner, jd_text, rankings[0], run_id=job_id, features=features[0])
+            _update(job_id, status="done", stage="done")
+            status = "done"
+        except Exception as exc:
+            _update(job_id, status="failed", error=str(exc) or exc.__class__.__name__)
+            status = "failed"
+        finally:
+            with _active_lock:
+                _active.discard(job_id)
+            if spool_dir:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+        metrics.observe("thinkhire_job_seconds", current.elapsed, status=status)
+        metrics.log_if_slow(current)
+
+
+def submit_job(owner, jd_text, resume_files, roles=None, spool_dir=None):
+    """Queue a screening job and return its id immediately.
+
+    ``roles`` is a list of ``(title, jd text)`` pairs to rank the resumes
+    against instead of the single ``jd_text``.  ``spool_dir``, holding
+    the resume files, is removed once the job finishes.
+    """
+    job_id = uuid.uuid4().hex
+    if roles:
+        jd_text = "\n\n".join(f"{title}:\n{text}" for title, text in roles)
+    now = time.time()
+    purge_expired(now)
+    db = _db()
+    db.execute(
+        "INSERT INTO jobs (id, owner, status, stage, total, jd_text, created_at, updated_at) "
+        "VALUES (?, ?, 'queued', 'queued', ?, ?, ?, ?)",
+        (job_id, owner, len(resume_files), jd_text, now, now),
+    )
+    db.executemany(
+        "INSERT INTO job_files (job_id, idx, filename, status) VALUES (?, ?, ?, 'queued')",
+        [(job_id, idx, name) for idx, (name, _) in enumerate(resume_files)],
+    )
+    db.commit()
+    with _active_lock:
+        _active.add(job_id)
+    _get_executor().submit(_run, job_id, owner, jd_text, list(resume_files), roles, spool_dir)
+    return job_id
+
+
+def fail_stale_jobs(now=None, job_id=None):
+    """Mark queued or running jobs whose heartbeat stopped as failed; returns how many."""
+    now = now or time.time()
+    query = ("UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+             "WHERE status IN ('queued', 'running') AND updated_at < ?")
+    params = ["interrupted: the server stopped before the job finished", now, now - JOB_STALE_SECONDS]
+    if job_id is not None:
+        query += " AND id = ?"
+        params.append(job_id)
+    db = _db()
+    failed = db.execute(query, params).rowcount
+    db.commit()
+    return failed
+
+
+def purge_expired(now=None):
+    """Delete jobs submitted more than ``JOB_TTL`` ago; returns how many were removed."""
+    now = now or time.time()
+    fail_stale_jobs(now)
+    db = _db()
+    cutoff = now - JOB_TTL
+    db.execute("DELETE FROM job_files WHERE job_id IN (SELECT id FROM jobs WHERE created_at <= ?)", (cutoff,))
+    removed = db.execute("DELETE FROM jobs WHERE created_at <= ?", (cutoff,)).rowcount
+    db.commit()
+    return removed
+
+
+def get_job(job_id):
+    """Return the job's status fields (without the result payload), or None."""
+    query = "SELECT id, owner, status, stage, total, done, error, created_at, updated_at FROM jobs WHERE id = ?"
+    row = _db().execute(query, (job_id,)).fetchone()
+    if row and row["status"] in ("queued", "running") and row["updated_at"] < time.time() - JOB_STALE_SECONDS:
+        fail_stale_jobs(job_id=job_id)
+        row = _db().execute(query, (job_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def get_job_files(job_id):
+    rows = _db().execute(
+        "SELECT idx, filename, status FROM job_files WHERE job_id = ? ORDER BY idx", (job_id,)
+    ).fetchall()
+    return [dict(r) for r in rows]
+
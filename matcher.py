@@ -1,9 +1,233 @@
+import os
 import re
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
+from embedding_cache import EmbeddingCache
+import skill_matcher
+
+# Semantic model, loaded on first use (importing torch alone takes seconds)
+MODEL_NAME = 'all-MiniLM-L6-v2'
+_model = None
+_model_lock = threading.Lock()
+
+# Inference backend: "torch" (fp32), "torch-int8" (dynamically quantized Linear
+# layers), "onnx" or "onnx-int8" (ONNX Runtime, needs optimum[onnxruntime])
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+ENCODER_BACKEND = os.environ.get("THINKHIRE_ENCODER_BACKEND", "torch")
+# Quantized ONNX export shipped in the model repository
+ONNX_INT8_FILE = os.environ.get("THINKHIRE_ONNX_INT8_FILE", "onnx/model_qint8_avx2.onnx")
+# Intra-op threads per worker (0 = library default) and texts per forward pass
+ENCODE_THREADS = int(os.environ.get("THINKHIRE_ENCODE_THREADS", "0"))
+ENCODE_BATCH_SIZE = int(os.environ.get("THINKHIRE_ENCODE_BATCH_SIZE", "32"))
+
+
+def cache_model_name(backend=None):
+    """Embedding cache namespace: quantized backends give slightly different vectors."""
+    backend = backend or ENCODER_BACKEND
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}@{backend}"
+
+
+# Embeddings are cached on disk by content hash, so only unseen texts hit the model
+embedding_cache = EmbeddingCache(cache_model_name())
+
+
+def load_model(backend=None, threads=None):
+    """A fresh ``SentenceTransformer`` running on ``backend``; ``encode`` is the same for all."""
+    backend = backend or ENCODER_BACKEND
+    threads = ENCODE_THREADS if threads is None else threads
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"unknown encoder backend '{backend}' (expected one of {', '.join(ENCODER_BACKENDS)})")
+    from sentence_transformers import SentenceTransformer
+
+    if backend.startswith("onnx"):
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        if backend == "onnx-int8":
+            model_kwargs["file_name"] = ONNX_INT8_FILE
+        if threads:
+            import onnxruntime
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = threads
+            model_kwargs["session_options"] = options
+        try:
+            return SentenceTransformer(MODEL_NAME, backend="onnx", model_kwargs=model_kwargs)
+        except ImportError as exc:
+            raise RuntimeError(f"encoder backend '{backend}' needs optimum[onnxruntime]: {exc}") from exc
+
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    if backend == "torch":
+        return SentenceTransformer(MODEL_NAME)
+    import torch
+    # Dynamic quantization runs on CPU only
+    model = SentenceTransformer(MODEL_NAME, device="cpu")
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+
+def model_loaded():
+    return _model is not None
+
+
+def __getattr__(name):
+    # Keeps ``matcher.model`` working for existing callers without loading at import
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warmup():
+    """Load the model and run one tiny encode so the first request is fast."""
+    get_model().encode(["warm up"], convert_to_numpy=True)
+
+
+def encode_texts(texts):
+    """Encode a list of texts, reusing cached embeddings where possible."""
+    return embedding_cache.encode(
+        texts, lambda batch: get_model().encode(batch, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True))
+
+
+def _normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+
+
+# ---------- Chunked embeddings ----------
+# The model truncates at 256 tokens, so whole multi-page resumes would be scored
+# on their first page only.  THINKHIRE_EMBED_MODE=chunked opts in to splitting
+# texts into section-aware windows; the default "whole" encodes each text in one
+# piece, as before.
+EMBED_MODE = os.environ.get("THINKHIRE_EMBED_MODE", "whole")
+# Words per window (about 1.3 tokens each) and words shared by consecutive windows of one section
+CHUNK_WORDS = int(os.environ.get("THINKHIRE_CHUNK_WORDS", "160"))
+CHUNK_OVERLAP = int(os.environ.get("THINKHIRE_CHUNK_OVERLAP", "32"))
+# How a resume's chunk similarities become one score: "max", "mean" or "top-n"
+CHUNK_POOLING = os.environ.get("THINKHIRE_CHUNK_POOLING", "top-n")
+CHUNK_TOP_N = int(os.environ.get("THINKHIRE_CHUNK_TOP_N", "3"))
+
+_CAPS_HEADING = re.compile(r"^[A-Z][A-Z &/]{2,40}:?$")
+_NAMED_HEADING = re.compile(
+    r"^(?:professional |career |work |technical |key )?(?:summary|objective|profile|skills|experience|"
+    r"employment(?: history)?|projects|education|certifications?|achievements|awards|publications|"
+    r"languages|interests|responsibilities|requirements|qualifications)\s*:?$",
+    re.IGNORECASE,
+)
+
+
+def _is_heading(line):
+    line = line.strip()
+    return bool(line) and (bool(_CAPS_HEADING.match(line)) or bool(_NAMED_HEADING.match(line)))
+
+
+def chunk_text(text, max_words=None, overlap=None):
+    """Split a document into windows of at most ``max_words`` words.
+
+    Heading lines (SKILLS, Experience:, ...) start a new section; short
+    sections are packed together and long ones are split with ``overlap``
+    words of context.  A text that fits in one window comes back whole.
+    """
+    max_words = max_words or CHUNK_WORDS
+    overlap = CHUNK_OVERLAP if overlap is None else overlap
+    sections = [[]]
+    for line in (text or "").splitlines():
+        if _is_heading(line) and sections[-1]:
+            sections.append([])
+        sections[-1].extend(line.split())
+
+    chunks, packed = [], []
+    for words in sections:
+        if len(packed) + len(words) <= max_words:
+            packed += words
+            continue
+        if packed:
+            chunks.append(packed)
+        if len(words) <= max_words:
+            packed = words
+            continue
+        packed = []
+        step = max(max_words - overlap, 1)
+        for start in range(0, len(words), step):
+            chunks.append(words[start:start + max_words])
+            if start + max_words >= len(words):
+                break
+    if packed or not chunks:
+        chunks.append(packed)
+    return [" ".join(words) for words in chunks]
+
+
+def chunk_embeddings(texts):
+    """``(unit chunk vectors, offsets, counts)`` for ``texts``.
+
+    Every chunk of every text goes through one cached ``encode_texts`` call;
+    text ``i`` owns rows ``offsets[i]:offsets[i] + counts[i]``.  In "whole"
+    mode each text is a single chunk.
+    """
+    if EMBED_MODE == "chunked":
+        chunked = [chunk_text(t) for t in texts]
+    else:
+        chunked = [[t] for t in texts]
+    counts = np.array([len(c) for c in chunked], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    vectors = _normalize(encode_texts([chunk for chunks in chunked for chunk in chunks]))
+    return vectors, offsets, counts
+
+
+def pool_similarities(similarity, offsets, counts, pooling=None, top_n=None):
+    """Reduce a (queries x chunks) similarity matrix to (queries x documents)."""
+    pooling = pooling or CHUNK_POOLING
+    similarity = np.atleast_2d(similarity)
+    if pooling == "max":
+        return np.maximum.reduceat(similarity, offsets, axis=1)
+    if pooling == "mean":
+        return np.add.reduceat(similarity, offsets, axis=1) / counts
+    if pooling == "top-n":
+        top_n = top_n or CHUNK_TOP_N
+        owner = np.repeat(np.arange(len(counts)), counts)
+        # Sort each document's chunks best first, then keep the first top_n of each
+        order = np.lexsort((-similarity, np.broadcast_to(owner, similarity.shape)), axis=-1)
+        ranked = np.take_along_axis(similarity, order, axis=1)
+        keep = (np.arange(len(owner)) - offsets[owner]) < top_n
+        return np.add.reduceat(np.where(keep, ranked, 0), offsets, axis=1) / np.minimum(counts, top_n)
+    raise ValueError(f"unknown chunk pooling '{pooling}'")
+
+
+def embed_documents(texts):
+    """Unit-normalized document embeddings, as stored in the candidate index.
+
+    In chunked mode a document's vector is the mean of its chunk vectors.
+    """
+    texts = list(texts)
+    if not texts:
+        return _normalize(encode_texts(texts))
+    vectors, offsets, _ = chunk_embeddings(texts)
+    return _normalize(np.add.reduceat(vectors, offsets, axis=0))
+
+
+def embedding_space(backend=None):
+    """Label of the space ``embed_documents`` vectors live in; vectors from different spaces don't compare.
+
+    Covers the model and encoder backend as well as the embed mode.
+    """
+    mode = f"chunked/{CHUNK_WORDS}/{CHUNK_OVERLAP}" if EMBED_MODE == "chunked" else EMBED_MODE
+    return f"{cache_model_name(backend)}:{mode}"
+
+
+def document_similarity(query_vectors, texts):
+    """Cosine similarity of unit query vectors to each text, pooled over its chunks."""
+    query_vectors = np.atleast_2d(query_vectors)
+    texts = list(texts)
+    if not texts:
+        return np.zeros((len(query_vectors), 0), dtype=np.float32)
+    vectors, offsets, counts = chunk_embeddings(texts)
+    return pool_similarities(query_vectors @ vectors.T, offsets, counts)
 
-# Load semantic model
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 # Define helper functions
 def extract_years_of_experience(text):
@@ -11,77 +235,142 @@ def extract_years_of_experience(text):
     return int(match.group(1)) if match else 0
 
 def extract_skills(text):
-    common_skills = [
-        "python", "java", "c++", "c", "javascript", "html", "css", "react",
-        "node.js", "express", "mongodb", "sql", "postgresql", "aws", "azure",
-        "gcp", "docker", "flask", "machine learning", "data analysis",
-        "git", "tensorflow", "tableau", "communication", "leadership"
-    ]
-    text_lower = text.lower()
-    return [skill for skill in common_skills if skill in text_lower]
-
-def match_job_to_candidates(job_description, resumes, top_k=5):
-    # Encode job description and resumes for semantic similarity
-    job_embedding = model.encode(job_description, convert_to_tensor=True)
-    resume_embeddings = model.encode(resumes, convert_to_tensor=True)
-
-    # Compute semantic similarity scores
-    similarity_scores = util.pytorch_cos_sim(job_embedding, resume_embeddings)[0].cpu().numpy()
-
-    # Extract job keywords and experience
-    job_skills = extract_skills(job_description)
-    job_experience = extract_years_of_experience(job_description)
-
-    results = []
-    for i, resume_text in enumerate(resumes):
-        # Extract resume skills and experience
-        resume_skills = extract_skills(resume_text)
-        resume_experience = extract_years_of_experience(resume_text)
-
-        # Skill matching score
-        skill_overlap = len(set(resume_skills) & set(job_skills))
-        total_skills = len(set(job_skills)) or 1
-        skill_score = skill_overlap / total_skills
-
-        # Experience matching score
-        exp_score = min(resume_experience / job_experience, 1.0) if job_experience > 0 else 0.5
-
-        # Combine scores
-        final_score = (0.7 * similarity_scores[i]) + (0.2 * skill_score) + (0.1 * exp_score)
-        results.append((i, final_score))
-
-    # Sort by final score
-    results.sort(key=lambda x: x[1], reverse=True)
-    return results[:top_k]
-
-
-def suggest_improvements(job_text, resume_text, resume_skills=None):
+    return skill_matcher.extract_skills(text)
+
+def skill_matrix(skill_lists):
+    """Boolean (documents x taxonomy skills) matrix from per-document skill lists."""
+    columns = skill_matcher.SKILL_COLUMNS
+    matrix = np.zeros((len(skill_lists), len(columns)), dtype=bool)
+    for row, skills in enumerate(skill_lists):
+        cols = [columns[s] for s in skills if s in columns]
+        matrix[row, cols] = True
+    return matrix
+
+
+# Weights of semantic similarity, skill overlap and experience in the final score
+SCORE_WEIGHTS = (0.7, 0.2, 0.1)
+
+
+def score_components(similarity, job_skill_matrix, job_experience, resume_skill_matrix, resume_experience):
+    """``(similarity, skill score, experience score)``, each a jobs x resumes array."""
+    similarity = np.atleast_2d(np.asarray(similarity, dtype=np.float32))
+    job_experience = np.asarray(job_experience, dtype=np.float32)
+    resume_experience = np.asarray(resume_experience, dtype=np.float32)
+
+    # Skill matching score: overlap / number of JD skills
+    overlap = job_skill_matrix.astype(np.float32) @ resume_skill_matrix.T.astype(np.float32)
+    totals = np.maximum(job_skill_matrix.sum(axis=1), 1).astype(np.float32)
+    skill_score = overlap / totals[:, None]
+
+    # Experience matching score: capped ratio, 0.5 when the JD states none
+    has_exp = job_experience > 0
+    ratio = resume_experience[None, :] / np.where(has_exp, job_experience, 1.0)[:, None]
+    exp_score = np.where(has_exp[:, None], np.minimum(ratio, 1.0), 0.5)
+    return similarity, skill_score, exp_score
+
+
+def blend(similarity, skill_score, exp_score, weights=None):
+    """Weighted sum of the score components (default 0.7/0.2/0.1)."""
+    w_sim, w_skill, w_exp = SCORE_WEIGHTS if weights is None else weights
+    return w_sim * similarity + w_skill * skill_score + w_exp * exp_score
+
+
+def score_matrix(similarity, job_skill_matrix, job_experience, resume_skill_matrix, resume_experience):
+    """Fused 0.7/0.2/0.1 blend for every (job, resume) pair, as a jobs x resumes array."""
+    return blend(*score_components(similarity, job_skill_matrix, job_experience,
+                                   resume_skill_matrix, resume_experience))
+
+
+def top_k_indices(scores, top_k):
+    """Indices of the ``top_k`` highest scores, best first, without a full sort."""
+    scores = np.asarray(scores)
+    k = min(top_k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def match_components(job_descriptions, resumes, job_skills=None, resume_skills=None):
+    """Score components of many job descriptions against one batch of resumes.
+
+    Every chunk of every text is embedded in a single (cached) call.  Returns
+    ``{"similarity", "skill_score", "experience_score"}`` as jobs x resumes
+    arrays, plus each resume's ``"experience"`` (years) and its boolean
+    ``"skills"`` row over the skill taxonomy.
+    """
+    job_descriptions = list(job_descriptions)
+    resumes = list(resumes)
+    if job_skills is None:
+        job_skills = [extract_skills(j) for j in job_descriptions]
+    if resume_skills is None:
+        resume_skills = [extract_skills(r) for r in resumes]
+    resume_skill_matrix = skill_matrix(resume_skills)
+    resume_experience = np.array([extract_years_of_experience(r) for r in resumes], dtype=np.float32)
+
+    if not job_descriptions or not resumes:
+        similarity = np.zeros((len(job_descriptions), len(resumes)), dtype=np.float32)
+    else:
+        vectors, offsets, counts = chunk_embeddings(job_descriptions + resumes)
+        jobs, split = len(job_descriptions), offsets[len(job_descriptions)]
+        job_vectors = _normalize(np.add.reduceat(vectors[:split], offsets[:jobs], axis=0))
+        similarity = pool_similarities(job_vectors @ vectors[split:].T, offsets[jobs:] - split, counts[jobs:])
+
+    similarity, skill_score, exp_score = score_components(
+        similarity, skill_matrix(job_skills), [extract_years_of_experience(j) for j in job_descriptions],
+        resume_skill_matrix, resume_experience)
+    return {"similarity": similarity, "skill_score": skill_score, "experience_score": exp_score,
+            "experience": resume_experience, "skills": resume_skill_matrix}
+
+
+def match_jobs_to_candidates(job_descriptions, resumes, job_skills=None, resume_skills=None):
+    """Score many job descriptions against one batch of resumes.
+
+    Returns a ``len(job_descriptions) x len(resumes)`` score matrix.
+    """
+    c = match_components(job_descriptions, resumes, job_skills=job_skills, resume_skills=resume_skills)
+    return blend(c["similarity"], c["skill_score"], c["experience_score"])
+
+
+def match_job_to_candidates(job_description, resumes, top_k=5, job_skills=None, resume_skills=None):
+    """Rank resumes against a job description.
+
+    ``job_skills`` and ``resume_skills`` (one list per resume) can be passed in
+    when the caller already scanned the texts, e.g. from ``parse_resume``.
+    """
+    if not len(resumes):
+        return []
+    scores = match_jobs_to_candidates([job_description], resumes,
+                                      job_skills=None if job_skills is None else [job_skills],
+                                      resume_skills=resume_skills)[0]
+    return [(int(i), scores[i]) for i in top_k_indices(scores, top_k)]
+
+
+def blend_scores(similarity_scores, job_skills, job_experience, resume_skills, resume_experience):
+    """Combine semantic similarity, skill overlap and experience for one job."""
+    return score_matrix(similarity_scores, skill_matrix([job_skills]), [job_experience],
+                        skill_matrix(resume_skills), resume_experience)[0]
+
+
+def suggest_improvements(job_text, resume_text, resume_skills=None, job_skills=None):
     """Return a list of human-friendly suggestions for resume improvement."""
     suggestions = []
     
-    # normalize text for matching
-    job_norm = re.sub(r"[\W_]+", " ", job_text.lower())
     resume_lower = resume_text.lower()
 
-    # List of all known skills
-    all_skills = [
-        "Python", "Java", "C++", "C", "SQL", "MongoDB", "PostgreSQL",
-        "JavaScript", "Node.js", "Express.js", "React", "HTML", "CSS",
-        "Flask", "Django", "Machine Learning", "Deep Learning", "Data Analysis",
-        "AWS", "Azure", "GCP", "Git", "Excel", "Power BI", "Tableau",
-        "TensorFlow", "PyTorch", "NLP", "Data Visualization", "Leadership",
-        "Communication", "Problem Solving", "Teamwork", "Docker", "Kubernetes"
-    ]
+    # Skills the JD asks for, in taxonomy order (scanned once by the caller when possible)
+    if job_skills is None:
+        job_skills = extract_skills(job_text)
+    job_skill_set = set(job_skills)
+    jd_skills = [skill for skill in skill_matcher.SKILL_NAMES if skill in job_skill_set]
 
     # Find missing skills
     if resume_skills:
         parsed_skills_lower = set(s.lower() for s in resume_skills)
-        missing_skills = []
-        
-        for skill in all_skills:
-            skill_lower = skill.lower()
-            if skill_lower in job_norm and skill_lower not in parsed_skills_lower:
-                missing_skills.append(skill)
+        missing_skills = [skill for skill in jd_skills if skill.lower() not in parsed_skills_lower]
         
         if missing_skills:
             suggestions.append(f"Missing skills: {', '.join(missing_skills[:3])}")
@@ -101,11 +390,9 @@ def suggest_improvements(job_text, resume_text, resume_skills=None):
 
     # Check for strong skills match
     if resume_skills:
-        overlap_count = sum(1 for s in resume_skills for skill in all_skills 
-                          if s.lower() == skill.lower() and skill.lower() in job_norm)
-        if overlap_count >= 3:
-            overlap_skills = [s for s in resume_skills for skill in all_skills
-                            if s.lower() == skill.lower() and skill.lower() in job_norm]
+        jd_skills_lower = set(s.lower() for s in jd_skills)
+        overlap_skills = [s for s in resume_skills if s.lower() in jd_skills_lower]
+        if len(overlap_skills) >= 3:
             suggestions.append(f"Strong skills match: {', '.join(overlap_skills[:4])}")
 
     if not suggestions:
@@ -0,0 +1,240 @@
+"""Lightweight in-process metrics: stage timers, counters and a Prometheus export.
+
+``timed(stage)`` records how long a pipeline stage took, both in a
+process-wide histogram and in the active ``Breakdown`` (one per request or
+background job), so a slow upload can be attributed to extraction, NER,
+embedding, scoring or suggestions.  ``inc`` bumps counters such as files,
+bytes and cache hits.  ``render_prometheus`` serialises everything in the
+Prometheus text format for ``/metrics``.
+
+Extraction runs in worker processes, whose metrics would otherwise be lost:
+work done inside ``capture()`` is recorded into a plain dict instead, which
+the worker returns with its result and the parent folds back in with
+``merge``.  Metrics are per process; with several gunicorn workers each
+reports its own.
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_METRIC = "thinkhire_stage_seconds"
+# Requests and jobs slower than this are logged with their breakdown (0 = off)
+SLOW_SECONDS = float(os.environ.get("THINKHIRE_SLOW_REQUEST_MS", "0")) / 1000
+
+logger = logging.getLogger("thinkhire.metrics")
+
+_lock = threading.Lock()
+_counters = defaultdict(float)  # (name, labels) -> value
+_histograms = {}                # (name, labels) -> [bucket counts..., +Inf count, sum]
+_help = {}
+
+_breakdown = contextvars.ContextVar("thinkhire_breakdown", default=None)
+_captured = contextvars.ContextVar("thinkhire_captured", default=None)
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def describe(name, text):
+    """Set the ``# HELP`` line of a metric."""
+    _help[name] = text
+
+
+# ---------- Recording ----------
+def inc(name, value=1, **labels):
+    captured = _captured.get()
+    if captured is not None:
+        captured["counters"].append((name, labels, value))
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] += value
+
+
+def observe(name, seconds, **labels):
+    captured = _captured.get()
+    if captured is not None:
+        captured["observations"].append((name, labels, seconds))
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(BUCKETS)] += 1
+        hist[-1] += seconds
+
+
+@contextmanager
+def timed(stage, file=None):
+    """Time a pipeline stage; ``file`` attributes it to one resume in the breakdown."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(STAGE_METRIC, elapsed, stage=stage)
+        captured = _captured.get()
+        if captured is not None:
+            captured["stages"].append((stage, elapsed))
+        else:
+            breakdown = _breakdown.get()
+            if breakdown is not None:
+                breakdown.add(stage, elapsed, file)
+
+
+@contextmanager
+def capture():
+    """Record metrics into a picklable dict (yielded) instead of this process's registry."""
+    captured = {"counters": [], "observations": [], "stages": []}
+    token = _captured.set(captured)
+    try:
+        yield captured
+    finally:
+        _captured.reset(token)
+
+
+def merge(captured, file=None):
+    """Fold metrics recorded under ``capture()`` (possibly in another process) into this one."""
+    if not captured:
+        return
+    for name, labels, value in captured["counters"]:
+        inc(name, value, **labels)
+    for name, labels, seconds in captured["observations"]:
+        observe(name, seconds, **labels)
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        for stage, seconds in captured["stages"]:
+            breakdown.add(stage, seconds, file)
+
+
+# ---------- Per-request / per-job breakdown ----------
+class Breakdown:
+    """Seconds per stage for one request or job, overall and per file."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.stages = defaultdict(float)
+        self.files = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, file=None):
+        with self._lock:
+            self.stages[stage] += seconds
+            if file is not None:
+                self.files[file][stage] += seconds
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self, max_files=10):
+        """Multi-line text: total, each stage, then the slowest files."""
+        lines = [f"{self.label} took {self.elapsed:.3f}s"]
+        for stage, seconds in sorted(self.stages.items(), key=lambda x: -x[1]):
+            lines.append(f"  {stage:<12} {seconds:8.3f}s")
+        slowest = sorted(self.files.items(), key=lambda x: -sum(x[1].values()))[:max_files]
+        for file, stages in slowest:
+            detail = ", ".join(f"{s}={v:.3f}s" for s, v in sorted(stages.items(), key=lambda x: -x[1]))
+            lines.append(f"  file {file}: {detail}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def breakdown(label):
+    """Make a fresh ``Breakdown`` current for the enclosed work."""
+    current = Breakdown(label)
+    token = _breakdown.set(current)
+    try:
+        yield current
+    finally:
+        _breakdown.reset(token)
+
+
+def start_breakdown(label):
+    """Begin a breakdown without a ``with`` block (e.g. Flask before/after hooks)."""
+    current = Breakdown(label)
+    return current, _breakdown.set(current)
+
+
+def end_breakdown(token):
+    _breakdown.reset(token)
+
+
+def log_if_slow(current):
+    if SLOW_SECONDS and current.elapsed >= SLOW_SECONDS:
+        logger.warning("Slow %s", current.summary())
+
+
+# ---------- Export ----------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    lines = []
+    for name in sorted({n for n, _ in counters}):
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} counter")
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{name}{_format_labels(labels)} {int(value) if value.is_integer() else value}")
+    for name in sorted({n for n, _ in histograms}):
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} histogram")
+        for (n, labels), hist in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {cumulative}")
+            cumulative += hist[len(BUCKETS)]
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {hist[-1]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear every metric (for tests)."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+describe(STAGE_METRIC, "Time spent in each screening stage.")
+describe("thinkhire_request_seconds", "HTTP request latency by endpoint.")
+describe("thinkhire_job_seconds", "Background screening job duration.")
+describe("thinkhire_files_total", "Resume files extracted, by format.")
+describe("thinkhire_bytes_total", "Bytes of resume files extracted.")
+describe("thinkhire_pdf_pages_total", "PDF pages extracted, by backend.")
+describe("thinkhire_duplicates_total", "Uploaded resumes collapsed into an earlier copy.")
+describe("thinkhire_cache_total", "Cache lookups by cache and result (hit/miss).")
@@ -0,0 +1,77 @@
+"""Re-rank a stored run with new weights and filters, without touching the model.
+
+Screening keeps each candidate's score components with its run
+(``result_store.save_run(features=...)``): semantic similarity, skill
+overlap, experience score, years of experience and a packed skill matrix,
+all in the run's rank order.  ``rerank`` recombines them with NumPy only, so
+changing the 0.7/0.2/0.1 weights or adding a filter takes milliseconds
+instead of a new upload.
+"""
+import numpy as np
+
+from matcher import SCORE_WEIGHTS, blend
+from skill_matcher import SKILL_ALIASES, SKILL_NAMES, normalize
+
+# Normalized alias -> canonical skill, so "js" or "Node JS" filter like their skill
+_ALIASES = {normalize(alias).strip(): name for alias, name in SKILL_ALIASES.items()}
+
+
+def role_features(components, role, order):
+    """Arrays to store with one role's run; ``order`` is the run's rank order of resumes."""
+    skills = components["skills"][order]
+    return {
+        "similarity": components["similarity"][role, order],
+        "skill_score": components["skill_score"][role, order],
+        "experience_score": components["experience_score"][role, order],
+        "experience": components["experience"][order],
+        # One bit per taxonomy skill; the names travel with the run in case the taxonomy changes
+        "skills": np.packbits(skills, axis=1),
+        "skill_names": np.array(SKILL_NAMES, dtype=str),
+    }
+
+
+def _skill_column(columns, name):
+    """Column of ``name`` (a skill or one of its aliases) in a run's skill matrix, or None."""
+    column = columns.get(name.lower())
+    if column is None:
+        canonical = _ALIASES.get(normalize(name).strip())
+        column = columns.get(canonical.lower()) if canonical else None
+    return column
+
+
+def unknown_skills(features, names):
+    """Requested skills that are neither in the run's skill taxonomy nor an alias of one."""
+    columns = {name.lower(): i for i, name in enumerate(features["skill_names"])}
+    return [name for name in names if _skill_column(columns, name) is None]
+
+
+def rerank(features, weights=None, min_experience=0, must_have=()):
+    """``(positions, scores)``: stored rank positions (0-based) in their new order, and their new scores.
+
+    Weights are normalised to sum to 1.  Candidates with fewer than
+    ``min_experience`` years or missing any ``must_have`` skill are dropped.
+    Skills are matched by name or taxonomy alias; raises ValueError for an
+    unknown skill, as well as for negative or non-finite weights and experience.
+    """
+    weights = np.asarray(SCORE_WEIGHTS if weights is None else weights, dtype=np.float32)
+    if (not np.isfinite(weights).all() or (weights < 0).any()
+            or not np.isfinite(min_experience) or min_experience < 0):
+        raise ValueError("weights and minimum experience must be finite, non-negative numbers")
+    if weights.sum() > 0 and not np.isclose(weights.sum(), 1):
+        weights = weights / weights.sum()
+    scores = blend(features["similarity"], features["skill_score"], features["experience_score"], weights)
+
+    keep = features["experience"] >= min_experience
+    if must_have:
+        columns = {name.lower(): i for i, name in enumerate(features["skill_names"])}
+        unknown = unknown_skills(features, must_have)
+        if unknown:
+            raise ValueError(f"unknown skills: {', '.join(unknown)}")
+        wanted = [_skill_column(columns, name) for name in must_have]
+        skills = np.unpackbits(features["skills"], axis=1, count=len(columns)).astype(bool)
+        keep &= skills[:, wanted].all(axis=1)
+
+    positions = np.flatnonzero(keep)
+    # Best first; ties keep the stored order
+    positions = positions[np.argsort(-scores[positions], kind="stable")]
+    return positions, scores[positions]
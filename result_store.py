@@ -0,0 +1,147 @@
+"""Server-side store of ranked screening results, keyed by run id.
+
+The cookie session only remembers the id of the user's last run; the
+candidates themselves live here, one row per ranked candidate, so results
+pages can be paginated and exports of thousands of candidates never touch
+the cookie.  Runs expire after ``RESULT_TTL`` seconds and expired runs are
+purged as new ones are saved.
+
+Screening one resume batch against several job descriptions saves one run
+per role plus a "best role per candidate" run, tied together by a shared
+``group_id``.  Runs can also carry per-candidate feature arrays (see
+``reranking``), stored as one ``.npz`` blob so a re-rank reads them in a
+single query.
+"""
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import numpy as np
+
+RESULTS_DB = os.environ.get(
+    "THINKHIRE_RESULTS_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "results.sqlite3"),
+)
+RESULT_TTL = int(os.environ.get("THINKHIRE_RESULT_TTL_HOURS", "72")) * 3600
+# Candidates read per query when iterating a whole run
+READ_BATCH = 500
+
+_local = threading.local()
+
+
+def _db():
+    db = getattr(_local, "db", None)
+    if db is None:
+        os.makedirs(os.path.dirname(RESULTS_DB), exist_ok=True)
+        db = sqlite3.connect(RESULTS_DB, timeout=30)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        db.execute("""CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY, owner TEXT, kind TEXT NOT NULL, jd_text TEXT,
+            total INTEGER NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL)""")
+        columns = {row["name"] for row in db.execute("PRAGMA table_info(runs)")}
+        for column in ("group_id", "title"):
+            if column not in columns:
+                db.execute(f"ALTER TABLE runs ADD COLUMN {column} TEXT")
+        db.execute("CREATE INDEX IF NOT EXISTS runs_expires_at ON runs (expires_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS runs_group_id ON runs (group_id)")
+        db.execute("""CREATE TABLE IF NOT EXISTS results (
+            run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL, data TEXT NOT NULL, PRIMARY KEY (run_id, rank))""")
+        db.execute("""CREATE TABLE IF NOT EXISTS features (
+            run_id TEXT PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE, data BLOB NOT NULL)""")
+        db.commit()
+        _local.db = db
+    return db
+
+
+def save_run(owner, jd_text, candidates, kind="upload", run_id=None, group_id=None, title=None, features=None):
+    """Store ranked candidates (and optionally their feature arrays, in rank order); return the run id."""
+    run_id = run_id or uuid.uuid4().hex
+    now = time.time()
+    db = _db()
+    purge_expired(now)
+    db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+    db.execute("INSERT INTO runs (id, owner, kind, jd_text, total, created_at, expires_at, group_id, title) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+               (run_id, owner, kind, jd_text or "", len(candidates), now, now + RESULT_TTL, group_id, title))
+    db.executemany("INSERT INTO results VALUES (?, ?, ?)",
+                   [(run_id, rank, json.dumps(c)) for rank, c in enumerate(candidates, start=1)])
+    if features is not None:
+        buf = io.BytesIO()
+        np.savez(buf, **features)
+        db.execute("INSERT INTO features VALUES (?, ?)", (run_id, buf.getvalue()))
+    db.commit()
+    return run_id
+
+
+def get_run(run_id):
+    """Return the run's metadata (owner, kind, jd_text, total, ...), or None once expired."""
+    row = _db().execute("SELECT * FROM runs WHERE id = ? AND expires_at > ?",
+                        (run_id, time.time())).fetchone()
+    return dict(row) if row else None
+
+
+def get_group_runs(group_id):
+    """Unexpired runs sharing ``group_id``, in the order they were saved (without jd_text)."""
+    rows = _db().execute(
+        "SELECT id, owner, kind, title, total FROM runs WHERE group_id = ? AND expires_at > ? ORDER BY rowid",
+        (group_id, time.time()),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_results(run_id, offset=0, limit=None):
+    """Ranked candidates ``offset:offset + limit`` of a run, best first."""
+    rows = _db().execute(
+        "SELECT data FROM results WHERE run_id = ? AND rank > ? ORDER BY rank LIMIT ?",
+        (run_id, offset, -1 if limit is None else limit),
+    ).fetchall()
+    return [json.loads(r["data"]) for r in rows]
+
+
+def get_results_at(run_id, positions):
+    """Candidates at 0-based rank ``positions``, in that order."""
+    ranks = [int(p) + 1 for p in positions]
+    found = {}
+    for start in range(0, len(ranks), READ_BATCH):
+        chunk = ranks[start:start + READ_BATCH]
+        rows = _db().execute(
+            f"SELECT rank, data FROM results WHERE run_id = ? AND rank IN ({','.join('?' * len(chunk))})",
+            (run_id, *chunk),
+        ).fetchall()
+        found.update((r["rank"], json.loads(r["data"])) for r in rows)
+    return [found[rank] for rank in ranks if rank in found]
+
+
+def get_features(run_id):
+    """The run's feature arrays, or None when it was saved without them."""
+    row = _db().execute("SELECT data FROM features WHERE run_id = ?", (run_id,)).fetchone()
+    if row is None:
+        return None
+    with np.load(io.BytesIO(row["data"]), allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def iter_results(run_id, batch=READ_BATCH):
+    """Yield every candidate of a run in rank order, reading ``batch`` rows at a time."""
+    offset = 0
+    while True:
+        chunk = get_results(run_id, offset, batch)
+        yield from chunk
+        if len(chunk) < batch:
+            return
+        offset += batch
+
+
+def purge_expired(now=None):
+    """Delete runs past their TTL; returns how many were removed."""
+    db = _db()
+    removed = db.execute("DELETE FROM runs WHERE expires_at <= ?", (now or time.time(),)).rowcount
+    db.commit()
+    return removed
@@ -1,19 +1,46 @@
+import os
 import re
-import spacy
-from difflib import SequenceMatcher
+import threading
+from skill_matcher import SKILL_NAMES, DEFAULT_MATCHER, TAXONOMY_VERSION
 
-# Load spaCy model (ensure it's installed: python -m spacy download en_core_web_sm)
-nlp = spacy.load("en_core_web_sm")
+# Bump when parse_resume output changes; cached parses from other versions are ignored.
+# The skill taxonomy is part of the version, so editing skills.json invalidates too.
+PARSER_VERSION = f"1-{TAXONOMY_VERSION}"
+
+# spaCy model, loaded on first use (ensure it's installed: python -m spacy download en_core_web_sm)
+SPACY_MODEL = "en_core_web_sm"
+# Only NER is needed (for PERSON names); in en_core_web_sm it has its own tok2vec
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+# Batched name fallback: documents per nlp.pipe batch and worker processes
+NER_BATCH_SIZE = int(os.environ.get("THINKHIRE_NER_BATCH_SIZE", "64"))
+NER_PROCESSES = int(os.environ.get("THINKHIRE_NER_PROCESSES", "1"))
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return _nlp
+
+def nlp_loaded():
+    return _nlp is not None
+
+def __getattr__(name):
+    # Keeps ``resume_parser.nlp`` working for existing callers without loading at import
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warmup():
+    get_nlp()("Warm Up")
 
 # -------------------- Skill Database --------------------
-SKILLS_DB = [
-    "Python", "Java", "C++", "C", "SQL", "MongoDB", "PostgreSQL",
-    "JavaScript", "Node.js", "Express.js", "React", "HTML", "CSS",
-    "Flask", "Django", "Machine Learning", "Deep Learning", "Data Analysis",
-    "AWS", "Azure", "GCP", "Git", "Excel", "Power BI", "Tableau",
-    "TensorFlow", "PyTorch", "NLP", "Data Visualization", "Leadership",
-    "Communication", "Problem Solving", "Teamwork", "Docker", "Kubernetes"
-]
+# Loaded from the shared taxonomy (skills.json) so parser, scorer and suggestions agree
+SKILLS_DB = SKILL_NAMES
 
 # -------------------- Degree Patterns --------------------
 DEGREE_PATTERNS = [
@@ -27,131 +54,164 @@ DEGREE_PATTERNS = [
     (r"\b10th\b|\bsecondary\b", "Secondary", 1),
 ]
 
+# Compiled once at import; every extractor below uses these
+_DEGREE_RES = [(re.compile(pat, re.I), label, level) for pat, label, level in DEGREE_PATTERNS]
+_EDU_LINE_RE = re.compile(
+    "|".join(pat for pat, _, _ in DEGREE_PATTERNS)
+    + r"|\b(university|college|institute|school|academy|iit|nit|iiit|iim|bits)\b"
+    + r"|(?:19|20)\d{2}",
+    re.I,
+)
+_FIELD_RE = re.compile(r"(?:in|of)\s+([A-Za-z0-9 &\.\-+]+?)(?:,|\(| at | from | - |$)", re.I)
+# An institution is the run of name-like characters around a keyword; matching the
+# run and the keyword separately avoids the quadratic backtracking of one pattern
+_INSTITUTION_RUN_RE = re.compile(r"[A-Za-z0-9 &\.\-]+", re.I)
+_INSTITUTION_KEYWORD_RE = re.compile(r"University|College|Institute|School|IIT|NIT|IIIT|IIM|BITS|VIT|PES|SRM|COEP", re.I)
+_AT_FROM_RE = re.compile(r"(?:at|from)\s+([A-Za-z0-9 &\.\-]+)", re.I)
+_YEAR_RANGE_RE = re.compile(r"\b(19|20)\d{2}\s*[-–—]\s*(19|20)\d{2}\b")
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+_YEAR_WORD_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_NAME_REJECT_RE = re.compile(r"[@\d]|www\.|http", re.I)
+_UPPER_RE = re.compile(r"[A-Z]")
+_RESUME_WORD_RE = re.compile(r"resume|curriculum vitae|cv", re.I)
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+_PHONE_RE = re.compile(r"(\+?\d{1,3}[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,5}[\s\-]?\d{3,5})")
+_NON_DIGIT_RE = re.compile(r"\D")
+
 # -------------------- Helper --------------------
 def _clean(line: str) -> str:
     return " ".join(line.split()).strip()
 
 # -------------------- Name Extraction --------------------
-def extract_name(resume_text: str) -> str:
-    lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+def _header_lines(resume_text: str) -> list:
+    return [l.strip() for l in resume_text.splitlines() if l.strip()]
+
+def _name_from_header(lines: list):
     for line in lines[:6]:
         if (2 <= len(line.split()) <= 4
-            and not re.search(r"[@\d]|www\.|http", line, re.I)
-            and re.search(r"[A-Z]", line)
-            and not re.search(r"resume|curriculum vitae|cv", line, re.I)):
+            and not _NAME_REJECT_RE.search(line)
+            and _UPPER_RE.search(line)
+            and not _RESUME_WORD_RE.search(line)):
             return _clean(line)
+    return None
 
-    doc = nlp(" ".join(lines[:8]))
+def _name_from_doc(doc) -> str:
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             return _clean(ent.text)
     return "Not Found"
 
+def extract_name(resume_text: str, ner_fallback: bool = True):
+    """Name from the header lines, falling back to spaCy NER.
+
+    With ``ner_fallback=False`` returns None instead of running NER, so a
+    caller can batch the fallback through ``extract_names``.
+    """
+    lines = _header_lines(resume_text)
+    name = _name_from_header(lines)
+    if name or not ner_fallback:
+        return name
+    return _name_from_doc(get_nlp()(" ".join(lines[:8])))
+
+def extract_names(resume_texts: list, batch_size: int = None, n_process: int = None) -> list:
+    """Names for many resumes; the NER fallback runs once over all of them via nlp.pipe."""
+    names = []
+    pending = []
+    for i, text in enumerate(resume_texts):
+        lines = _header_lines(text)
+        name = _name_from_header(lines)
+        names.append(name)
+        if name is None:
+            pending.append((i, " ".join(lines[:8])))
+
+    if pending:
+        docs = get_nlp().pipe((snippet for _, snippet in pending),
+                              batch_size=batch_size or NER_BATCH_SIZE,
+                              n_process=n_process or NER_PROCESSES)
+        for (i, _), doc in zip(pending, docs):
+            names[i] = _name_from_doc(doc)
+    return names
+
 # -------------------- Email Extraction --------------------
 def extract_email(resume_text: str) -> str:
-    email = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", resume_text)
+    email = _EMAIL_RE.findall(resume_text)
     return email[0].strip() if email else "Not Found"
 
 # -------------------- Phone Extraction --------------------
 def extract_phone(resume_text: str) -> str:
-    phones = re.findall(r"(\+?\d{1,3}[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,5}[\s\-]?\d{3,5})", resume_text)
+    phones = _PHONE_RE.findall(resume_text)
     if phones:
         phones = [p.strip() for p in phones]
-        phones.sort(key=lambda x: len(re.sub(r"\D", "", x)), reverse=True)
+        phones.sort(key=lambda x: len(_NON_DIGIT_RE.sub("", x)), reverse=True)
         return phones[0]
     return "Not Found"
 
 # -------------------- Skill Extraction (Improved) --------------------
+# Compiled once at import: exact, alias, multi-word and fuzzy stages in one engine
 def extract_skills(resume_text: str, jd_text: str = "") -> list:
-    resume_norm = re.sub(r"[\W_]+", " ", resume_text.lower())
-    resume_text_lower = resume_text.lower()
-    tokens = set(resume_norm.split())
-
-    found = []
-    for skill in SKILLS_DB:
-        skill_lower = skill.lower()
-        skill_norm = re.sub(r"[\W_]+", " ", skill_lower).strip()
-        skill_words = skill_norm.split()
-
-        # Exact substring match (most reliable)
-        if skill_lower in resume_text_lower:
-            found.append(skill)
-            continue
-        
-        # All words present in normalized text
-        if all(w in tokens for w in skill_words):
-            found.append(skill)
-            continue
-        
-        # Fuzzy match with lower threshold for partial matches
-        for word in tokens:
-            if len(word) > 2 and len(skill_norm) > 2:
-                similarity = SequenceMatcher(None, word, skill_norm).ratio()
-                if similarity > 0.75:  # Lowered from 0.8 for better detection
-                    found.append(skill)
-                    break
-
-    return sorted(list(set(found))) if found else []
+    return DEFAULT_MATCHER.find(resume_text)
 
 # -------------------- Education Extraction --------------------
 def _find_years(text: str):
-    m = re.search(r"\b(19|20)\d{2}\s*[-–—]\s*(19|20)\d{2}\b", text)
+    m = _YEAR_RANGE_RE.search(text)
     if m:
-        yrs = re.findall(r"(?:19|20)\d{2}", m.group(0))
+        yrs = _YEAR_RE.findall(m.group(0))
         if len(yrs) >= 2:
             return (int(yrs[0]), int(yrs[1]))
-    years = re.findall(r"\b(19|20)\d{2}\b", text)
-    if years:
-        all_years = re.findall(r"\b(?:19|20)\d{2}\b", text)
-        if all_years:
-            y = int(all_years[-1])
-            return (None, y)
+    all_years = _YEAR_WORD_RE.findall(text)
+    if all_years:
+        return (None, int(all_years[-1]))
     return (None, None)
 
-def extract_education(resume_text: str) -> str:
-    lines = [_clean(l) for l in resume_text.splitlines() if l.strip()]
-    candidates = []
+def _find_institution(line: str):
+    """Same result as searching ``[chars]+KEYWORD[chars]*``: the first run with a keyword after its start."""
+    if not _INSTITUTION_KEYWORD_RE.search(line):
+        return None
+    for run in _INSTITUTION_RUN_RE.finditer(line):
+        if _INSTITUTION_KEYWORD_RE.search(line, run.start() + 1, run.end()):
+            return run.group(0)
+    return None
+
+def _education_candidate(idx: int, line: str):
+    """Education details for one cleaned line, or None if it has no education cues."""
+    if not _EDU_LINE_RE.search(line):
+        return None
+
+    degree_label = None
+    degree_level = 0
+    for pat, label, level in _DEGREE_RES:
+        if pat.search(line):
+            degree_label, degree_level = label, level
+            break
+
+    field = ""
+    fmatch = _FIELD_RE.search(line)
+    if fmatch:
+        field = _clean(fmatch.group(1))
+
+    inst = ""
+    inst_match = _find_institution(line)
+    if inst_match:
+        inst = _clean(inst_match)
+    else:
+        alt = _AT_FROM_RE.search(line)
+        if alt:
+            inst = _clean(alt.group(1).split(",")[0])
 
-    for idx, line in enumerate(lines):
-        l_low = line.lower()
-        if (any(re.search(pat, l_low, re.I) for pat,_,_ in DEGREE_PATTERNS)
-            or re.search(r"\b(university|college|institute|school|academy|iit|nit|iiit|iim|bits)\b", l_low, re.I)
-            or re.search(r"(?:19|20)\d{2}", l_low)):
-
-            degree_label = None
-            degree_level = 0
-            for pat, label, level in DEGREE_PATTERNS:
-                if re.search(pat, line, re.I):
-                    degree_label, degree_level = label, level
-                    break
-
-            field = ""
-            fmatch = re.search(r"(?:in|of)\s+([A-Za-z0-9 &\.\-+]+?)(?:,|\(| at | from | - |$)", line, re.I)
-            if fmatch:
-                field = _clean(fmatch.group(1))
-
-            inst = ""
-            inst_match = re.search(r"([A-Za-z0-9 &\.\-]+(?:University|College|Institute|School|IIT|NIT|IIIT|IIM|BITS|VIT|PES|SRM|COEP)[A-Za-z0-9 &\.\-]*)", line, re.I)
-            if inst_match:
-                inst = _clean(inst_match.group(0))
-            else:
-                alt = re.search(r"(?:at|from)\s+([A-Za-z0-9 &\.\-]+)", line, re.I)
-                if alt:
-                    inst = _clean(alt.group(1).split(",")[0])
-
-            start_y, end_y = _find_years(line)
-
-            candidates.append({
-                "line": line,
-                "idx": idx,
-                "degree_label": degree_label,
-                "degree_level": degree_level,
-                "field": field,
-                "institution": inst,
-                "start_year": start_y,
-                "end_year": end_y
-            })
+    start_y, end_y = _find_years(line)
 
+    return {
+        "line": line,
+        "idx": idx,
+        "degree_label": degree_label,
+        "degree_level": degree_level,
+        "field": field,
+        "institution": inst,
+        "start_year": start_y,
+        "end_year": end_y
+    }
+
+def _format_education(candidates: list) -> str:
     if not candidates:
         return "Not Found"
 
@@ -160,8 +220,7 @@ def extract_education(resume_text: str) -> str:
         endy = c.get("end_year") or 0
         return (lvl, endy, -c.get("idx", 0))
 
-    candidates.sort(key=cand_score, reverse=True)
-    best = candidates[0]
+    best = max(candidates, key=cand_score)
 
     parts = []
     deg = best.get("degree_label")
@@ -183,12 +242,52 @@ def extract_education(resume_text: str) -> str:
     formatted = " ".join(parts).strip()
     return formatted or "Not Found"
 
+def extract_education(resume_text: str) -> str:
+    lines = [_clean(l) for l in resume_text.splitlines() if l.strip()]
+    candidates = [c for c in (_education_candidate(i, l) for i, l in enumerate(lines)) if c]
+    return _format_education(candidates)
+
 # -------------------- Main Resume Parser --------------------
-def parse_resume(resume_text: str, jd_text: str = "") -> dict:
+def _scan_lines(resume_text: str):
+    """Split once and feed every line-based extractor: (header lines, education candidates)."""
+    header = []
+    candidates = []
+    idx = 0
+    for raw in resume_text.splitlines():
+        stripped = raw.strip()
+        if not stripped:
+            continue
+        if len(header) < 8:
+            header.append(stripped)
+        cand = _education_candidate(idx, _clean(stripped))
+        if cand:
+            candidates.append(cand)
+        idx += 1
+    return header, candidates
+
+def _parse(resume_text: str, jd_text: str) -> dict:
+    header, candidates = _scan_lines(resume_text)
     return {
-        "name": extract_name(resume_text),
+        "name": _name_from_header(header),
         "email": extract_email(resume_text),
         "phone": extract_phone(resume_text),
         "skills": extract_skills(resume_text, jd_text),
-        "education": extract_education(resume_text),
-    }
+        "education": _format_education(candidates),
+    }, header
+
+def parse_resume(resume_text: str, jd_text: str = "", ner_fallback: bool = True) -> dict:
+    """Parse one resume. With ``ner_fallback=False`` "name" may be None (see ``extract_names``)."""
+    info, header = _parse(resume_text, jd_text)
+    if info["name"] is None and ner_fallback:
+        info["name"] = _name_from_doc(get_nlp()(" ".join(header)))
+    return info
+
+def parse_resumes(resume_texts: list, jd_text: str = "", batch_size: int = None, n_process: int = None) -> list:
+    """Parse many resumes; names that need NER are resolved in one ``extract_names`` batch."""
+    results = [_parse(text, jd_text)[0] for text in resume_texts]
+    pending = [i for i, info in enumerate(results) if info["name"] is None]
+    if pending:
+        names = extract_names([resume_texts[i] for i in pending], batch_size=batch_size, n_process=n_process)
+        for i, name in zip(pending, names):
+            results[i]["name"] = name
+    return results
@@ -0,0 +1,190 @@
+"""Offline bulk screening from the command line.
+
+    python screen_cli.py JD_FILE RESUMES [RESUMES ...] -o results.jsonl
+        [--mode full|score] [--workers N] [--batch-size N] [--chunk N] [--top N]
+
+``RESUMES`` are directories (searched recursively) and/or zip archives.
+Results are appended to the CSV or JSONL output (chosen by extension) after
+every scored batch, in processing order.  Re-running the same command skips
+the files already in the output, so an interrupted run picks up where it
+stopped; pass ``--restart`` to start over.  The best matches are printed at
+the end.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import text_extraction
+from screening import EMBED_BATCH_SIZE, iter_scored
+from text_extraction import RESUME_EXTENSIONS, extract_text, iter_zip_members
+
+# Files handed to one extraction pool run; bounds memory on huge corpora
+CHUNK_FILES = 1000
+# Output columns per mode
+FIELDS = {
+    "full": ["FileName", "Score", "Name", "Email", "Phone", "Skills", "education", "Suggestions"],
+    "score": ["FileName", "Score", "Skills"],
+}
+
+
+def iter_resume_files(inputs):
+    """Yield ``(name, path or bytes)`` for every resume under the given directories and zips.
+
+    Names start with the directory or zip they came from and are unique
+    within one run (``#2``, ``#3``... on collisions), so ``--resume`` never
+    mistakes one file for another.
+    """
+    seen = set()
+
+    def unique(key):
+        name, n = key, 1
+        while key in seen:
+            n += 1
+            key = f"{name}#{n}"
+        seen.add(key)
+        return key
+
+    for source in inputs:
+        if os.path.isdir(source):
+            prefix = os.path.basename(os.path.normpath(source))
+            for root, dirs, names in os.walk(source):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        yield unique(f"{prefix}/{os.path.relpath(path, source).replace(os.sep, '/')}"), path
+        elif source.lower().endswith(".zip"):
+            # A trusted local archive: no member count or total size limit
+            prefix = os.path.basename(source)
+            for name, data in iter_zip_members(source, RESUME_EXTENSIONS, max_members=sys.maxsize,
+                                               max_total_bytes=sys.maxsize):
+                yield unique(f"{prefix}/{name}"), data
+        elif source.lower().endswith(RESUME_EXTENSIONS):
+            yield unique(os.path.basename(source)), source
+        else:
+            print(f"Skipping {source}: not a directory, zip or resume file", file=sys.stderr)
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_rows(f, jsonl):
+    if not jsonl:
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def load_finished(path):
+    """``{file name: score}`` already in the output; a half-written last line is cut off."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    finished = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in _read_rows(f, path.endswith(".jsonl")):
+            try:
+                finished[row["FileName"]] = float(row["Score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return finished
+
+
+class ResultWriter:
+    """Appends candidates to a CSV or JSONL file, flushing after every batch."""
+
+    def __init__(self, path, fields):
+        self.jsonl = path.endswith(".jsonl")
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        if not self.jsonl:
+            self.csv = csv.DictWriter(self.file, fieldnames=fields, extrasaction="ignore")
+            if new:
+                self.csv.writeheader()
+
+    def write(self, candidates):
+        for c in candidates:
+            if self.jsonl:
+                self.file.write(json.dumps(c) + "\n")
+            else:
+                row = dict(c)
+                for key in ("Skills", "Suggestions"):
+                    if isinstance(row.get(key), (list, tuple)):
+                        row[key] = ", ".join(row[key])
+                self.csv.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory or zip of resumes against a job description.")
+    parser.add_argument("jd_file", help="job description (.pdf, .docx or .txt)")
+    parser.add_argument("resumes", nargs="+", help="directories, zip archives or resume files")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="output file, .csv or .jsonl")
+    parser.add_argument("--mode", choices=("full", "score"), default="full",
+                        help="'score' skips field parsing, spaCy and suggestions")
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: one per core)")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="resumes embedded per batch")
+    parser.add_argument("--chunk", type=int, default=CHUNK_FILES, help="files per extraction pool run")
+    parser.add_argument("--top", type=int, default=10, help="best matches to print at the end")
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of resuming")
+    args = parser.parse_args(argv)
+    # The CLI owns the machine: long PDFs extracted here may use every core
+    text_extraction.PDF_PAGE_PARALLEL = True
+
+    jd_text = extract_text(args.jd_file)
+    if not jd_text.strip():
+        parser.error(f"no text could be extracted from {args.jd_file}")
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+
+    finished = load_finished(args.output)
+    if finished:
+        print(f"Resuming: {len(finished)} resumes already in {args.output}", file=sys.stderr)
+    todo = ((name, source) for name, source in iter_resume_files(args.resumes) if name not in finished)
+
+    fields = FIELDS[args.mode]
+    writer = ResultWriter(args.output, fields)
+    start, done = time.time(), 0
+    try:
+        for chunk in _chunks(todo, args.chunk):
+            for batch in iter_scored(jd_text, chunk, parse=args.mode == "full",
+                                     suggestions=args.mode == "full", batch_size=args.batch_size,
+                                     workers=args.workers):
+                rows = [{k: info.get(k) for k in fields} for info in batch]
+                writer.write(rows)
+                finished.update((r["FileName"], r["Score"]) for r in rows)
+                done += len(rows)
+            rate = done / max(time.time() - start, 1e-9)
+            print(f"Screened {done} resumes ({rate:.1f}/s)", file=sys.stderr)
+    finally:
+        writer.close()
+
+    best = sorted(finished.items(), key=lambda x: x[1], reverse=True)[:args.top]
+    for rank, (name, score) in enumerate(best, start=1):
+        print(f"{rank:>3}. {score * 100:5.1f}%  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""Screening pipeline shared by the web app and background jobs.
+
+Runs outside of any Flask request: takes the JD text and a list of
+``(display name, path or bytes)`` resume files and returns the ranked
+candidates.
+"""
+import os
+
+import numpy as np
+
+import resume_parser
+import matcher
+import extraction_cache
+import metrics
+from resume_parser import parse_resume, extract_names, PARSER_VERSION
+from matcher import (match_components, blend, suggest_improvements, embed_documents, document_similarity,
+                     blend_scores, extract_years_of_experience, top_k_indices, embedding_space)
+from reranking import role_features
+from dedup import DuplicateFinder, DEDUP_ENABLED
+from candidate_index import candidate_index, content_hash
+from skill_matcher import extract_skills
+from text_extraction import iter_extracted
+
+# Resumes are embedded in batches while extraction is still running
+EMBED_BATCH_SIZE = 32
+# parse_resume fields kept in the parse cache
+PARSE_FIELDS = ("name", "email", "phone", "skills", "education")
+
+
+def warm_up_models(run_inference=True):
+    """Load the spaCy and sentence-transformer models ahead of the first upload.
+
+    With ``run_inference=False`` only the weights are loaded, which is what the
+    gunicorn master should do before forking workers.
+    """
+    if run_inference:
+        resume_parser.warmup()
+        matcher.warmup()
+    else:
+        resume_parser.get_nlp()
+        matcher.get_model()
+
+
+def models_ready():
+    return resume_parser.nlp_loaded() and matcher.model_loaded()
+
+
+def _parse_cached(text, jd_text):
+    """``(parsed fields, text hash)``; the hash is None when the parse came from the cache."""
+    digest = extraction_cache.sha256_text(text)
+    try:
+        cached = extraction_cache.get_parsed([digest], PARSER_VERSION).get(digest)
+    except Exception:
+        cached = None
+    if cached is not None:
+        metrics.inc("thinkhire_cache_total", cache="parse", result="hit")
+        return cached, None
+    metrics.inc("thinkhire_cache_total", cache="parse", result="miss")
+    # Names needing spaCy NER are filled in afterwards, in one nlp.pipe batch
+    return parse_resume(text, jd_text, ner_fallback=False), digest
+
+
+def _store_parsed(resumes_info, fresh):
+    try:
+        extraction_cache.put_parsed(
+            [(digest, {k: resumes_info[idx][k] for k in PARSE_FIELDS}) for idx, digest in fresh],
+            PARSER_VERSION,
+        )
+    except Exception:
+        pass
+
+
+def _candidate_info(info, filename):
+    info["FileName"] = filename
+    info["Skills"] = info.get("skills", [])
+    info["Name"] = info.get("name", "")
+    info["Email"] = info.get("email", "")
+    info["Phone"] = info.get("phone", "")
+    return info
+
+
+def _in_upload_order(pairs):
+    """Re-yield ``(index, item)`` pairs that arrive in any order by ascending index."""
+    waiting, expected = {}, 0
+    for index, item in pairs:
+        waiting[index] = item
+        while expected in waiting:
+            yield expected, waiting.pop(expected)
+            expected += 1
+
+
+def screen_resumes(jd_text, resume_files, on_file_done=None, on_stage=None):
+    """Extract, parse, score and rank resumes against one job description.
+
+    ``on_file_done(index)`` is called as each file finishes parsing and
+    ``on_stage(name)`` when the pipeline moves to a new stage.
+    """
+    rankings, _, _ = screen_roles([jd_text], resume_files, on_file_done=on_file_done, on_stage=on_stage)
+    return rankings[0]
+
+
+def screen_roles(jd_texts, resume_files, on_file_done=None, on_stage=None, owner=None):
+    """Rank one batch of resumes against several job descriptions.
+
+    Resumes are extracted, parsed and embedded once; one roles x resumes
+    score matrix is computed.  Copies of a resume already in the batch are
+    dropped right after extraction and listed in the earliest uploaded
+    copy's ``Duplicates``.  Returns ``(rankings, scores, features)``: a ranked
+    candidate list per job description, the score matrix, whose columns
+    follow the remaining candidates in upload order (``Index`` is the
+    position in ``resume_files``), and per job description the score
+    components in rank order, for ``reranking``.  With an ``owner`` the
+    candidates are also added to that user's candidate pool.
+    """
+    if on_stage:
+        on_stage("extracting")
+
+    # --- Extract in parallel; parse (and pre-embed) each resume as it arrives ---
+    resumes_raw = [""] * len(resume_files)
+    resumes_info = [None] * len(resume_files)
+    unembedded = []
+    fresh = []  # (index, text hash) of resumes parsed in this run, cached below
+    finder = DuplicateFinder() if DEDUP_ENABLED else None
+    duplicate_of = {}
+    extracted = iter_extracted(resume_files)
+    if finder is not None:
+        # Cache hits finish first; dedup in upload order so the representative doesn't depend on timing
+        extracted = _in_upload_order(extracted)
+    for idx, text in extracted:
+        if finder is not None:
+            with metrics.timed("dedup", file=resume_files[idx][0]):
+                rep = finder.add(idx, text)
+            if rep is not None:
+                duplicate_of[idx] = rep
+                metrics.inc("thinkhire_duplicates_total")
+                if on_file_done:
+                    on_file_done(idx)
+                continue
+        resumes_raw[idx] = text
+        with metrics.timed("parse", file=resume_files[idx][0]):
+            info, digest = _parse_cached(text, jd_texts[0])
+        resumes_info[idx] = _candidate_info(info, resume_files[idx][0])
+        resumes_info[idx]["Index"] = idx
+        if digest:
+            fresh.append((idx, digest))
+        if on_file_done:
+            on_file_done(idx)
+        unembedded.append(text)
+        if len(unembedded) >= EMBED_BATCH_SIZE:
+            # Warms the embedding cache so matching below is mostly cache hits
+            with metrics.timed("embed"):
+                embed_documents(unembedded)
+            unembedded = []
+
+    if not resumes_raw:
+        return [[] for _ in jd_texts], np.zeros((len(jd_texts), 0), dtype=np.float32), [None for _ in jd_texts]
+
+    # Collapse copies into the first upload of each candidate
+    for dup, rep in sorted(duplicate_of.items()):
+        resumes_info[rep].setdefault("Duplicates", []).append(resume_files[dup][0])
+    kept = [i for i in range(len(resume_files)) if i not in duplicate_of]
+    position = {idx: pos for pos, idx in enumerate(kept)}
+    resumes_raw = [resumes_raw[i] for i in kept]
+    resumes_info = [resumes_info[i] for i in kept]
+    fresh = [(position[idx], digest) for idx, digest in fresh]
+
+    pending = [i for i, info in enumerate(resumes_info) if info["name"] is None]
+    if pending:
+        with metrics.timed("ner"):
+            names = extract_names([resumes_raw[i] for i in pending])
+        for i, name in zip(pending, names):
+            resumes_info[i]["name"] = resumes_info[i]["Name"] = name
+    _store_parsed(resumes_info, fresh)
+
+    # --- AI Matching ---
+    if on_stage:
+        on_stage("matching")
+    # One skill scan per text: each JD here, each resume during parsing
+    job_skills = [extract_skills(jd_text) for jd_text in jd_texts]
+    resume_skills = [info.get("Skills", []) for info in resumes_info]
+    with metrics.timed("score"):
+        components = match_components(jd_texts, resumes_raw, job_skills=job_skills, resume_skills=resume_skills)
+        scores = blend(components["similarity"], components["skill_score"], components["experience_score"])
+
+    rankings, features = [], []
+    for role, (jd_text, skills, row) in enumerate(zip(jd_texts, job_skills, scores)):
+        ranked = []
+        # Highest match first; ties keep upload order
+        order = top_k_indices(row, len(row))
+        features.append(role_features(components, role, order))
+        for idx in order:
+            candidate = dict(resumes_info[idx], Score=float(row[idx]))
+            with metrics.timed("suggest", file=candidate["FileName"]):
+                candidate["Suggestions"] = suggest_improvements(jd_text, resumes_raw[idx], candidate.get("Skills", []), job_skills=skills)
+            ranked.append(candidate)
+        rankings.append(ranked)
+
+    if owner is not None:
+        try:
+            with metrics.timed("index"):
+                index_candidates(resumes_info, resumes_raw, owner)
+        except Exception:
+            # The pool is a convenience; never fail a screening run because of it
+            pass
+
+    return rankings, scores, features
+
+
+def best_roles(rankings, titles):
+    """One row per candidate, best first: the role it scores highest for and its score for each role."""
+    by_index = [{c["Index"]: c for c in ranked} for ranked in rankings]
+    rows = []
+    for idx in sorted(by_index[0]):
+        role_scores = [by_index[role][idx]["Score"] for role in range(len(titles))]
+        best = int(np.argmax(role_scores))
+        candidate = dict(by_index[best][idx])
+        candidate["BestRole"] = titles[best]
+        candidate["RoleScores"] = dict(zip(titles, role_scores))
+        rows.append(candidate)
+    # Highest best-role score first; ties keep upload order
+    rows.sort(key=lambda c: -c["Score"])
+    return rows
+
+
+# ---------- Incremental scoring ----------
+def iter_scored(jd_text, resume_files, parse=True, suggestions=True, batch_size=EMBED_BATCH_SIZE, workers=None):
+    """Yield lists of scored candidates, one batch at a time, as files finish extracting.
+
+    Scores match ``screen_resumes``.  With ``parse=False`` only skills are
+    scanned (no field parsing, no spaCy) and with ``suggestions=False``
+    ``suggest_improvements`` is skipped.  Each candidate carries ``Index``,
+    its position in ``resume_files``; batches arrive in completion order,
+    not rank order.  ``workers`` sets the extraction process count.
+    """
+    job_skills = extract_skills(jd_text)
+    job_experience = extract_years_of_experience(jd_text)
+    job_vector = embed_documents([jd_text])[0]
+
+    def score(batch):
+        texts = [text for _, text, _, _ in batch]
+        infos = [info for _, _, info, _ in batch]
+        if parse:
+            pending = [i for i, info in enumerate(infos) if info["name"] is None]
+            if pending:
+                with metrics.timed("ner"):
+                    names = extract_names([texts[i] for i in pending])
+                for i, name in zip(pending, names):
+                    infos[i]["name"] = infos[i]["Name"] = name
+            _store_parsed(infos, [(i, digest) for i, (*_, digest) in enumerate(batch) if digest])
+        with metrics.timed("embed"):
+            similarity = document_similarity(job_vector, texts)[0]
+        with metrics.timed("score"):
+            scores = blend_scores(similarity, job_skills, job_experience,
+                                  [info["Skills"] for info in infos],
+                                  [extract_years_of_experience(t) for t in texts])
+        for (idx, text, info, _), value in zip(batch, scores):
+            info["Index"] = idx
+            info["Score"] = float(value)
+            if suggestions:
+                with metrics.timed("suggest", file=info["FileName"]):
+                    info["Suggestions"] = suggest_improvements(jd_text, text, info["Skills"], job_skills=job_skills)
+        return infos
+
+    batch = []
+    for idx, text in iter_extracted(resume_files, workers=workers):
+        with metrics.timed("parse", file=resume_files[idx][0]):
+            if parse:
+                info, digest = _parse_cached(text, jd_text)
+                info = _candidate_info(info, resume_files[idx][0])
+            else:
+                info, digest = {"FileName": resume_files[idx][0], "Skills": extract_skills(text)}, None
+        batch.append((idx, text, info, digest))
+        if len(batch) >= batch_size:
+            yield score(batch)
+            batch = []
+    if batch:
+        yield score(batch)
+
+
+# ---------- Candidate pool ----------
+# Semantic shortlist size, as a multiple of top_k, before the full score blend
+POOL_SHORTLIST_FACTOR = 5
+# Pool search runs inside the request, so both the shortlist and the rows scanned are capped
+POOL_MAX_SHORTLIST = 1000
+POOL_MAX_SCAN_ROWS = int(os.environ.get("THINKHIRE_POOL_MAX_SCAN_ROWS", "200000"))
+
+
+def index_candidates(resumes_info, resumes_raw, owner):
+    """Add screened resumes to ``owner``'s persistent candidate pool."""
+    vectors = embed_documents(resumes_raw)  # cache hits: just encoded for matching
+    records = []
+    for info, text in zip(resumes_info, resumes_raw):
+        records.append({
+            "content_hash": content_hash(text),
+            "file_name": info.get("FileName", ""),
+            "name": info.get("Name", ""),
+            "email": info.get("Email", ""),
+            "phone": info.get("Phone", ""),
+            "skills": info.get("Skills", []),
+            "education": info.get("education", ""),
+            "experience": extract_years_of_experience(text),
+        })
+    return candidate_index.add(records, vectors, owner, space=embedding_space())
+
+
+def search_candidate_pool(jd_text, owner, top_k=20):
+    """Rank the candidates ``owner`` screened before against a job description.
+
+    Only the ``POOL_MAX_SCAN_ROWS`` most recently screened are searched.
+    Raises ValueError if the pool was built with other embedding settings.
+    """
+    job_vector = embed_documents([jd_text])[0]
+    shortlist = min(top_k * POOL_SHORTLIST_FACTOR, POOL_MAX_SHORTLIST)
+    hits = candidate_index.search(job_vector, owner, shortlist, space=embedding_space(),
+                                  max_rows=POOL_MAX_SCAN_ROWS)
+    records = candidate_index.get([cid for cid, _ in hits], owner)
+    if not records:
+        return []
+    similarity = {cid: score for cid, score in hits}
+    scores = blend_scores([similarity[r["id"]] for r in records], extract_skills(jd_text),
+                          extract_years_of_experience(jd_text),
+                          [r["skills"] for r in records], [r["experience"] for r in records])
+
+    results = []
+    for record, score in zip(records, scores):
+        results.append({
+            "FileName": record["file_name"],
+            "Name": record["name"],
+            "Email": record["email"],
+            "Phone": record["phone"],
+            "Skills": record["skills"],
+            "education": record["education"],
+            "Score": float(score),
+            "Suggestions": [],
+        })
+    results.sort(key=lambda x: x["Score"], reverse=True)
+    return results[:top_k]
@@ -0,0 +1,184 @@
+"""Precompiled skill matching engine.
+
+A ``SkillMatcher`` is built once from a skill list and then finds skills in a
+text in three stages, mirroring the original ``extract_skills`` rules:
+
+1. exact substring hits, found in one pass with an Aho–Corasick automaton;
+2. multi-word skills whose words all appear as tokens, via a word index;
+3. fuzzy token matches (``SequenceMatcher`` ratio > 0.75), where candidate
+   skills are pre-filtered by length and by a character-bag upper bound
+   before any edit-distance work, and results are memoized per token.
+
+Aliases (e.g. "node" -> "Node.js") match as whole words only.  The shared
+taxonomy is loaded from ``skills.json`` and compiled once at import; the
+parser, the scorer and the suggestion engine all use ``extract_skills``.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import Counter, deque
+from difflib import SequenceMatcher
+
+FUZZY_THRESHOLD = 0.75
+# Per-token fuzzy results are memoized; the vocabulary of resumes is small
+FUZZY_CACHE_SIZE = 200000
+
+TAXONOMY_FILE = os.environ.get(
+    "THINKHIRE_SKILLS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json"),
+)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower())
+
+
+class _AhoCorasick:
+    """Finds which of a set of patterns occur anywhere in a text, in one pass."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.out = [set()]
+        for pid, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.out.append(set())
+                state = nxt
+            self.out[state].add(pid)
+
+        # Breadth-first failure links; outputs are merged so a scan never walks them
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] |= self.out[self.fail[nxt]]
+
+    def search(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+def load_taxonomy(path=TAXONOMY_FILE):
+    """Return ``(skill names, {alias: skill name}, version)`` from a taxonomy JSON file."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    entries = json.loads(raw.decode("utf-8"))
+    names = [e["name"] for e in entries]
+    aliases = {alias: e["name"] for e in entries for alias in e.get("aliases", [])}
+    return names, aliases, hashlib.sha256(raw).hexdigest()[:12]
+
+
+class SkillMatcher:
+    def __init__(self, skills, aliases=None):
+        self.skills = list(skills)
+        index = {s: i for i, s in enumerate(self.skills)}
+        lowered = [s.lower() for s in self.skills]
+        self._exact = _AhoCorasick(lowered)
+        self._always = {i for i, s in enumerate(lowered) if not s}
+
+        # Aliases are matched as whole words against space-padded normalized text
+        alias_items = [(f" {normalize(a).strip()} ", index[name])
+                       for a, name in (aliases or {}).items() if name in index]
+        self._alias_targets = [i for _, i in alias_items]
+        self._aliases = _AhoCorasick([pattern for pattern, _ in alias_items])
+
+        self._norms = [normalize(s).strip() for s in lowered]
+        self._words = [n.split() for n in self._norms]
+        self._by_first_word = {}
+        for i, words in enumerate(self._words):
+            if words:
+                self._by_first_word.setdefault(words[0], []).append(i)
+            else:
+                self._always.add(i)
+
+        # Fuzzy candidates bucketed by normalized length, with character bags
+        self._by_length = {}
+        self._bags = {}
+        for i, norm in enumerate(self._norms):
+            if len(norm) > 2:
+                self._by_length.setdefault(len(norm), []).append(i)
+                self._bags[i] = Counter(norm)
+        self._fuzzy_cache = {}
+
+    def _fuzzy_hits(self, word):
+        hits = self._fuzzy_cache.get(word)
+        if hits is not None:
+            return hits
+        la = len(word)
+        bag = None
+        found = []
+        for lb, ids in self._by_length.items():
+            # ratio = 2*M / (la + lb) and M <= min(la, lb)
+            if 2.0 * min(la, lb) / (la + lb) <= FUZZY_THRESHOLD:
+                continue
+            if bag is None:
+                bag = Counter(word)
+            for i in ids:
+                # Same bound as SequenceMatcher.quick_ratio, without building a matcher
+                common = sum((bag & self._bags[i]).values())
+                if 2.0 * common / (la + lb) <= FUZZY_THRESHOLD:
+                    continue
+                if SequenceMatcher(None, word, self._norms[i]).ratio() > FUZZY_THRESHOLD:
+                    found.append(i)
+        hits = frozenset(found)
+        if len(self._fuzzy_cache) >= FUZZY_CACHE_SIZE:
+            self._fuzzy_cache.clear()
+        self._fuzzy_cache[word] = hits
+        return hits
+
+    def find(self, text: str, fuzzy: bool = True) -> list:
+        """Return the sorted, de-duplicated skills found in ``text``."""
+        matched = set(self._always)
+        matched |= self._exact.search(text.lower())
+
+        norm = normalize(text)
+        matched.update(self._alias_targets[a] for a in self._aliases.search(f" {norm} "))
+
+        tokens = set(norm.split())
+        for token in tokens:
+            for i in self._by_first_word.get(token, ()):
+                if i not in matched and all(w in tokens for w in self._words[i]):
+                    matched.add(i)
+
+        if fuzzy and len(matched) < len(self.skills):
+            for token in tokens:
+                if len(token) > 2:
+                    matched |= self._fuzzy_hits(token)
+
+        return sorted({self.skills[i] for i in matched})
+
+
+# -------------------- Shared taxonomy --------------------
+SKILL_NAMES, SKILL_ALIASES, TAXONOMY_VERSION = load_taxonomy()
+# Column of each skill in per-document skill matrices
+SKILL_COLUMNS = {name: i for i, name in enumerate(SKILL_NAMES)}
+DEFAULT_MATCHER = SkillMatcher(SKILL_NAMES, SKILL_ALIASES)
+
+
+def extract_skills(text: str) -> list:
+    """Skills found in ``text`` using the shared taxonomy."""
+    return DEFAULT_MATCHER.find(text or "")
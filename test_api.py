@@ -0,0 +1,59 @@
+# test_api.py
+import base64
+
+import numpy as np
+import pytest
+
+import api
+import extraction_cache
+import matcher
+from app import app
+from benchmarks.synthetic import docx_bytes, resume_text
+from embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "API_KEYS", ["secret"])
+    return app.test_client()
+
+
+def test_screen_requires_session_or_api_key(client):
+    assert client.post("/api/v1/screen", json={}).status_code == 401
+    assert client.post("/api/v1/screen", json={}, headers={"X-API-Key": "wrong"}).status_code == 401
+
+
+@pytest.mark.parametrize("body, error", [
+    ({"resumes": [{"text": "Python"}]}, "jd_text"),
+    ({"jd_text": "Python developer"}, "resume"),
+    ({"jd_text": "Python", "resumes": [{"text": "x"}], "mode": "fast"}, "mode"),
+    ({"jd_text": "Python", "resumes": [{"content_base64": "not base64!"}]}, "base64"),
+    ({"jd_text": "Python", "resumes": [{"filename": "cv.exe", "content_base64": "TVo="}]}, "filename"),
+])
+def test_screen_rejects_malformed_requests(client, body, error):
+    response = client.post("/api/v1/screen", json=body, headers={"X-API-Key": "secret"})
+    assert response.status_code == 400
+    assert error in response.get_json()["error"]
+
+
+def test_screen_scores_text_and_binary_resumes(client, tmp_path, monkeypatch):
+    class Model:
+        def encode(self, batch, **kwargs):
+            return np.array([[t.count(w) + 1.0 for w in ("python", "java", "sql")] for t in batch], dtype=np.float32)
+
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    monkeypatch.setattr(matcher, "get_model", lambda: Model())
+    monkeypatch.setattr(matcher, "embedding_cache", EmbeddingCache("test-model", str(tmp_path)))
+    body = {"jd_text": "Python developer with SQL", "mode": "score", "resumes": [
+        # Text pasted from a PDF keeps the PDF's name but is read as text
+        {"filename": "pasted.pdf", "text": "Asha Rao\nSkills: Python, SQL, Docker"},
+        {"filename": "cv.docx", "content_base64": base64.b64encode(docx_bytes(resume_text(1))).decode()},
+    ]}
+
+    response = client.post("/api/v1/screen", json=body, headers={"X-API-Key": "secret"})
+    assert response.status_code == 200
+    candidates = {c["FileName"]: c for c in response.get_json()["candidates"]}
+    assert set(candidates) == {"pasted.pdf", "cv.docx"}
+    assert {"Python", "SQL"} <= set(candidates["pasted.pdf"]["Skills"])
+    assert candidates["cv.docx"]["Skills"] and all(0 <= c["Score"] <= 1 for c in candidates.values())
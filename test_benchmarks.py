@@ -0,0 +1,36 @@
+# test_benchmarks.py
+import io
+import sys
+
+import pytest
+
+from benchmarks import synthetic
+from benchmarks.compare import compare
+from text_extraction import extract_text, iter_zip_members
+
+
+def test_synthetic_resumes_are_deterministic():
+    assert synthetic.resume_text(7) == synthetic.resume_text(7)
+    assert synthetic.resume_text(7) != synthetic.resume_text(8)
+
+
+@pytest.mark.parametrize("fmt", ["txt", "docx", "pdf", "zip"])
+def test_synthetic_formats_extract_to_the_same_resume(fmt):
+    if fmt == "pdf":
+        pytest.importorskip("reportlab")
+    files = synthetic.corpus(3, fmt)
+    if fmt == "zip":
+        (_, archive), = files
+        files = list(iter_zip_members(io.BytesIO(archive), (".txt",), max_members=sys.maxsize))
+
+    assert len(files) == 3
+    for i, (name, data) in enumerate(files):
+        assert extract_text(data, name).split() == synthetic.resume_text(i).split()
+
+
+def test_compare_flags_only_real_slowdowns():
+    base = {"results": {"a": {"10": {"seconds": 1.0}}, "b": {"10": {"seconds": 0.001}}}}
+    new = {"results": {"a": {"10": {"seconds": 1.5}}, "b": {"10": {"seconds": 0.003}},
+                       "c": {"10": {"skipped": "no model"}}}}
+    rows = compare(base, new, threshold=0.10, min_seconds=0.005)
+    assert [(name, regressed) for name, *_, regressed in rows] == [("a", True), ("b", False)]
@@ -0,0 +1,78 @@
+# test_candidate_index.py
+import numpy as np
+import pytest
+
+from candidate_index import CandidateIndex
+
+
+def _record(h, name):
+    return {"content_hash": h, "file_name": f"{name}.pdf", "name": name, "skills": ["Python"], "experience": 2}
+
+
+def test_search_ranks_pool_and_skips_reindexed_resumes(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    vectors = np.eye(3, dtype=np.float32)
+    assert index.add([_record("a", "Asha"), _record("b", "Bo"), _record("c", "Cy")], vectors, "alice") == 3
+    assert index.add([_record("a", "Asha")], vectors[:1], "alice") == 0
+
+    hits = index.search(np.array([0.1, 0.9, 0.0]), "alice", top_k=2)
+    assert [cid for cid, _ in hits] == [1, 0]
+    assert [r["name"] for r in index.get([cid for cid, _ in hits], "alice")] == ["Bo", "Asha"]
+    assert len(CandidateIndex(str(tmp_path))) == 3
+
+
+def test_users_only_see_their_own_pool(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    vectors = np.eye(3, dtype=np.float32)
+    index.add([_record("a", "Asha"), _record("b", "Bo")], vectors[:2], "alice")
+    # The same resume screened by another user is theirs too, as a separate row
+    assert index.add([_record("a", "Asha"), _record("c", "Cy")], vectors[[0, 2]], "bob") == 2
+
+    alice = index.search(np.array([0.0, 0.0, 1.0]), "alice", top_k=5)
+    assert sorted(cid for cid, _ in alice) == [0, 1]
+    bob = index.search(np.array([0.0, 0.0, 1.0]), "bob", top_k=5)
+    assert [r["name"] for r in index.get([cid for cid, _ in bob], "bob")] == ["Cy", "Asha"]
+    assert index.get([cid for cid, _ in bob], "alice") == []
+    assert index.search(np.array([1.0, 0.0, 0.0]), "mallory") == []
+
+
+def test_vectors_from_another_embedding_space_are_refused(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    vectors = np.eye(3, dtype=np.float32)
+    index.add([_record("a", "Asha")], vectors[:1], "alice", space="chunked/160/32")
+
+    with pytest.raises(ValueError):
+        index.add([_record("b", "Bo")], vectors[1:2], "alice", space="whole")
+    with pytest.raises(ValueError):
+        index.search(vectors[0], "alice", space="whole")
+    assert [cid for cid, _ in index.search(vectors[0], "alice", space="chunked/160/32")] == [0]
+
+
+def test_search_can_be_limited_to_the_newest_rows(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    index.add([_record(h, h) for h in "abcd"], np.eye(4, dtype=np.float32), "alice")
+
+    query = np.array([1.0, 0.5, 0.2, 0.1])
+    assert [cid for cid, _ in index.search(query, "alice", top_k=4)] == [0, 1, 2, 3]
+    assert [cid for cid, _ in index.search(query, "alice", top_k=4, max_rows=2)] == [2, 3]
+
+
+def test_pool_search_shortlist_and_scan_are_bounded(monkeypatch):
+    import screening
+
+    calls = []
+
+    class Index:
+        def search(self, query, owner, top_k, space=None, max_rows=None):
+            calls.append((top_k, max_rows))
+            return []
+
+        def get(self, ids, owner):
+            return []
+
+    monkeypatch.setattr(screening, "candidate_index", Index())
+    monkeypatch.setattr(screening, "embed_documents", lambda texts: np.ones((len(texts), 3), dtype=np.float32))
+    screening.search_candidate_pool("Python developer", "alice", top_k=10)
+    screening.search_candidate_pool("Python developer", "alice", top_k=500)
+    assert calls == [(10 * screening.POOL_SHORTLIST_FACTOR, screening.POOL_MAX_SCAN_ROWS),
+                     (screening.POOL_MAX_SHORTLIST, screening.POOL_MAX_SCAN_ROWS)]
@@ -0,0 +1,58 @@
+# test_chunking.py
+import numpy as np
+import pytest
+
+import matcher
+from embedding_cache import EmbeddingCache
+
+
+def test_short_text_is_one_chunk_and_long_sections_are_split():
+    short = "JOHN DOE\njohn@example.com\nSKILLS\nPython, SQL"
+    assert matcher.chunk_text(short) == [" ".join(short.split())]
+
+    experience = " ".join(f"word{i}" for i in range(100))
+    text = f"SUMMARY\n{'intro ' * 30}\nEXPERIENCE\n{experience}\nEducation:\nB.Tech"
+    chunks = matcher.chunk_text(text, max_words=40, overlap=10)
+    assert all(len(c.split()) <= 40 for c in chunks)
+    assert chunks[0].startswith("SUMMARY") and chunks[1].startswith("EXPERIENCE")
+    assert chunks[-1].endswith("Education: B.Tech")
+    assert chunks[1].split()[-10:] == chunks[2].split()[:10]
+    assert matcher.chunk_text("") == [""]
+
+
+@pytest.mark.parametrize("pooling", ["max", "mean", "top-n"])
+def test_pooling_matches_a_per_document_loop(pooling):
+    rng = np.random.default_rng(0)
+    counts = np.array([1, 4, 2, 5])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    similarity = rng.random((3, counts.sum()))
+
+    pooled = matcher.pool_similarities(similarity, offsets, counts, pooling, top_n=2)
+    for doc, (start, count) in enumerate(zip(offsets, counts)):
+        part = similarity[:, start:start + count]
+        expected = {"max": part.max(axis=1), "mean": part.mean(axis=1),
+                    "top-n": np.sort(part, axis=1)[:, ::-1][:, :2].mean(axis=1)}[pooling]
+        assert np.allclose(pooled[:, doc], expected)
+
+
+def test_all_chunks_are_encoded_in_one_batch(tmp_path, monkeypatch):
+    calls = []
+
+    class Model:
+        def encode(self, batch, **kwargs):
+            calls.append(list(batch))
+            return np.array([[len(t), t.count("python") + 1.0, 1.0] for t in batch], dtype=np.float32)
+
+    monkeypatch.setattr(matcher, "EMBED_MODE", "chunked")
+    monkeypatch.setattr(matcher, "CHUNK_WORDS", 20)
+    monkeypatch.setattr(matcher, "get_model", lambda: Model())
+    monkeypatch.setattr(matcher, "embedding_cache", EmbeddingCache("test-model", str(tmp_path)))
+    texts = ["SKILLS\n" + "python " * 50, "short resume", "EXPERIENCE\n" + "java " * 30]
+
+    vectors = matcher.embed_documents(texts)
+    assert len(calls) == 1 and len(calls[0]) > len(texts)
+    assert vectors.shape == (3, 3) and np.allclose(np.linalg.norm(vectors, axis=1), 1)
+
+    scores = matcher.match_jobs_to_candidates(["python developer"], texts)
+    assert scores.shape == (1, 3)
+    assert len(calls) == 2 and calls[1] == ["python developer"]  # resume chunks came from the cache
@@ -0,0 +1,62 @@
+# test_dedup.py
+from benchmarks.synthetic import resume_text
+from dedup import find_duplicates
+
+
+def test_exact_and_reformatted_copies_collapse_into_the_first():
+    original = resume_text(1)
+    reflowed = original.replace("\n", "  \n\n").replace("SUMMARY", "Summary") + "\nReferences on request."
+    texts = [original, resume_text(2), reflowed, original]
+    assert find_duplicates(texts) == {2: 0, 3: 0}
+
+
+def test_shared_contact_details_lower_the_bar():
+    original = resume_text(3)
+    lines = original.splitlines()
+    # Same person and contact line, but a newer version with half the experience rewritten
+    updated = "\n".join(lines[:10] + resume_text(30).splitlines()[10:14] + lines[13:])
+    assert find_duplicates([original, updated]) == {1: 0}
+    assert find_duplicates([original, updated], contact_threshold=1.0) == {}
+
+
+def test_distinct_resumes_and_failed_extractions_are_kept():
+    texts = [resume_text(i) for i in range(300)] + ["", "   "]
+    assert find_duplicates(texts) == {}
+
+
+def test_screening_keeps_the_earliest_upload_whatever_finishes_first(tmp_path, monkeypatch):
+    import numpy as np
+
+    import extraction_cache
+    import matcher
+    import screening
+    from embedding_cache import EmbeddingCache
+    from matcher import blend
+
+    class Model:
+        def encode(self, batch, **kwargs):
+            return np.array([[t.count(w) + 1.0 for w in ("python", "java", "sql", "docker")] for t in batch],
+                            dtype=np.float32)
+
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    monkeypatch.setattr(matcher, "get_model", lambda: Model())
+    monkeypatch.setattr(matcher, "embedding_cache", EmbeddingCache("test-model", str(tmp_path)))
+    monkeypatch.setattr(screening, "extract_names", lambda texts: ["Candidate"] * len(texts))
+    texts = [resume_text(0), resume_text(1), resume_text(0), resume_text(2), resume_text(1)]
+    files = [(f"r{i}.txt", text.encode()) for i, text in enumerate(texts)]
+    # Later uploads finish extracting first, as cache hits do
+    monkeypatch.setattr(screening, "iter_extracted", lambda files: reversed(list(enumerate(texts))))
+
+    rankings, scores, features = screening.screen_roles(["Python developer with SQL and Docker"], files)
+    ranked = rankings[0]
+    assert sorted(c["Index"] for c in ranked) == [0, 1, 3]
+    duplicates = {c["FileName"]: c.get("Duplicates") for c in ranked}
+    assert duplicates == {"r0.txt": ["r2.txt"], "r1.txt": ["r4.txt"], "r3.txt": None}
+    assert scores.shape == (1, 3)
+
+    role = features[0]
+    assert np.allclose(blend(role["similarity"], role["skill_score"], role["experience_score"]),
+                       [c["Score"] for c in ranked])
+    skills = np.unpackbits(role["skills"], axis=1, count=len(role["skill_names"])).astype(bool)
+    assert [sorted(role["skill_names"][row]) for row in skills] == [sorted(c["Skills"]) for c in ranked]
@@ -0,0 +1,34 @@
+# test_embedding_cache.py
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+
+def _fake_encoder(calls):
+    def encode(batch):
+        calls.append(list(batch))
+        return np.array([[len(t), 1.0] for t in batch], dtype=np.float32)
+    return encode
+
+
+def test_only_unseen_texts_are_encoded(tmp_path):
+    calls = []
+    cache = EmbeddingCache("test-model", str(tmp_path))
+    first = cache.encode(["Python  developer", "Java developer"], _fake_encoder(calls))
+    second = cache.encode(["Python developer", "Go developer"], _fake_encoder(calls))
+
+    assert calls == [["Python developer", "Java developer"], ["Go developer"]]
+    assert np.allclose(first[0], second[0])
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    calls = []
+    cache = EmbeddingCache("test-model", str(tmp_path), max_entries=2)
+    cache.encode(["a"], _fake_encoder(calls))
+    cache.encode(["bb"], _fake_encoder(calls))
+    cache.encode(["a"], _fake_encoder(calls))    # touch "a" so "bb" is the LRU entry
+    cache.encode(["ccc"], _fake_encoder(calls))  # evicts "bb"
+
+    reopened = EmbeddingCache("test-model", str(tmp_path), max_entries=2)
+    reopened.encode(["a", "bb"], _fake_encoder(calls))
+    assert calls[-1] == ["bb"]
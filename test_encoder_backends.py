@@ -0,0 +1,33 @@
+# test_encoder_backends.py
+import numpy as np
+import pytest
+
+import matcher
+
+
+def test_backend_names_are_validated_and_namespace_the_cache():
+    with pytest.raises(ValueError):
+        matcher.load_model("tensorrt")
+    assert matcher.cache_model_name("torch") == matcher.MODEL_NAME
+    assert len({matcher.cache_model_name(b) for b in matcher.ENCODER_BACKENDS}) == len(matcher.ENCODER_BACKENDS)
+    # The candidate pool refuses to mix vectors across these
+    assert len({matcher.embedding_space(b) for b in matcher.ENCODER_BACKENDS}) == len(matcher.ENCODER_BACKENDS)
+
+
+@pytest.mark.parametrize("backend", ["onnx", "onnx-int8", "torch-int8"])
+def test_backend_scores_stay_close_to_torch(backend):
+    pytest.importorskip("optimum.onnxruntime" if backend.startswith("onnx") else "torch")
+    texts = ["Senior Java developer, Spring Boot and Docker, 6 years",
+             "Data scientist with Python, pandas and machine learning",
+             "Looking for a backend engineer with Java, Spring and Docker experience"]
+    try:
+        reference = matcher.load_model("torch").encode(texts, convert_to_numpy=True)
+        candidate = matcher.load_model(backend).encode(texts, convert_to_numpy=True)
+    except OSError:
+        pytest.skip("model files are not available offline")
+
+    def similarity(vectors):
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[2] @ vectors[:2].T
+
+    assert np.abs(similarity(candidate) - similarity(reference)).max() < 0.03
@@ -0,0 +1,132 @@
+# test_exports.py
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+import result_store
+from app import app
+from matcher import blend, skill_matrix
+from reranking import role_features
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RESULTS_DB", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(result_store, "_local", type(result_store._local)())
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["logged_in"] = True
+        session["username"] = "alice"
+    return client
+
+
+def _save_run(title=None):
+    """Four candidates in stored rank order; by experience alone the order reverses."""
+    components = {
+        "similarity": np.array([[0.9, 0.8, 0.7, 0.6]], dtype=np.float32),
+        "skill_score": np.array([[0.9, 0.8, 0.7, 0.6]], dtype=np.float32),
+        "experience_score": np.array([[0.1, 0.2, 0.3, 0.4]], dtype=np.float32),
+        "experience": np.array([1, 2, 3, 4], dtype=np.float32),
+        "skills": skill_matrix([["Python"], ["Java"], ["Python", "Docker"], ["Docker"]]),
+    }
+    scores = blend(components["similarity"], components["skill_score"], components["experience_score"])[0]
+    candidates = [{"FileName": f"r{i}.pdf", "Score": float(scores[i]), "Skills": skills,
+                   "Suggestions": ["Add metrics"]}
+                  for i, skills in enumerate([["Python"], ["Java"], ["Python", "Docker"], ["Docker"]])]
+    return result_store.save_run("alice", "Python developer", candidates, run_id=f"run-{title or 'main'}",
+                                 title=title, features=role_features(components, 0, np.arange(4)))
+
+
+def _csv(response):
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_csv_export_keeps_rank_order_and_follows_rerank_params(client):
+    run_id = _save_run()
+
+    response = client.get(f"/download_csv?run={run_id}")
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == "attachment; filename=matching_results.csv"
+    rows = _csv(response)
+    assert [r["Rank"] for r in rows] == ["1", "2", "3", "4"]
+    assert [r["FileName"] for r in rows] == ["r0.pdf", "r1.pdf", "r2.pdf", "r3.pdf"]
+    assert "BestRole" not in rows[0] and rows[2]["Skills"] == "Python, Docker"
+
+    reranked = _csv(client.get(f"/download_csv?run={run_id}&w_sim=0&w_skill=0&w_exp=1"))
+    assert [r["FileName"] for r in reranked] == ["r3.pdf", "r2.pdf", "r1.pdf", "r0.pdf"]
+    assert reranked[0]["MatchScore"] == "0.4000"
+    filtered = _csv(client.get(f"/download_csv?run={run_id}&skills=docker&min_exp=1"))
+    assert [r["FileName"] for r in filtered] == ["r2.pdf", "r3.pdf"]
+    assert client.get(f"/download_csv?run={run_id}&skills=dockr").status_code == 400
+
+
+def test_results_reject_unknown_must_have_skills(client):
+    run_id = _save_run()
+
+    response = client.get(f"/results?run={run_id}&skills=dockr", headers={"Accept": "application/json"})
+    assert response.status_code == 400
+    assert "dockr" in response.get_json()["error"]
+    response = client.get(f"/results?run={run_id}&min_exp=-1", headers={"Accept": "application/json"})
+    assert response.status_code == 400
+
+
+def test_best_role_runs_export_their_role_column(client):
+    rows = [{"FileName": "a.pdf", "Score": 0.8, "BestRole": "Backend", "Skills": ["Java"]},
+            {"FileName": "b.pdf", "Score": 0.6, "BestRole": "Frontend", "Skills": ["React"]}]
+    run_id = result_store.save_run("alice", "Roles: Backend, Frontend", rows, kind="best-role", run_id="job",
+                                   group_id="job", title="Best role per candidate")
+
+    response = client.get(f"/download_csv?run={run_id}")
+    assert response.headers["Content-Disposition"].endswith("filename=matching_results_Best_role_per_candidate.csv")
+    exported = _csv(response)
+    assert list(exported[0]) == ["Rank", "FileName", "MatchScore", "BestRole", "Skills", "Suggestions"]
+    assert [(r["FileName"], r["BestRole"]) for r in exported] == [("a.pdf", "Backend"), ("b.pdf", "Frontend")]
+
+    pa = pytest.importorskip("pyarrow.parquet")
+    table = pa.read_table(io.BytesIO(client.get(f"/download_parquet?run={run_id}").data))
+    assert table.column("BestRole").to_pylist() == ["Backend", "Frontend"]
+
+
+def test_jsonl_and_parquet_exports_follow_rerank_params(client):
+    run_id = _save_run(title="Backend Engineer")
+
+    response = client.get(f"/download_jsonl?run={run_id}&w_sim=0&w_skill=0&w_exp=1")
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Content-Disposition"].endswith("filename=matching_results_Backend_Engineer.jsonl")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(c["Rank"], c["FileName"]) for c in lines] == [(1, "r3.pdf"), (2, "r2.pdf"), (3, "r1.pdf"), (4, "r0.pdf")]
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get(f"/download_parquet?run={run_id}&skills=python")
+    assert response.mimetype == "application/vnd.apache.parquet"
+    table = pq.read_table(io.BytesIO(response.data))
+    assert table.column("FileName").to_pylist() == ["r0.pdf", "r2.pdf"]
+    assert table.column("Rank").to_pylist() == [1, 2]
+
+
+def test_pdf_export_and_other_users_runs(client):
+    run_id = _save_run()
+    pytest.importorskip("reportlab")
+    response = client.get(f"/export_pdf?run={run_id}")
+    assert response.mimetype == "application/pdf" and response.data.startswith(b"%PDF")
+    assert "matching_results.pdf" in response.headers["Content-Disposition"]
+
+    other = result_store.save_run("bob", "jd", [{"FileName": "secret.pdf", "Score": 0.9}])
+    for route in ("/download_csv", "/download_jsonl", "/download_parquet", "/export_pdf"):
+        response = client.get(f"{route}?run={other}")
+        assert response.status_code == 302 and b"secret.pdf" not in response.data
+
+
+def test_pdf_export_stops_at_its_row_cap(client, monkeypatch):
+    pytest.importorskip("reportlab")
+    import app as web
+    from text_extraction import extract_pdf_text
+
+    monkeypatch.setattr(web, "PDF_EXPORT_MAX_ROWS", 2)
+    run_id = _save_run()
+    text = extract_pdf_text(client.get(f"/export_pdf?run={run_id}").data)
+    assert "r1.pdf" in text and "r2.pdf" not in text
+    assert "top 2 candidates" in text
@@ -0,0 +1,59 @@
+# test_extraction_cache.py
+import extraction_cache
+import text_extraction
+
+
+def test_repeat_files_skip_extraction(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    files = [("a.txt", b"Asha Rao\nPython"), ("b.txt", b"Bo Li\nJava")]
+
+    first = dict(text_extraction.iter_extracted(files))
+    monkeypatch.setattr(text_extraction, "extract_text", lambda *a: "re-extracted")
+    second = dict(text_extraction.iter_extracted(files))
+
+    assert first == second == {0: "Asha Rao\nPython", 1: "Bo Li\nJava"}
+
+
+def test_version_bump_invalidates(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    extraction_cache.put_parsed([("h", {"name": "Asha"})], "1")
+
+    assert extraction_cache.get_parsed(["h"], "1") == {"h": {"name": "Asha"}}
+    assert extraction_cache.get_parsed(["h"], "2") == {}
+
+
+def test_failed_extractions_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    files = [("scan.pdf", b"%PDF-1.4 not really")]
+
+    monkeypatch.setattr(text_extraction, "extract_text", lambda *a: "  ")
+    assert dict(text_extraction.iter_extracted(files)) == {0: "  "}
+    monkeypatch.setattr(text_extraction, "extract_text", lambda *a: "Asha Rao")
+    assert dict(text_extraction.iter_extracted(files)) == {0: "Asha Rao"}
+
+
+def test_same_bytes_under_another_extension_are_extracted_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    monkeypatch.setattr(text_extraction, "extract_text", lambda source, name: f"read as {name[-3:]}")
+    data = b"Asha Rao\nPython"
+
+    assert dict(text_extraction.iter_extracted([("cv.txt", data)])) == {0: "read as txt"}
+    assert dict(text_extraction.iter_extracted([("cv.pdf", data)])) == {0: "read as pdf"}
+    assert dict(text_extraction.iter_extracted([("other.PDF", data), ("cv.txt", data)])) == {
+        0: "read as pdf", 1: "read as txt"}
+
+
+def test_lookups_are_batched(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_local", type(extraction_cache._local)())
+    calls = []
+    get_texts = extraction_cache.get_texts
+    monkeypatch.setattr(extraction_cache, "get_texts", lambda keys, v: calls.append(list(keys)) or get_texts(keys, v))
+    files = [(f"r{i}.txt", f"resume {i}".encode()) for i in range(40)]
+
+    assert len(dict(text_extraction.iter_extracted(files, workers=1))) == 40
+    assert [len(keys) for keys in calls] == [text_extraction.CACHE_WRITE_BATCH, 40 - text_extraction.CACHE_WRITE_BATCH]
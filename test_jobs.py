@@ -0,0 +1,119 @@
+# test_jobs.py
+import io
+import time
+
+import pytest
+
+import app as web
+import jobs
+import result_store
+from app import app
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(jobs, "_local", type(jobs._local)())
+    monkeypatch.setattr(result_store, "RESULTS_DB", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(result_store, "_local", type(result_store._local)())
+
+    def screen_roles(jd_texts, resume_files, on_file_done=None, on_stage=None, owner=None):
+        on_stage("matching")
+        ranked = []
+        for idx, (name, _) in enumerate(resume_files):
+            on_file_done(idx)
+            ranked.append({"FileName": name, "Index": idx, "Score": 1 - idx / 10})
+        return [ranked for _ in jd_texts], None, [None for _ in jd_texts]
+
+    monkeypatch.setattr(jobs, "screen_roles", screen_roles)
+    return jobs
+
+
+def _wait(job_id):
+    for _ in range(200):
+        job = jobs.get_job(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def _client(username):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["logged_in"] = True
+        session["username"] = username
+    return client
+
+
+def test_job_runs_and_saves_results_under_its_id(store):
+    job_id = store.submit_job("alice", "Python developer", [("a.txt", b"a"), ("b.txt", b"b")])
+
+    job = _wait(job_id)
+    assert (job["owner"], job["status"], job["stage"], job["total"], job["done"]) == ("alice", "done", "done", 2, 2)
+    assert [f["status"] for f in store.get_job_files(job_id)] == ["done", "done"]
+    assert [c["FileName"] for c in result_store.iter_results(job_id)] == ["a.txt", "b.txt"]
+
+
+def test_only_the_owner_sees_a_job(store):
+    job_id = store.submit_job("alice", "Python developer", [("a.txt", b"a")])
+    _wait(job_id)
+
+    status = _client("alice").get(f"/jobs/{job_id}/status").get_json()
+    assert status["status"] == "done" and status["results_url"].endswith(f"/jobs/{job_id}/results")
+    results = _client("alice").get(f"/jobs/{job_id}/results", headers={"Accept": "application/json"})
+    assert [c["FileName"] for c in results.get_json()["candidates"]] == ["a.txt"]
+    for path in ("", "/status", "/results"):
+        assert _client("mallory").get(f"/jobs/{job_id}{path}").status_code == 404
+
+
+def test_jobs_without_a_heartbeat_fail_and_old_jobs_are_purged(store):
+    db = store._db()
+    now = time.time()
+    for job_id, status, age in [("stale", "running", 600), ("old", "done", store.JOB_TTL + 60)]:
+        db.execute("INSERT INTO jobs (id, owner, status, total, created_at, updated_at) VALUES (?, 'alice', ?, 1, ?, ?)",
+                   (job_id, status, now - age, now - age))
+        db.execute("INSERT INTO job_files VALUES (?, 0, 'a.txt', 'queued')", (job_id,))
+    db.commit()
+
+    stale = store.get_job("stale")
+    assert stale["status"] == "failed" and "interrupted" in stale["error"]
+    assert store.purge_expired() == 1
+    assert store.get_job("old") is None and store.get_job_files("old") == []
+    assert store.get_job_files("stale") != []
+
+
+def test_uploads_are_spooled_to_disk_and_capped(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(web, "SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr(web, "MAX_RESUME_TOTAL_BYTES", 10)
+    files = [(io.BytesIO(b"Asha"), "a.txt"), (io.BytesIO(b"Bo Li"), "b.txt"), (io.BytesIO(b"Cy Ray"), "c.txt")]
+    response = _client("alice").post("/upload", data={"jd_text": "Python", "resume_files": files},
+                                     headers={"Accept": "application/json"})
+
+    job = _wait(response.get_json()["job_id"])
+    assert [f["filename"] for f in store.get_job_files(job["id"])] == ["a.txt", "b.txt"]
+    for _ in range(100):  # removed right after the job finishes
+        if not list((tmp_path / "spool").iterdir()):
+            break
+        time.sleep(0.01)
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_oversized_requests_are_refused(store, monkeypatch):
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024)
+    data = {"jd_text": "Python", "resume_files": [(io.BytesIO(b"x" * 4096), "a.txt")]}
+    response = _client("alice").post("/upload", data=data)
+    assert response.status_code == 302 and response.location.endswith("/dashboard")
+
+
+def test_upload_needs_a_jd_and_keeps_role_titles_unique(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(web, "SPOOL_DIR", str(tmp_path / "spool"))
+    response = _client("alice").post("/upload", data={"resume_files": [(io.BytesIO(b"Asha"), "a.txt")]})
+    assert response.status_code == 302 and response.location.endswith("/dashboard")
+
+    jds = [(io.BytesIO(b"Python"), "cv.txt"), (io.BytesIO(b"Java"), "cv.txt"), (io.BytesIO(b"Go"), "cv (2).txt")]
+    data = {"jd_file": jds, "resume_files": [(io.BytesIO(b"Asha"), "a.txt")]}
+    response = _client("alice").post("/upload", data=data, headers={"Accept": "application/json"})
+    job = _wait(response.get_json()["job_id"])
+    titles = [r["title"] for r in result_store.get_group_runs(job["id"])]
+    assert titles == [jobs.BEST_ROLE_TITLE, "cv", "cv (2)", "cv (2) (2)"]
@@ -0,0 +1,51 @@
+# test_metrics.py
+import pickle
+
+import metrics
+from text_extraction import iter_extracted
+
+
+def test_counters_and_histograms_render_as_prometheus_text():
+    metrics.reset()
+    metrics.inc("thinkhire_files_total", format="pdf")
+    metrics.inc("thinkhire_files_total", 2, format="pdf")
+    metrics.observe(metrics.STAGE_METRIC, 0.02, stage="extract")
+    metrics.observe(metrics.STAGE_METRIC, 120, stage="extract")
+
+    text = metrics.render_prometheus()
+    assert "# TYPE thinkhire_files_total counter" in text
+    assert 'thinkhire_files_total{format="pdf"} 3\n' in text
+    assert "# TYPE thinkhire_stage_seconds histogram" in text
+    assert 'thinkhire_stage_seconds_bucket{stage="extract",le="0.01"} 0' in text
+    assert 'thinkhire_stage_seconds_bucket{stage="extract",le="0.025"} 1' in text
+    assert 'thinkhire_stage_seconds_bucket{stage="extract",le="+Inf"} 2' in text
+    assert 'thinkhire_stage_seconds_count{stage="extract"} 2' in text
+
+
+def test_captured_metrics_survive_pickling_and_merge_into_the_breakdown():
+    metrics.reset()
+    with metrics.capture() as captured:
+        metrics.inc("thinkhire_bytes_total", 10)
+        with metrics.timed("extract"):
+            pass
+    assert "thinkhire_bytes_total" not in metrics.render_prometheus()
+
+    with metrics.breakdown("job") as current:
+        metrics.merge(pickle.loads(pickle.dumps(captured)), file="a.pdf")
+        with metrics.timed("score"):
+            pass
+    assert set(current.stages) == {"extract", "score"}
+    assert set(current.files["a.pdf"]) == {"extract"}
+    assert "thinkhire_bytes_total 10" in metrics.render_prometheus()
+    assert "a.pdf" in current.summary()
+
+
+def test_extraction_reports_files_and_stage_times():
+    metrics.reset()
+    files = [("a.txt", b"Python developer"), ("b.txt", b"Java developer")]
+    with metrics.breakdown("upload") as current:
+        assert sorted(iter_extracted(files, use_cache=False)) == [(0, "Python developer"), (1, "Java developer")]
+    assert set(current.files) == {"a.txt", "b.txt"}
+    text = metrics.render_prometheus()
+    assert 'thinkhire_files_total{format="txt"} 2' in text
+    assert "thinkhire_bytes_total 30" in text
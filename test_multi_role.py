@@ -0,0 +1,17 @@
+# test_multi_role.py
+import numpy as np
+
+from screening import best_roles
+
+
+def test_best_role_view_picks_each_candidates_top_role():
+    scores = np.array([[0.9, 0.2, 0.5],
+                       [0.4, 0.7, 0.6]], dtype=np.float32)
+    candidates = [{"FileName": f"r{i}.pdf", "Index": i} for i in range(3)]
+    rankings = [[dict(candidates[i], Score=float(row[i])) for i in np.argsort(-row)] for row in scores]
+
+    rows = best_roles(rankings, ["Backend", "Frontend"])
+    assert [(r["FileName"], r["BestRole"]) for r in rows] == [
+        ("r0.pdf", "Backend"), ("r1.pdf", "Frontend"), ("r2.pdf", "Frontend")]
+    assert rows[2]["Score"] == np.float32(0.6)
+    assert rows[0]["RoleScores"] == {"Backend": np.float32(0.9), "Frontend": np.float32(0.4)}
@@ -0,0 +1,18 @@
+# test_parallel_extraction.py
+import text_extraction
+
+
+def test_pools_never_fork_the_threaded_parent(monkeypatch):
+    contexts = []
+    real_pool = text_extraction.ProcessPoolExecutor
+
+    def pool(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(text_extraction, "ProcessPoolExecutor", pool)
+    files = [(f"r{i}.txt", f"resume {i}".encode()) for i in range(text_extraction.PARALLEL_MIN_FILES)]
+    assert dict(text_extraction.iter_extracted(files, workers=2, use_cache=False)) == {
+        i: f"resume {i}" for i in range(len(files))}
+    assert [c.get_start_method() for c in contexts] == [text_extraction.POOL_CONTEXT.get_start_method()]
+    assert text_extraction.POOL_CONTEXT.get_start_method() != "fork"
@@ -0,0 +1,86 @@
+# test_pdf_extraction.py
+import os
+
+import pytest
+
+import text_extraction
+from text_extraction import PDF_BACKENDS, extract_pdf_text, extract_text, pdf_text_quality
+
+RESUME_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume.pdf")
+
+
+def test_quality_flags_garbled_text():
+    clean = "Senior Python developer with 5 years of Flask and SQL experience, based in Pune."
+    assert pdf_text_quality(clean) > 0.95
+    assert pdf_text_quality(" ".join(clean)) < 0.5
+    assert pdf_text_quality("") == 0.0
+
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS + ("auto",))
+def test_every_backend_reads_the_sample_resume(backend):
+    with open(RESUME_PDF, "rb") as f:
+        data = f.read()
+    text = extract_pdf_text(data, backend=backend)
+    assert "Kiran" in text or "KIRAN" in text
+    assert text == extract_pdf_text(RESUME_PDF, backend=backend)
+
+
+def test_max_pages_and_page_parallel_match_serial(monkeypatch):
+    pytest.importorskip("reportlab")
+    from benchmarks.synthetic import synthetic_pdf
+
+    monkeypatch.setattr(text_extraction, "EXTRACT_WORKERS", 2)
+    data = synthetic_pdf(5, seed=3)
+    serial = extract_pdf_text(data, backend="pypdf", parallel=False)
+    assert extract_pdf_text(data, backend="pypdf", parallel=True) == serial
+    first_two = extract_pdf_text(data, backend="pypdf", max_pages=2, parallel=False)
+    assert serial.startswith(first_two) and len(first_two) < len(serial)
+
+
+def test_page_parallel_splits_pages_across_forced_workers(monkeypatch):
+    pytest.importorskip("reportlab")
+    from benchmarks.synthetic import synthetic_pdf
+
+    # The default is one worker per core, which is 1 on small CI hosts
+    monkeypatch.setattr(text_extraction, "EXTRACT_WORKERS", 2)
+    ranges = []
+    real_range = text_extraction._pdf_page_range
+
+    class InlinePool:
+        def __init__(self, max_workers, mp_context):
+            assert max_workers == 2
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, tasks):
+            ranges.extend((start, stop) for _, _, start, stop in tasks)
+            return map(real_range, tasks)
+
+    data = synthetic_pdf(5, seed=3)
+    serial = extract_pdf_text(data, backend="pypdf", parallel=False)
+    monkeypatch.setattr(text_extraction, "ProcessPoolExecutor", InlinePool)
+    assert extract_pdf_text(data, backend="pypdf", parallel=True) == serial
+    assert len(ranges) == 2 and ranges[0][0] == 0 and ranges[0][1] == ranges[1][0]
+
+
+def test_long_pdfs_stay_in_process_unless_enabled(monkeypatch):
+    pytest.importorskip("reportlab")
+    from benchmarks.synthetic import synthetic_pdf
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("page-parallel extraction started a process pool")
+
+    monkeypatch.setattr(text_extraction, "EXTRACT_WORKERS", 4)
+    monkeypatch.setattr(text_extraction, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(text_extraction, "ProcessPoolExecutor", no_pool)
+    assert extract_pdf_text(synthetic_pdf(3, seed=1), backend="pypdf")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        extract_pdf_text(RESUME_PDF, backend="ocr")
+    assert extract_text(RESUME_PDF)
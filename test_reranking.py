@@ -0,0 +1,71 @@
+# test_reranking.py
+import numpy as np
+import pytest
+
+import result_store
+from matcher import blend, skill_matrix
+from reranking import rerank, role_features, unknown_skills
+
+
+def _components(count, seed=0):
+    rng = np.random.default_rng(seed)
+    skills = [["Python", "Docker"], ["Java"], ["Python"], ["React", "Docker"]] * (count // 4)
+    return {
+        "similarity": rng.random((1, count), dtype=np.float32),
+        "skill_score": rng.random((1, count), dtype=np.float32),
+        "experience_score": rng.random((1, count), dtype=np.float32),
+        "experience": rng.integers(0, 10, count).astype(np.float32),
+        "skills": skill_matrix(skills),
+    }
+
+
+def test_default_weights_reproduce_the_stored_ranking():
+    components = _components(40)
+    scores = blend(components["similarity"], components["skill_score"], components["experience_score"])[0]
+    order = np.argsort(-scores, kind="stable")
+    features = role_features(components, 0, order)
+
+    positions, new_scores = rerank(features)
+    assert positions.tolist() == list(range(40))
+    assert np.allclose(new_scores, scores[order])
+
+
+def test_filters_and_weights():
+    components = _components(8)
+    features = role_features(components, 0, np.arange(8))
+
+    positions, _ = rerank(features, must_have=["python", "docker"], min_experience=0)
+    assert positions.tolist() == [0, 4]
+    positions, scores = rerank(features, weights=(0, 0, 2), min_experience=5)
+    assert (features["experience"][positions] >= 5).all()
+    assert np.allclose(scores, features["experience_score"][positions])
+    assert unknown_skills(features, ["Python", "Cobol"]) == ["Cobol"]
+    with pytest.raises(ValueError):
+        rerank(features, weights=(-1, 0, 0))
+    with pytest.raises(ValueError):
+        rerank(features, min_experience=-1)
+
+
+def test_must_have_resolves_aliases_and_rejects_unknown_skills():
+    components = _components(8)
+    components["skills"] = skill_matrix([["JavaScript"], ["Python"]] * 4)
+    features = role_features(components, 0, np.arange(8))
+
+    positions, _ = rerank(features, must_have=["js"])
+    assert positions.tolist() == [0, 2, 4, 6]
+    assert unknown_skills(features, ["JS", "Pyhton"]) == ["Pyhton"]
+    with pytest.raises(ValueError, match="Pyhton"):
+        rerank(features, must_have=["Python", "Pyhton"])
+
+
+def test_reranking_a_stored_run_pages_in_the_new_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RESULTS_DB", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(result_store, "_local", type(result_store._local)())
+    components = _components(1000)
+    candidates = [{"FileName": f"r{i}.pdf", "Score": 0.0} for i in range(1000)]
+    run_id = result_store.save_run("admin", "jd", candidates, features=role_features(components, 0, np.arange(1000)))
+
+    # Timed by ``python -m benchmarks.run --only rerank``
+    positions, _ = rerank(result_store.get_features(run_id), weights=(0.2, 0.6, 0.2), must_have=["Docker"])
+    page = result_store.get_results_at(run_id, positions[:50])
+    assert [c["FileName"] for c in page] == [f"r{p}.pdf" for p in positions[:50]]
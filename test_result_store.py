@@ -0,0 +1,45 @@
+# test_result_store.py
+import pytest
+
+import result_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RESULTS_DB", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(result_store, "_local", type(result_store._local)())
+    return result_store
+
+
+def test_runs_are_paginated_and_iterated_in_rank_order(store):
+    candidates = [{"FileName": f"r{i}.pdf", "Score": 1 - i / 100} for i in range(25)]
+    run_id = store.save_run("admin", "Python developer", candidates)
+
+    run = store.get_run(run_id)
+    assert (run["owner"], run["total"], run["jd_text"]) == ("admin", 25, "Python developer")
+    assert [c["FileName"] for c in store.get_results(run_id, 10, 3)] == ["r10.pdf", "r11.pdf", "r12.pdf"]
+    assert list(store.iter_results(run_id, batch=7)) == candidates
+
+
+def test_expired_runs_are_hidden_and_purged(store, monkeypatch):
+    monkeypatch.setattr(store, "RESULT_TTL", -1)
+    old = store.save_run("admin", "", [{"FileName": "a.pdf"}])
+    assert store.get_run(old) is None
+
+    monkeypatch.setattr(store, "RESULT_TTL", 3600)
+    fresh = store.save_run("admin", "", [{"FileName": "b.pdf"}])
+    assert store.get_results(old) == []
+    assert store.get_results(fresh) == [{"FileName": "b.pdf"}]
+
+
+def test_role_runs_are_grouped_in_save_order(store):
+    store.save_run("admin", "Roles: A, B", [{"FileName": "x.pdf"}], kind="best-role", run_id="job",
+                   group_id="job", title="Best role per candidate")
+    for number, title in enumerate(["A", "B"], start=1):
+        store.save_run("admin", f"{title} JD", [], run_id=f"job-{number}", group_id="job", title=title)
+    store.save_run("admin", "other", [])
+
+    runs = store.get_group_runs("job")
+    assert [(r["id"], r["kind"], r["title"]) for r in runs] == [
+        ("job", "best-role", "Best role per candidate"), ("job-1", "upload", "A"), ("job-2", "upload", "B")]
+    assert store.get_run("job-2")["group_id"] == "job"
@@ -0,0 +1,72 @@
+# test_resume_parser.py
+import glob
+import re
+
+import resume_parser
+from resume_parser import _find_institution, parse_resume, parse_resumes
+
+ORIGINAL_INSTITUTION_RE = re.compile(
+    r"([A-Za-z0-9 &\.\-]+(?:University|College|Institute|School|IIT|NIT|IIIT|IIM|BITS|VIT|PES|SRM|COEP)[A-Za-z0-9 &\.\-]*)",
+    re.I,
+)
+
+
+def _corpus():
+    texts = []
+    for path in glob.glob("uploads/**/*.txt", recursive=True):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+    return texts
+
+
+def test_institution_matches_original_pattern():
+    lines = [
+        "B.Tech in Computer Science, XYZ University (2015 - 2019)",
+        "Schooling: St. Mary's School, Pune",
+        "IIT Bombay",
+        "NITK Surathkal & BITS Pilani",
+        "Worked at Acme Corp",
+    ]
+    for text in _corpus():
+        lines.extend(text.splitlines())
+    for line in lines:
+        m = ORIGINAL_INSTITUTION_RE.search(line)
+        assert _find_institution(line) == (m.group(0) if m else None)
+
+
+def test_batch_parse_matches_single_parse():
+    texts = [t for t in _corpus() if parse_resume(t, ner_fallback=False)["name"]]
+    assert parse_resumes(texts) == [parse_resume(t) for t in texts]
+
+
+def test_names_missing_from_the_header_come_from_one_ner_batch(monkeypatch):
+    class Ent:
+        label_ = "PERSON"
+
+        def __init__(self, text):
+            self.text = text
+
+    class Doc:
+        def __init__(self, text):
+            self.ents = [Ent(text.split(" wrote")[0])] if " wrote" in text else []
+
+    class Nlp:
+        batches = []
+
+        def __call__(self, text):
+            return Doc(text)
+
+        def pipe(self, texts, **kwargs):
+            texts = list(texts)
+            self.batches.append(texts)
+            return [Doc(t) for t in texts]
+
+    monkeypatch.setattr(resume_parser, "_nlp", Nlp())
+    texts = ["Asha Rao wrote backend services in Python for years\nasha@example.com",
+             "JOHN DOE\njohn@example.com",
+             "experienced engineer with cloud skills\nno name here"]
+
+    parsed = parse_resumes(texts)
+    assert [info["name"] for info in parsed] == ["Asha Rao", "JOHN DOE", "Not Found"]
+    assert len(Nlp.batches) == 1 and len(Nlp.batches[0]) == 2
+    assert parsed == [parse_resume(t) for t in texts]
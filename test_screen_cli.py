@@ -0,0 +1,37 @@
+# test_screen_cli.py
+import json
+import zipfile
+
+from screen_cli import iter_resume_files, load_finished
+
+
+def test_directories_and_zips_get_stable_unique_names(tmp_path):
+    (tmp_path / "batch" / "2019").mkdir(parents=True)
+    (tmp_path / "batch" / "2019" / "asha.txt").write_text("Asha")
+    (tmp_path / "batch" / "notes.md").write_text("skip")
+    with zipfile.ZipFile(tmp_path / "old.zip", "w") as z:
+        z.writestr("a/bo.txt", "Bo")
+        z.writestr("b/bo.txt", "Bo again")
+
+    names = [name for name, _ in iter_resume_files([str(tmp_path / "batch"), str(tmp_path / "old.zip")])]
+    assert names == ["batch/2019/asha.txt", "old.zip/bo.txt", "old.zip/bo.txt#2"]
+
+
+def test_same_named_files_in_different_inputs_are_kept_apart(tmp_path):
+    for folder in ("june", "july", "other/june"):
+        (tmp_path / folder).mkdir(parents=True)
+        (tmp_path / folder / "cv.txt").write_text(folder)
+    inputs = [str(tmp_path / f) for f in ("june", "july", "other/june", "june/cv.txt", "july/cv.txt")]
+
+    names = [name for name, _ in iter_resume_files(inputs)]
+    assert names == ["june/cv.txt", "july/cv.txt", "june/cv.txt#2", "cv.txt", "cv.txt#2"]
+    # Resuming a run sees the same names again
+    assert [name for name, _ in iter_resume_files(inputs)] == names
+
+
+def test_resume_drops_a_half_written_line(tmp_path):
+    out = tmp_path / "results.jsonl"
+    out.write_text(json.dumps({"FileName": "a.pdf", "Score": 0.5}) + "\n" + '{"FileName": "b.p')
+
+    assert load_finished(str(out)) == {"a.pdf": 0.5}
+    assert out.read_text().endswith("}\n")
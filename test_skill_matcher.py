@@ -0,0 +1,57 @@
+# test_skill_matcher.py
+import glob
+import re
+from difflib import SequenceMatcher
+
+from skill_matcher import SKILL_NAMES, SkillMatcher, extract_skills
+
+
+def legacy_extract_skills(resume_text):
+    """The original O(tokens x skills) implementation, kept as the reference."""
+    resume_norm = re.sub(r"[\W_]+", " ", resume_text.lower())
+    resume_text_lower = resume_text.lower()
+    tokens = set(resume_norm.split())
+
+    found = []
+    for skill in SKILL_NAMES:
+        skill_lower = skill.lower()
+        skill_norm = re.sub(r"[\W_]+", " ", skill_lower).strip()
+        if skill_lower in resume_text_lower:
+            found.append(skill)
+            continue
+        if all(w in tokens for w in skill_norm.split()):
+            found.append(skill)
+            continue
+        for word in tokens:
+            if len(word) > 2 and len(skill_norm) > 2:
+                if SequenceMatcher(None, word, skill_norm).ratio() > 0.75:
+                    found.append(skill)
+                    break
+    return sorted(set(found))
+
+
+SAMPLES = [
+    "Skills: Pyhton, Javscript, Kubernets, Tablaeu",
+    "Built REST services in node js and deep-learning models; Power  BI dashboards",
+    "Experienced in Dockr, postgres and Mongo DB. Strong communicator and team player.",
+    "",
+]
+
+
+def test_matches_legacy_extractor_on_corpus():
+    # Without aliases the engine must reproduce the original rules exactly
+    matcher = SkillMatcher(SKILL_NAMES)
+    texts = list(SAMPLES)
+    for path in glob.glob("uploads/**/*.txt", recursive=True):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+
+    for text in texts:
+        assert matcher.find(text) == legacy_extract_skills(text)
+
+
+def test_aliases_match_whole_words_only():
+    assert "Node.js" in extract_skills("REST APIs in Node and Express")
+    assert "Express.js" in extract_skills("REST APIs in Node and Express")
+    assert "Kubernetes" in extract_skills("Deployed on k8s")
+    assert "Kubernetes" not in extract_skills("k8sx")
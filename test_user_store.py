@@ -0,0 +1,26 @@
+# test_user_store.py
+import json
+
+from user_store import UserStore
+
+
+def test_users_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "users.json"
+    legacy.write_text(json.dumps({"renu": {"full_name": "Renu", "email": "r@x.in", "password": "hash"}}))
+    store = UserStore(str(tmp_path / "users.sqlite3"), str(legacy))
+    assert store.get("renu")["email"] == "r@x.in"
+
+    legacy.write_text(json.dumps({"late": {"password": "hash"}}))
+    reopened = UserStore(str(tmp_path / "users.sqlite3"), str(legacy))
+    assert reopened.get("late") is None and reopened.get("renu") is not None
+
+
+def test_signups_are_unique_and_visible_across_workers(tmp_path):
+    path = str(tmp_path / "users.sqlite3")
+    worker_a = UserStore(path, str(tmp_path / "missing.json"))
+    worker_b = UserStore(path, str(tmp_path / "missing.json"))
+
+    assert worker_a.get("asha") is None  # cached miss
+    assert worker_b.create("asha", "Asha", "asha@x.in", "hash")
+    assert not worker_a.create("asha", "Other", "o@x.in", "hash2")
+    assert worker_a.get("asha")["full_name"] == "Asha"
@@ -0,0 +1,33 @@
+# test_zip_ingestion.py
+import io
+import zipfile
+
+import pytest
+
+from text_extraction import ZipLimitError, extract_text, iter_zip_members
+
+
+def _zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+def test_members_are_streamed_without_extraction():
+    archive = _zip({"batch/ANANYA.txt": "Ananya Sharma\nPython", "batch/notes.md": "skip", "batch/": ""})
+    members = list(iter_zip_members(archive, (".pdf", ".docx", ".txt")))
+
+    assert [name for name, _ in members] == ["ANANYA.txt"]
+    assert extract_text(members[0][1], members[0][0]).startswith("Ananya Sharma")
+
+
+def test_limits_are_enforced():
+    archive = _zip({"a.txt": "x" * 100, "b.txt": "y"})
+    with pytest.raises(ZipLimitError):
+        list(iter_zip_members(archive, (".txt",), max_member_bytes=50))
+    archive.seek(0)
+    with pytest.raises(ZipLimitError):
+        list(iter_zip_members(archive, (".txt",), max_members=1))
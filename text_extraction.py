@@ -0,0 +1,407 @@
+"""Text extraction for uploaded resumes and job descriptions.
+
+``extract_text`` handles a single PDF, DOCX or TXT file, from disk or from
+memory.  PDFs go through a pluggable backend (see ``extract_pdf_text``): by
+default the fast text-only reader is used and pdfplumber's layout-aware
+extraction only runs when the fast output looks garbled.
+``iter_zip_members`` streams resumes out of an archive without extracting
+it, and ``iter_extracted`` fans a batch of files out over a process pool and
+yields each text as soon as it is ready, so callers can start parsing before
+the whole batch is done.
+"""
+import io
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import docx2txt
+import pdfplumber
+
+import extraction_cache
+import metrics
+
+# File types extract_text understands
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Bump when extraction output changes so cached texts are re-extracted
+EXTRACTOR_VERSION = "2"
+
+# Worker processes for batch and page-parallel extraction.  Defaults to one per
+# core, so on a single-core host it is 1 and both run serially in-process.
+EXTRACT_WORKERS = int(os.environ.get("THINKHIRE_EXTRACT_WORKERS", "0")) or (os.cpu_count() or 1)
+# Files queued per worker before we wait for results (bounds memory on huge zips)
+MAX_PENDING_PER_WORKER = 4
+# Below this many files a pool costs more to start than it saves
+PARALLEL_MIN_FILES = 4
+# Newly extracted texts are written to the cache in batches of this size
+CACHE_WRITE_BATCH = 32
+# Pools are started from job threads next to the heartbeat and torch/BLAS threads;
+# forking such a process can deadlock on a lock another thread held, so workers
+# come from a fork server (or are spawned where there is none)
+POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+# Limits for uploaded archives, which are read in memory rather than extracted
+MAX_ZIP_MEMBERS = int(os.environ.get("THINKHIRE_MAX_ZIP_MEMBERS", "5000"))
+MAX_ZIP_MEMBER_BYTES = int(os.environ.get("THINKHIRE_MAX_ZIP_MEMBER_MB", "10")) * 1024 * 1024
+MAX_ZIP_TOTAL_BYTES = int(os.environ.get("THINKHIRE_MAX_ZIP_TOTAL_MB", "200")) * 1024 * 1024
+
+# PDF backend: "pypdf" (content-stream text only), "pdfplumber-fast" (pdfplumber
+# with simple line clustering), "pdfplumber" (full layout-aware text) or "auto"
+PDF_BACKEND = os.environ.get("THINKHIRE_PDF_BACKEND", "auto")
+PDF_BACKENDS = ("pypdf", "pdfplumber-fast", "pdfplumber")
+# Tried in order by "auto"; the first output meeting PDF_MIN_QUALITY wins
+PDF_AUTO_ORDER = ("pypdf", "pdfplumber")
+# Backend used when the chosen one cannot read a file at all
+PDF_FALLBACK = {"pypdf": "pdfplumber", "pdfplumber-fast": "pypdf", "pdfplumber": "pypdf"}
+PDF_MIN_QUALITY = float(os.environ.get("THINKHIRE_PDF_MIN_QUALITY", "0.85"))
+# Stop reading after this many pages (0 = whole document)
+PDF_MAX_PAGES = int(os.environ.get("THINKHIRE_PDF_MAX_PAGES", "0"))
+# Split long PDFs across processes.  Off by default: a web worker would start
+# a process pool per request; screen_cli and the benchmarks turn it on.
+PDF_PAGE_PARALLEL = False
+# Documents with at least this many pages are split across processes
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("THINKHIRE_PDF_PARALLEL_PAGES", "24"))
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+# ---------- PDF backends ----------
+def _pdf_reader_class():
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader
+
+
+def _pdf_page_texts(backend, source, start=0, stop=None):
+    """Text of pages ``start:stop`` of a PDF (path or bytes) with one backend."""
+    opened = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    if backend == "pypdf":
+        reader = _pdf_reader_class()(opened)
+        stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+    texts = []
+    with pdfplumber.open(opened) as pdf:
+        for page in pdf.pages[start:stop]:
+            if backend == "pdfplumber-fast":
+                texts.append(page.extract_text_simple() or "")
+            else:
+                texts.append(page.extract_text() or "")
+            # Drop the page's parsed objects; long documents otherwise hold them all
+            page.close()
+    return texts
+
+
+def _pdf_page_count(source):
+    # The text-only reader parses just the page tree, so counting is cheap
+    return len(_pdf_reader_class()(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source).pages)
+
+
+def _pdf_page_range(task):
+    """Pool task: text of one page range."""
+    backend, source, start, stop = task
+    return _pdf_page_texts(backend, source, start, stop)
+
+
+def _pdf_pages(backend, source, max_pages=0, parallel=None):
+    """Page texts, split across processes for long documents when ``PDF_PAGE_PARALLEL`` is set.
+
+    Pages are only fanned out from the main process: inside a batch
+    extraction worker the batch itself is already the unit of parallelism.
+    """
+    stop = max_pages or None
+    min_pages = 2 if parallel else PDF_PARALLEL_MIN_PAGES
+    if parallel is None:
+        parallel = PDF_PAGE_PARALLEL and EXTRACT_WORKERS > 1 and multiprocessing.parent_process() is None
+    if not parallel:
+        return _pdf_page_texts(backend, source, 0, stop)
+
+    count = _pdf_page_count(source)
+    if stop:
+        count = min(count, stop)
+    if count < min_pages:
+        return _pdf_page_texts(backend, source, 0, stop)
+    workers = min(EXTRACT_WORKERS, count)
+    step = -(-count // workers)
+    tasks = [(backend, source, start, min(start + step, count)) for start in range(0, count, step)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT) as pool:
+        return [text for chunk in pool.map(_pdf_page_range, tasks) for text in chunk]
+
+
+def pdf_text_quality(text):
+    """Share of tokens that look like words, from 0 to 1.
+
+    Fast extractors fail by gluing words together ("SeniorPythonDeveloper")
+    or by spacing out letters ("P y t h o n"); both drag this ratio down.
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    good = 0
+    for token in tokens:
+        if len(token) == 1:
+            good += not token.isalpha() or token in "aAI"
+        elif len(token) <= 30 or "@" in token or "/" in token:
+            good += 1
+    return good / len(tokens)
+
+
+def extract_pdf_text(source, backend=None, max_pages=None, parallel=None):
+    """Extracts the text of a PDF given as a path or bytes.
+
+    ``backend`` is one of ``PDF_BACKENDS`` or "auto" (the default, from
+    ``THINKHIRE_PDF_BACKEND``), which returns the first output in
+    ``PDF_AUTO_ORDER`` whose ``pdf_text_quality`` meets ``PDF_MIN_QUALITY``.
+    ``max_pages`` stops after that many pages; ``parallel`` forces page-parallel
+    extraction on or off (default: ``PDF_PAGE_PARALLEL``).
+    """
+    backend = backend or PDF_BACKEND
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    if backend == "auto":
+        order = PDF_AUTO_ORDER
+    elif backend in PDF_FALLBACK:
+        order = (backend, PDF_FALLBACK[backend])
+    else:
+        raise ValueError(f"unknown PDF backend '{backend}'")
+
+    text, error = None, None
+    for name in order:
+        try:
+            pages = _pdf_pages(name, source, max_pages, parallel)
+        except Exception as exc:
+            error = exc
+            continue
+        metrics.inc("thinkhire_pdf_pages_total", len(pages), backend=name)
+        text = "\n".join(pages)
+        if backend != "auto" or pdf_text_quality(text) >= PDF_MIN_QUALITY:
+            return text
+    if text is None:
+        raise error
+    return text
+
+
+def extract_text(source, filename=None):
+    """Extracts text content from PDF, DOCX, or TXT files.
+
+    ``source`` is a file path, or the file's bytes together with its
+    ``filename`` (used to pick the format), e.g. a zip member read in memory.
+    """
+    in_memory = isinstance(source, (bytes, bytearray))
+    name = (filename or ("" if in_memory else source)).lower()
+    opened = io.BytesIO(source) if in_memory else source
+
+    text = ""
+    if name.endswith(".pdf"):
+        text = extract_pdf_text(source)
+    elif name.endswith(".docx"):
+        # Some .docx files are not valid zip archives (corrupted or misnamed).
+        # Check first to avoid docx2txt raising BadZipFile.
+        try:
+            if zipfile.is_zipfile(opened):
+                try:
+                    text = docx2txt.process(io.BytesIO(source) if in_memory else source) or ""
+                except Exception:
+                    # If docx2txt fails for any reason, fallback to best-effort decode
+                    try:
+                        text = _read_bytes(source).decode("utf-8", errors="ignore")
+                    except Exception:
+                        text = ""
+            else:
+                # Not a valid zip -> fallback to reading as plain text
+                try:
+                    text = _read_bytes(source).decode("utf-8", errors="ignore")
+                except Exception:
+                    text = ""
+        except Exception:
+            # Any unexpected error: return empty string rather than crashing
+            text = ""
+    elif name.endswith(".txt"):
+        data = _read_bytes(source)
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            text = data.decode("latin-1")
+    return text
+
+
+class ZipLimitError(ValueError):
+    """An uploaded archive exceeds the configured member count or size limits."""
+
+
+def iter_zip_members(zip_source, extensions, max_members=None, max_member_bytes=None, max_total_bytes=None):
+    """Yield ``(basename, bytes)`` for each matching member, straight from the archive.
+
+    ``zip_source`` is a path or a seekable file object (e.g. an upload stream);
+    nothing is written to disk.  Raises ``zipfile.BadZipFile`` for invalid
+    archives and ``ZipLimitError`` when a limit is exceeded.
+    """
+    max_members = max_members or MAX_ZIP_MEMBERS
+    max_member_bytes = max_member_bytes or MAX_ZIP_MEMBER_BYTES
+    max_total_bytes = max_total_bytes or MAX_ZIP_TOTAL_BYTES
+    count = 0
+    total = 0
+    with zipfile.ZipFile(zip_source, "r") as z:
+        for info in z.infolist():
+            # skip directories
+            if info.is_dir() or info.filename.endswith("\\"):
+                continue
+            basename = os.path.basename(info.filename.replace("\\", "/"))
+            if not basename or not basename.lower().endswith(extensions):
+                continue
+            count += 1
+            if count > max_members:
+                raise ZipLimitError(f"more than {max_members} resumes in one archive")
+            if info.file_size > max_member_bytes:
+                raise ZipLimitError(f"'{basename}' is larger than {max_member_bytes // (1024 * 1024)} MB")
+            with z.open(info) as member:
+                # Never trust the declared size: read at most one byte past the limit
+                data = member.read(max_member_bytes + 1)
+            if len(data) > max_member_bytes:
+                raise ZipLimitError(f"'{basename}' is larger than {max_member_bytes // (1024 * 1024)} MB")
+            total += len(data)
+            if total > max_total_bytes:
+                raise ZipLimitError(f"archive expands to more than {max_total_bytes // (1024 * 1024)} MB")
+            yield basename, data
+
+
+def _extract_indexed(item):
+    """Pool task: extract one file, never raising so one bad file can't sink a batch.
+
+    Returns ``(index, text, metrics)``; the metrics are merged by the parent.
+    """
+    index, (filename, source) = item
+    with metrics.capture() as captured:
+        fmt = os.path.splitext((filename or str(source)).lower())[1].lstrip(".") or "unknown"
+        metrics.inc("thinkhire_files_total", format=fmt)
+        with metrics.timed("extract"):
+            try:
+                size = len(source) if isinstance(source, (bytes, bytearray)) else os.path.getsize(source)
+                metrics.inc("thinkhire_bytes_total", size)
+                text = extract_text(source, filename)
+            except Exception:
+                text = ""
+    return index, text, captured
+
+
+def _extract_all(items, count, workers=None, max_pending=None):
+    """Extract ``(index, (filename, source))`` items into ``(index, text, metrics)``, over a pool
+    when ``count`` is large enough."""
+    workers = min(workers or EXTRACT_WORKERS, count)
+    if workers <= 1 or count < PARALLEL_MIN_FILES:
+        for item in items:
+            yield _extract_indexed(item)
+        return
+
+    max_pending = max_pending or workers * MAX_PENDING_PER_WORKER
+    pool = None
+    pending = set()
+    try:
+        for item in items:
+            if pool is None:
+                # Started on the first cache miss, so fully cached batches never pay for it
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT)
+            pending.add(pool.submit(_extract_indexed, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _cache_key(filename, data):
+    # The extension picks the extractor: the same bytes as .pdf and .txt give different texts
+    return extraction_cache.sha256_bytes(data) + os.path.splitext(filename or "")[1].lower()
+
+
+def iter_extracted(files, workers=None, max_pending=None, use_cache=True):
+    """Yield ``(index, text)`` pairs in completion order.
+
+    ``files`` are ``(filename, source)`` pairs where ``source`` is a path or
+    the file's bytes.  ``index`` is the position in ``files`` so callers can
+    restore the original order.  At most ``max_pending`` files are in flight.
+    Files whose bytes were extracted before under the same extension are
+    served from the cache, looked up ``CACHE_WRITE_BATCH`` files at a time.
+    """
+    files = list(files)
+    if not use_cache:
+        for index, text, captured in _extract_all(enumerate(files), len(files), workers, max_pending):
+            metrics.merge(captured, file=files[index][0])
+            yield index, text
+        return
+
+    hits = deque()
+    hashes = {}
+
+    def lookup(batch):
+        """Split ``[(index, filename, data or None)]`` into cache hits and misses to extract."""
+        keys = {index: _cache_key(filename, data) for index, filename, data in batch if data is not None}
+        try:
+            cached = extraction_cache.get_texts(keys.values(), EXTRACTOR_VERSION)
+        except Exception:
+            cached = {}
+        for index, filename, data in batch:
+            if data is None:
+                yield index, (filename, files[index][1])
+                continue
+            key = keys[index]
+            if key in cached:
+                metrics.inc("thinkhire_cache_total", cache="extraction", result="hit")
+                hits.append((index, cached[key]))
+                continue
+            metrics.inc("thinkhire_cache_total", cache="extraction", result="miss")
+            hashes[index] = key
+            yield index, (filename, data)
+
+    def misses():
+        batch = []
+        for index, (filename, source) in enumerate(files):
+            try:
+                data = _read_bytes(source)
+            except Exception:
+                data = None  # unreadable here; the extractor reports it
+            batch.append((index, filename, data))
+            if len(batch) >= CACHE_WRITE_BATCH:
+                yield from lookup(batch)
+                batch = []
+        yield from lookup(batch)
+
+    fresh = []
+    for index, text, captured in _extract_all(misses(), len(files), workers, max_pending):
+        metrics.merge(captured, file=files[index][0])
+        while hits:
+            yield hits.popleft()
+        digest = hashes.pop(index, None)
+        # An empty text is a failed extraction (or a scan); try again next time
+        if digest and text.strip():
+            fresh.append((digest, text))
+            if len(fresh) >= CACHE_WRITE_BATCH:
+                _store_texts(fresh)
+                fresh = []
+        yield index, text
+    while hits:
+        yield hits.popleft()
+    _store_texts(fresh)
+
+
+def _store_texts(items):
+    try:
+        extraction_cache.put_texts(items, EXTRACTOR_VERSION)
+    except Exception:
+        # The cache is an optimisation; a read-only or full disk must not fail uploads
+        pass
@@ -0,0 +1,109 @@
+"""SQLite-backed user accounts.
+
+Replaces rewriting ``users.json`` on every signup: each account is one row
+keyed by username, so login is an indexed lookup and concurrent signups from
+different gunicorn workers can't overwrite each other.  Lookups are cached
+in-process; the cache is dropped whenever ``PRAGMA data_version`` shows that
+another connection (another worker) has written to the database.  Accounts
+in an existing ``users.json`` are imported once, the first time the
+database is opened.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+USERS_DB = os.environ.get("THINKHIRE_USERS_DB", os.path.join(ROOT, "users.sqlite3"))
+LEGACY_USERS_FILE = os.path.join(ROOT, "users.json")
+# Cached lookups per process before the cache is simply cleared
+USER_CACHE_SIZE = 10000
+
+
+class UserStore:
+    def __init__(self, path=None, legacy_file=None):
+        self.path = path or USERS_DB
+        self.legacy_file = legacy_file or LEGACY_USERS_FILE
+        self._lock = threading.Lock()
+        self._db = None
+        self._cache = {}
+        self._data_version = None
+
+    # ---------- storage ----------
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            db.execute("""CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY, full_name TEXT, email TEXT,
+                password TEXT NOT NULL, created_at REAL NOT NULL)""")
+            self._migrate(db)
+            self._db = db
+        return self._db
+
+    def _migrate(self, db):
+        """Import users.json once; the write lock makes sure only one worker does it."""
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            done = db.execute("SELECT 1 FROM meta WHERE name = 'users_json_migrated'").fetchone()
+            if not done:
+                legacy = {}
+                try:
+                    if os.path.exists(self.legacy_file):
+                        with open(self.legacy_file, "r", encoding="utf-8") as f:
+                            legacy = json.load(f)
+                except Exception:
+                    legacy = {}
+                now = time.time()
+                db.executemany(
+                    "INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?)",
+                    [(name, u.get("full_name", ""), u.get("email", ""), u.get("password", ""), now)
+                     for name, u in legacy.items() if isinstance(u, dict) and u.get("password")],
+                )
+                db.execute("INSERT INTO meta VALUES ('users_json_migrated', ?)", (str(len(legacy)),))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _fresh_cache(self, db):
+        """The lookup cache, emptied if another connection changed the database."""
+        version = db.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version or len(self._cache) >= USER_CACHE_SIZE:
+            self._cache.clear()
+            self._data_version = version
+        return self._cache
+
+    # ---------- public API ----------
+    def get(self, username):
+        """Return ``{"username", "full_name", "email", "password"}`` or None."""
+        with self._lock:
+            db = self._connect()
+            cache = self._fresh_cache(db)
+            if username not in cache:
+                row = db.execute("SELECT username, full_name, email, password FROM users WHERE username = ?",
+                                 (username,)).fetchone()
+                cache[username] = dict(row) if row else None
+            user = cache[username]
+        return dict(user) if user else None
+
+    def create(self, username, full_name, email, password_hash):
+        """Add an account; returns False if the username is already taken."""
+        with self._lock:
+            db = self._connect()
+            try:
+                db.execute("INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                           (username, full_name, email, password_hash, time.time()))
+            except sqlite3.IntegrityError:
+                return False
+            # Our own writes don't bump data_version, so update the cache directly
+            self._fresh_cache(db)[username] = {"username": username, "full_name": full_name,
+                                               "email": email, "password": password_hash}
+        return True
+
+
+user_store = UserStore()